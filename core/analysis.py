@@ -4,13 +4,16 @@ import numpy as np
 import logging
 import asyncio
 from datetime import datetime
+from data.request_coalescer import fetch_ohlcv
+from utils import tracing
 
 logger = logging.getLogger("crypto-signal-bot")
 
 
-async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List[str], predictor, bars: int = 200) -> Optional[Dict]:
+async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List[str], predictor, bars: int = 200,
+                                         context: Optional[Dict] = None) -> Optional[Dict]:
     """Analyze a symbol across multiple timeframes and generate signals"""
-    logger.info(f"[{symbol}] Starting multi-timeframe analysis...")
+    logger.debug("[%s] Starting multi-timeframe analysis...", symbol)
 
     try:
         signals = []
@@ -19,11 +22,11 @@ async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List
         for timeframe in timeframes:
             try:
                 # Fetch ohlcv data
-                ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, limit=bars)
+                with tracing.span('load_ohlcv', timeframe=timeframe):
+                    ohlcv = await fetch_ohlcv(exchange, symbol, timeframe, limit=bars)
 
                 if not ohlcv or len(ohlcv) < 20:
-                    logger.warning(
-                        f"[{symbol}] Not enough data for {timeframe}")
+                    logger.warning("[%s] Not enough data for %s", symbol, timeframe)
                     continue
 
                 # Convert to dataframe
@@ -32,24 +35,25 @@ async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List
                 df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
                 df.set_index('timestamp', inplace=True)
 
-                logger.info(f"[{symbol}] Starting analysis on {timeframe}")
+                logger.debug("[%s] Starting analysis on %s", symbol, timeframe)
 
                 # Get signal for this timeframe
-                signal = await predictor.predict_signal(symbol, df, timeframe)
+                with tracing.span('predict_signal', timeframe=timeframe) as span:
+                    signal = await predictor.predict_signal(symbol, df, timeframe, context)
+                    span.set(signal=signal['direction'] if signal else None)
                 if signal:
                     signals.append(signal)
-                    logger.info(
-                        f"[{symbol}] Found {signal['direction']} signal for {timeframe} with confidence {signal['confidence']}%")
+                    logger.info("[%s] Found %s signal for %s with confidence %s%%",
+                                symbol, signal['direction'], timeframe, signal['confidence'])
                 else:
-                    logger.info(f"[{symbol}] No signal for {timeframe}")
+                    logger.debug("[%s] No signal for %s", symbol, timeframe)
             except Exception as e:
-                logger.error(
-                    f"[{symbol}] Error in analysis for {timeframe}: {str(e)}")
+                logger.error("[%s] Error in analysis for %s: %s", symbol, timeframe, e)
                 continue
 
         # Check if we have any signals
         if not signals:
-            logger.info(f"[{symbol}] No valid signals across any timeframe")
+            logger.info("[%s] No valid signals across any timeframe", symbol)
             return None
 
         # Calculate timeframe agreement (proportion of signals with same direction)
@@ -62,8 +66,8 @@ async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List
         # Require at least 67% agreement across timeframes (2 out of 3 or 3 out of 4)
         required_agreement = 0.67
         if timeframe_agreement < required_agreement:
-            logger.info(
-                f"[{symbol}] Not enough timeframe signals: {len(aligned_signals)}/{len(signals)}")
+            logger.info("[%s] Not enough timeframe signals: %d/%d",
+                        symbol, len(aligned_signals), len(signals))
             return None
 
         # Get the best signal (highest confidence) with the majority direction
@@ -84,12 +88,11 @@ async def analyze_symbol_multi_timeframe(exchange, symbol: str, timeframes: List
         best_signal['total_timeframes'] = len(signals)
 
         logger.info(
-            f"[{symbol}] Final signal selected with adjusted confidence: {best_signal['confidence']:.2f}%, "
-            f"Direction: {best_signal['direction']}, "
-            f"Timeframe Agreement: {timeframe_agreement:.2f}"
-        )
+            "[%s] Final signal selected with adjusted confidence: %.2f%%, "
+            "Direction: %s, Timeframe Agreement: %.2f",
+            symbol, best_signal['confidence'], best_signal['direction'], timeframe_agreement)
 
         return {"symbol": symbol, "signals": [best_signal]}
     except Exception as e:
-        logger.error(f"[{symbol}] Error in multi-timeframe analysis: {str(e)}")
+        logger.error("[%s] Error in multi-timeframe analysis: %s", symbol, e)
         return None
@@ -3,6 +3,7 @@ import ccxt.async_support as ccxt
 from core.analysis import analyze_symbol
 from core.whale_detector import detect_whale_activity
 from utils.logger import log
+from data.weight_limiter import limit_exchange
 import pandas as pd
 import psutil
 from telegram import Bot
@@ -53,10 +54,10 @@ async def run_engine():
         log("[Engine] Initializing Binance exchange")
         try:
             exchange = ccxt.binance({
-                "enableRateLimit": True,
                 "apiKey": os.getenv("BINANCE_API_KEY"),
                 "secret": os.getenv("BINANCE_API_SECRET")
             })
+            limit_exchange(exchange)
             log("[Engine] Binance exchange initialized")
         except Exception as e:
             log(
@@ -72,9 +73,14 @@ async def run_engine():
             log(f"[Engine] Error loading markets: {str(e)}", level='ERROR')
             return
 
+        # cpu_percent(interval=None) reports usage since the previous call
+        # instead of blocking to sample; the first call only sets the baseline
+        process = psutil.Process()
+        psutil.cpu_percent(interval=None)
+
         for symbol in symbols[:5]:  # Limit to 5 symbols for testing
-            memory_before = psutil.Process().memory_info().rss / 1024 / 1024
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            memory_before = process.memory_info().rss / 1024 / 1024
+            cpu_percent = psutil.cpu_percent(interval=None)
             log(f"[Engine] [{symbol}] Before analysis - Memory: {memory_before:.2f} MB, CPU: {cpu_percent:.1f}%")
 
             log(f"[Engine] [{symbol}] Checking whale activity")
@@ -125,8 +131,8 @@ async def run_engine():
                 log(f"[Engine] [{symbol}] Error analyzing symbol: {str(e)}", level='ERROR')
                 continue
 
-            memory_after = psutil.Process().memory_info().rss / 1024 / 1024
-            cpu_percent_after = psutil.cpu_percent(interval=0.1)
+            memory_after = process.memory_info().rss / 1024 / 1024
+            cpu_percent_after = psutil.cpu_percent(interval=None)
             memory_diff = memory_after - memory_before
             log(f"[Engine] [{symbol}] After analysis - Memory: {memory_after:.2f} MB (Change: {memory_diff:.2f} MB), CPU: {cpu_percent_after:.1f}%")
 
@@ -0,0 +1,41 @@
+import bisect
+import hashlib
+from typing import Iterable, Optional
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash, identical in every process and on every host"""
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping symbols to scanner nodes.
+    Each node is placed on the ring at several virtual points so the symbols
+    spread evenly, and adding or removing a node only moves the symbols of
+    the ring segments next to it (about 1/N of the universe).
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes=100):
+        self.vnodes = vnodes
+        self._points = []  # Sorted ring positions
+        self._owners = {}  # ring position -> node id
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def owner(self, symbol: str) -> Optional[str]:
+        """Node responsible for a symbol, or None when the ring is empty"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(symbol)) % len(self._points)
+        return self._owners[self._points[index]]
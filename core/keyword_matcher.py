@@ -0,0 +1,129 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List
+
+VOWELS = set('aeiou')
+
+# Endings of adjectives and nouns that take no plural, past or -ing form
+UNINFLECTED_ENDINGS = ('ing', 'ed', 'ish', 'ive', 'ic', 'ful', 'ous', 'ward',
+                       'ness', 'al', 'ory')
+
+# Forms the spelling rules get wrong; an empty list means the word has none
+IRREGULAR = {
+    'fall': ['falls', 'fell', 'fallen', 'falling'],
+    'thrive': ['thrives', 'thrived', 'thriving'],
+    'strong': [],
+    'weak': [],
+    'upbeat': [],
+    'downbeat': [],
+}
+
+
+def _doubles_final_consonant(word: str) -> bool:
+    """One-syllable consonant-vowel-consonant words double the consonant: ban -> banned"""
+    if len(word) < 3 or word[-1] in VOWELS or word[-1] in 'wxy':
+        return False
+    if word[-2] not in VOWELS or word[-3] in VOWELS:
+        return False
+    return len(re.findall(r'[aeiou]+', word)) == 1
+
+
+def inflections(keyword: str) -> List[str]:
+    """
+    Get a keyword with its plural, past and -ing forms.
+    Only the last word of a phrase is inflected, and the forms follow the
+    English spelling rules, so 'ban' gives 'bans', 'banned' and 'banning'
+    but never 'band'.
+    """
+    keyword = keyword.lower()
+    head, _, word = keyword.rpartition(' ')
+    prefix = f"{head} " if head else ''
+    if word in IRREGULAR:
+        return [keyword] + [prefix + form for form in IRREGULAR[word]]
+    if not word.isalpha() or len(word) < 3 or word.endswith(UNINFLECTED_ENDINGS):
+        return [keyword]
+
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        plural = word + 'es'
+    elif word.endswith('y') and word[-2] not in VOWELS:
+        plural = word[:-1] + 'ies'
+    else:
+        plural = word + 's'
+
+    if word.endswith('e'):
+        past = word + 'd'
+        present = word if word.endswith('ee') else word[:-1]
+        present += 'ing'
+    elif word.endswith('y') and word[-2] not in VOWELS:
+        past = word[:-1] + 'ied'
+        present = word + 'ing'
+    elif _doubles_final_consonant(word):
+        past = word + word[-1] + 'ed'
+        present = word + word[-1] + 'ing'
+    else:
+        past = word + 'ed'
+        present = word + 'ing'
+
+    return [keyword] + [prefix + form for form in (plural, past, present)]
+
+
+class KeywordMatcher:
+    """
+    Precompiled single-pass matcher for groups of keywords.
+    All keywords share one alternation regex with word boundaries, so 'ban'
+    no longer matches 'urban' and 'gain' no longer matches 'against'.
+    Each keyword also matches its own inflected forms (gains, surged, banned)
+    and nothing else, so 'ban' does not match 'band'.
+    """
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        self.group_of = {}
+        for group, keywords in keyword_groups.items():
+            for keyword in keywords:
+                self.group_of[keyword.lower()] = group
+        self.groups = list(keyword_groups)
+
+        # Inflected form -> keyword; a listed keyword keeps its own entry
+        self.keyword_of = {keyword: keyword for keyword in self.group_of}
+        for keyword in self.group_of:
+            for form in inflections(keyword):
+                self.keyword_of.setdefault(form, keyword)
+
+        # Longest first so 'falling' wins over 'fall' when both are listed
+        alternation = '|'.join(
+            re.escape(k) for k in sorted(self.keyword_of, key=len, reverse=True))
+        self.pattern = re.compile(rf'\b({alternation})\b', re.IGNORECASE)
+
+    def _empty(self) -> Dict[str, set]:
+        return {group: set() for group in self.groups}
+
+    def match(self, text: str) -> Dict[str, set]:
+        """Get the distinct keywords of each group found in a text"""
+        found = self._empty()
+        for form in self.pattern.findall(text or ''):
+            keyword = self.keyword_of[form.lower()]
+            found[self.group_of[keyword]].add(keyword)
+        return found
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count distinct keywords of each group found in a text"""
+        return {group: len(words) for group, words in self.match(text).items()}
+
+    def count_batch(self, texts: List[str]) -> List[Dict[str, int]]:
+        """Count distinct keywords per group for many texts in one regex pass"""
+        texts = [text or '' for text in texts]
+        found = [self._empty() for _ in texts]
+
+        # Offsets of each text inside the joined batch
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+
+        for match in self.pattern.finditer('\n'.join(texts)):
+            index = bisect_right(starts, match.start()) - 1
+            keyword = self.keyword_of[match.group(1).lower()]
+            found[index][self.group_of[keyword]].add(keyword)
+
+        return [{group: len(words) for group, words in item.items()} for item in found]
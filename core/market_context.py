@@ -0,0 +1,126 @@
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from data.request_coalescer import SingleFlight
+from utils.http_client import get_http_client
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+FEAR_GREED_URL = "https://api.alternative.me/fng/?limit=2"
+
+
+class MarketContextProvider:
+    """
+    Process-wide provider for market context shared by every sentiment module.
+    The Fear & Greed index is published once a day, so it is fetched at most
+    once per publication interval (from the API's time_until_update) and
+    served from memory in between.
+    """
+
+    def __init__(self, default_ttl=3600, error_ttl=300, grace_period=60):
+        self.default_ttl = default_ttl    # Used when the API gives no update time
+        self.error_ttl = error_ttl        # Retry delay after a failed fetch
+        self.grace_period = grace_period  # Publication can lag the announced time
+        self.flight = SingleFlight()
+        self._fear_greed = None
+        self._expires_at = 0.0
+        self.fetches = 0
+
+    def peek_fear_greed(self) -> Optional[Dict]:
+        """Get the last fetched index without any network access"""
+        return self._fear_greed
+
+    async def get_fear_greed_index(self) -> Dict:
+        """
+        Get the Fear & Greed Index, fetching it only when the cached value is stale
+
+        Returns:
+            dict: Fear & Greed Index data with value and classification
+        """
+        # During an outage the retry delay applies even with nothing cached yet
+        if time.time() < self._expires_at:
+            return self._fear_greed or self._default()
+        return await self.flight.do('fear_greed', self._refresh_fear_greed)
+
+    async def _refresh_fear_greed(self) -> Dict:
+        self.fetches += 1
+        try:
+            logger.info(f"Fetching Fear & Greed Index from {FEAR_GREED_URL}")
+            response = await get_http_client().get(FEAR_GREED_URL)
+
+            if response.status_code != 200:
+                logger.error(
+                    f"Failed to get Fear & Greed Index: {response.status_code} - {response.text}")
+                return self._fallback()
+
+            data = response.json()
+            if 'data' not in data or not data['data']:
+                logger.error("No data in Fear & Greed Index response")
+                return self._fallback()
+
+            # Get latest Fear & Greed Index data
+            latest = data['data'][0]
+            result = {
+                'value': int(latest['value']),
+                'value_classification': latest['value_classification'],
+                'timestamp': datetime.fromtimestamp(int(latest['timestamp'])).strftime('%Y-%m-%d %H:%M:%S'),
+                'source': 'alternative.me'
+            }
+
+            # Add trend information if available
+            if len(data['data']) > 1:
+                value_change = int(latest['value']) - int(data['data'][1]['value'])
+                result['trend'] = value_change
+                result['trend_direction'] = 'up' if value_change > 0 else 'down' if value_change < 0 else 'stable'
+
+            # Keep it until the next publication
+            try:
+                ttl = int(latest.get('time_until_update')) + self.grace_period
+            except (TypeError, ValueError):
+                ttl = self.default_ttl
+            ttl = max(ttl, self.grace_period)
+
+            self._fear_greed = result
+            self._expires_at = time.time() + ttl
+            logger.info(
+                f"Fear & Greed Index: {result['value']} ({result['value_classification']}) "
+                f"Trend: {result.get('trend_direction', 'n/a')}, next refresh in {ttl}s")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error getting Fear & Greed Index: {str(e)}")
+            return self._fallback()
+
+    def _fallback(self) -> Dict:
+        """Serve the last known index, or a neutral default, until the next retry"""
+        self._expires_at = time.time() + self.error_ttl
+        return self._fear_greed or self._default()
+
+    def _default(self) -> Dict:
+        """Neutral index used while no real value has been fetched"""
+        return {
+            'value': 50,
+            'value_classification': 'neutral',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source': 'default',
+            'error': 'Failed to fetch real data'
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'fetches': self.fetches,
+            'shared_in_flight': self.flight.shared,
+            'fear_greed_expires_in': max(0, round(self._expires_at - time.time()))
+        }
+
+
+# Create global instance shared by every consumer in the process
+market_context = MarketContextProvider()
+
+
+async def get_fear_greed_index():
+    """Wrapper for the provider's get_fear_greed_index method"""
+    return await market_context.get_fear_greed_index()
@@ -140,8 +140,7 @@ class MLPredictor:
             # Prepare features
             features = self.prepare_features(df)
             if not features:
-                logger.warning(
-                    f"[{symbol}] Could not prepare features for ML prediction")
+                logger.warning("[%s] Could not prepare features for ML prediction", symbol)
                 return self.heuristic_prediction(df)
 
             # Use ML model if available
@@ -156,8 +155,8 @@ class MLPredictor:
                                 X_dict[feature] = features[feature]
                             else:
                                 # Use a default value for missing features
-                                logger.debug(
-                                    f"[{symbol}] Using default value for missing feature: {feature}")
+                                logger.debug("[%s] Using default value for missing feature: %s",
+                                             symbol, feature)
                                 X_dict[feature] = 0.0
 
                         # Create DataFrame with aligned features
@@ -170,7 +169,7 @@ class MLPredictor:
                             [list(features.values())], columns=feature_names)
 
                     # Log the feature data used for prediction
-                    logger.debug(f"[{symbol}] Features prepared: {features}")
+                    logger.debug("[%s] Features prepared: %s", symbol, features)
 
                     # Make prediction
                     prediction = self.model.predict(X)[0]
@@ -178,8 +177,8 @@ class MLPredictor:
                     confidence = float(proba[prediction] * 100)
 
                     direction = "LONG" if prediction == 1 else "SHORT"
-                    logger.info(
-                        f"[{symbol}] ML prediction: {direction} with {confidence:.2f}% confidence")
+                    logger.info("[%s] ML prediction: %s with %.2f%% confidence",
+                                symbol, direction, confidence)
 
                     # Cap confidence at 98%
                     confidence = min(confidence, 98.0)
@@ -194,16 +193,14 @@ class MLPredictor:
                         'patterns': self._get_active_patterns(features)
                     }
                 except Exception as model_error:
-                    logger.error(
-                        f"[{symbol}] Error in ML prediction: {str(model_error)}")
-                    logger.error(traceback.format_exc())
+                    logger.exception("[%s] Error in ML prediction: %s", symbol, model_error)
                     return self.heuristic_prediction(df)
             else:
                 # Fallback to heuristic prediction
                 return self.heuristic_prediction(df)
 
         except Exception as e:
-            logger.error(f"[{symbol}] Error in ML prediction: {str(e)}")
+            logger.error("[%s] Error in ML prediction: %s", symbol, e)
             return {
                 'direction': None,
                 'confidence': 0,
@@ -212,27 +209,28 @@ class MLPredictor:
 
     def _log_important_features(self, symbol, features, direction):
         """Log the most influential features for this prediction"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         if direction == "LONG":
             # Log bullish patterns
             if features.get('bullish_engulfing', 0) > 0:
-                logger.info(f"[{symbol}] Bullish Engulfing pattern detected")
+                logger.debug("[%s] Bullish Engulfing pattern detected", symbol)
             if features.get('hammer', 0) > 0:
-                logger.info(f"[{symbol}] Hammer pattern detected")
+                logger.debug("[%s] Hammer pattern detected", symbol)
             if features.get('three_white_soldiers', 0) > 0:
-                logger.info(
-                    f"[{symbol}] Three White Soldiers pattern detected")
+                logger.debug("[%s] Three White Soldiers pattern detected", symbol)
         else:
             # Log bearish patterns
             if features.get('bearish_engulfing', 0) > 0:
-                logger.info(f"[{symbol}] Bearish Engulfing pattern detected")
+                logger.debug("[%s] Bearish Engulfing pattern detected", symbol)
             if features.get('shooting_star', 0) > 0:
-                logger.info(f"[{symbol}] Shooting Star pattern detected")
+                logger.debug("[%s] Shooting Star pattern detected", symbol)
             if features.get('three_black_crows', 0) > 0:
-                logger.info(f"[{symbol}] Three Black Crows pattern detected")
+                logger.debug("[%s] Three Black Crows pattern detected", symbol)
 
         # Log doji for both
         if features.get('doji', 0) > 0:
-            logger.info(f"[{symbol}] Doji pattern detected")
+            logger.debug("[%s] Doji pattern detected", symbol)
 
     def _get_active_patterns(self, features):
         """Get list of active candlestick patterns from features"""
@@ -352,10 +350,9 @@ class MLPredictor:
                 # Base 50% + up to 48% (cap at 98%)
                 confidence = 50 + min(short_score, 48)
 
-            logger.info(
-                f"Heuristic prediction: {direction} with {confidence:.2f}% confidence")
+            logger.debug("Heuristic prediction: %s with %.2f%% confidence", direction, confidence)
             if active_patterns:
-                logger.info(f"Active patterns: {', '.join(active_patterns)}")
+                logger.debug("Active patterns: %s", ', '.join(active_patterns))
 
             return {
                 'direction': direction,
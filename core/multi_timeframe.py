@@ -1,13 +1,14 @@
 import pandas as pd
 import ccxt.async_support as ccxt
 from utils.logger import log
+from data import request_coalescer
 import asyncio
 import ta
 
 
 async def fetch_ohlcv(exchange, symbol, timeframe, limit=100):
     try:
-        ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+        ohlcv = await request_coalescer.fetch_ohlcv(exchange, symbol, timeframe, limit=limit)
         if not ohlcv or len(ohlcv) < 50:
             log(f"[{symbol}] Insufficient OHLCV data for {timeframe}", level='ERROR')
             return None
@@ -0,0 +1,121 @@
+import re
+import math
+import logging
+from typing import Dict, List
+
+from core.keyword_matcher import inflections
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+# Words an article need not contain to match a search term like 'The Sandbox'
+STOP_WORDS = {'the', 'a', 'an', 'of', 'and', 'or', 'on', 'in', 'for', 'to'}
+
+
+def term_patterns(term: str) -> List[re.Pattern]:
+    """
+    Word-boundary patterns for the significant words of a search term, with
+    the same inflections KeywordMatcher accepts
+    """
+    words = term.lower().split()
+    significant = [w for w in words if w not in STOP_WORDS] or words
+    return [re.compile(rf"\b(?:{'|'.join(map(re.escape, inflections(word)))})\b", re.IGNORECASE)
+            for word in significant]
+
+
+class NewsQueryPlanner:
+    """
+    Plans NewsAPI requests for a scan cycle within the daily quota.
+    Several coins are combined into one OR query, the budget is spread over
+    the rest of the day and spent on the highest-priority symbols first.
+    """
+
+    def __init__(self, daily_limit=100, reserve=5, terms_per_query=6,
+                 max_query_length=450, cycle_seconds=1800):
+        self.daily_limit = daily_limit            # NewsAPI developer plan allowance
+        self.reserve = reserve                    # Calls kept back for emergencies
+        self.terms_per_query = terms_per_query    # Coins combined into one request
+        self.max_query_length = max_query_length  # NewsAPI caps q at 500 characters
+        self.cycle_seconds = cycle_seconds        # Expected time between scan cycles (SCAN_INTERVAL)
+
+    def remaining_calls(self, calls_today: int) -> int:
+        """Calls left today after keeping the reserve"""
+        return max(0, self.daily_limit - self.reserve - calls_today)
+
+    def calls_for_cycle(self, calls_today: int, seconds_until_reset: float,
+                        cycle_seconds: float = None) -> int:
+        """Share of the remaining quota this cycle may spend"""
+        remaining = self.remaining_calls(calls_today)
+        if remaining == 0:
+            return 0
+        # Spread over the cycles left today so later cycles keep some coverage
+        cycles_left = max(1.0, seconds_until_reset / (cycle_seconds or self.cycle_seconds))
+        return max(1, math.ceil(remaining / cycles_left))
+
+    def build_query(self, terms: List[str]) -> str:
+        """Combine search terms into one NewsAPI OR query"""
+        parts = []
+        for term in terms:
+            words = term.split()
+            parts.append(f"({' AND '.join(words)})" if len(words) > 1 else term)
+        return ' OR '.join(parts)
+
+    def plan(self, symbols: List[str], search_terms: Dict[str, str], max_calls: int) -> List[Dict]:
+        """
+        Group symbols into combined queries, highest priority first
+
+        Args:
+            symbols (list): Symbols in priority order
+            search_terms (dict): Search term for each symbol
+            max_calls (int): Maximum number of queries to plan
+
+        Returns:
+            list: Queries as dicts with 'query' and 'terms' (symbol -> term)
+        """
+        queries = []
+        current = {}
+
+        def flush():
+            if current:
+                queries.append({
+                    'query': self.build_query(list(dict.fromkeys(current.values()))),
+                    'terms': dict(current)
+                })
+                current.clear()
+
+        for symbol in symbols:
+            if len(queries) >= max_calls:
+                break
+            term = search_terms[symbol]
+            terms = set(current.values())
+            if term not in terms:
+                candidate = self.build_query(list(terms) + [term])
+                if len(terms) >= self.terms_per_query or len(candidate) > self.max_query_length:
+                    flush()
+                    if len(queries) >= max_calls:
+                        break
+            current[symbol] = term
+
+        if len(queries) < max_calls:
+            flush()
+
+        planned = sum(len(q['terms']) for q in queries)
+        logger.info(
+            f"News plan: {len(queries)} queries covering {planned}/{len(symbols)} symbols")
+        return queries
+
+    def split_articles(self, articles: List[Dict], terms: Dict[str, str]) -> Dict[str, List[Dict]]:
+        """
+        Assign each returned article to the symbols whose search term it
+        mentions: every significant word of the term, stop words aside
+        """
+        patterns = {symbol: term_patterns(term) for symbol, term in terms.items()}
+        matched = {symbol: [] for symbol in terms}
+
+        for article in articles:
+            text = f"{article.get('title') or ''} {article.get('description') or ''}"
+            for symbol, required in patterns.items():
+                if all(pattern.search(text) for pattern in required):
+                    matched[symbol].append(article)
+
+        return matched
@@ -3,10 +3,16 @@ import random
 import time
 import re
 import json
+import asyncio
 from datetime import datetime, timedelta
 import logging
 import os
-import requests
+from utils.http_client import get_http_client, close_http_client
+from data.request_coalescer import SingleFlight
+from core.keyword_matcher import KeywordMatcher
+from core.news_planner import NewsQueryPlanner
+from core.market_context import market_context
+from data.sentiment_store import SentimentStore
 
 # Load environment variables
 load_dotenv('config.env')
@@ -22,7 +28,8 @@ NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')
 class NewsSentimentAnalyzer:
     def __init__(self):
         self.api_key = NEWS_API_KEY
-        self.memory_cache = {}  # In-memory cache
+        # SQLite store with a bounded in-memory LRU in front
+        self.store = SentimentStore(memory_size=512)
         self.cache_expiry = 4 * 3600  # Cache expiry in seconds (4 hours)
         # Market-wide cache expiry (8 hours)
         self.market_cache_expiry = 8 * 3600
@@ -35,14 +42,12 @@ class NewsSentimentAnalyzer:
 
         # Create data directory if needed
         os.makedirs("data", exist_ok=True)
-        os.makedirs(os.path.join("data", "sentiment_cache"), exist_ok=True)
 
         # Load previous API counter
         self.load_api_counter()
 
-        # High-priority symbols that get dedicated API calls
-        self.priority_symbols = ["BTC/USDT", "ETH/USDT",
-                                 "BNB/USDT", "SOL/USDT", "XRP/USDT"]
+        # Plans combined queries within the daily NewsAPI quota
+        self.planner = NewsQueryPlanner(daily_limit=100, reserve=5)
 
         # Keyword dictionaries for sentiment analysis
         self.positive_keywords = [
@@ -59,6 +64,12 @@ class NewsSentimentAnalyzer:
             'loss', 'weakness', 'falling', 'regulatory', 'ban', 'hack', 'scam', 'fraud'
         ]
 
+        # Precompiled word-boundary matcher for both keyword lists
+        self.keyword_matcher = KeywordMatcher({
+            'positive': self.positive_keywords,
+            'negative': self.negative_keywords
+        })
+
         # Crypto-specific mapping to improve search results
         self.coin_keywords = {
             'BTC': 'Bitcoin',
@@ -100,8 +111,8 @@ class NewsSentimentAnalyzer:
         self.top_crypto = ["Bitcoin", "Ethereum", "Tether", "BNB", "Solana", "XRP",
                            "Cardano", "Avalanche", "Dogecoin", "Polygon"]
 
-        # Initialize market sentiment on startup
-        self.update_market_sentiment()
+        # Concurrent lookups for the same key share one request
+        self.flight = SingleFlight()
 
     def load_api_counter(self):
         """Load API call counter from file"""
@@ -142,62 +153,26 @@ class NewsSentimentAnalyzer:
     def increment_api_counter(self):
         """Increment API call counter and save"""
         self.api_calls_today += 1
-        logger.info(f"NewsAPI calls today: {self.api_calls_today}/100")
+        logger.info(
+            f"NewsAPI calls today: {self.api_calls_today}/{self.planner.daily_limit}")
         self.save_api_counter()
 
-    def can_make_api_call(self, symbol=None):
-        """Check if we can make an API call, considering limits and priorities"""
-        # Reset counter if a new day has started
+    def reset_api_counter_if_due(self):
+        """Reset the counter if a new day has started"""
         if datetime.now() > self.api_calls_reset_time:
             self.api_calls_today = 0
             self.api_calls_reset_time = datetime.now() + timedelta(days=1)
             self.save_api_counter()
             logger.info("Reset NewsAPI call counter (new day)")
-            return True
-
-        # Reserve 20 calls for high-priority symbols
-        if self.api_calls_today >= 80 and symbol not in self.priority_symbols:
-            return False
-
-        # Absolute limit is 95 calls (keep 5 for emergency)
-        if self.api_calls_today >= 95:
-            return False
 
-        return True
-
-    def get_cache_file_path(self, symbol, days):
-        """Get path to cache file for a symbol"""
-        symbol_safe = symbol.replace('/', '_')
-        return os.path.join("data", "sentiment_cache", f"{symbol_safe}_{days}d.json")
-
-    def load_cached_sentiment(self, symbol, days):
-        """Load sentiment from disk cache"""
-        try:
-            cache_file = self.get_cache_file_path(symbol, days)
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                cache_time = data.get('cache_time', 0)
+    def can_make_api_call(self, symbol=None):
+        """Check if the daily quota, minus its reserve, still allows a call"""
+        self.reset_api_counter_if_due()
+        return self.planner.remaining_calls(self.api_calls_today) > 0
 
-                # Check if cache is still valid
-                if datetime.now().timestamp() - cache_time < self.cache_expiry:
-                    logger.info(f"[{symbol}] Using cached sentiment from file")
-                    return data.get('result')
-        except Exception as e:
-            logger.error(f"[{symbol}] Error loading sentiment cache: {str(e)}")
-        return None
-
-    def save_cached_sentiment(self, symbol, days, result):
-        """Save sentiment to disk cache"""
-        try:
-            cache_file = self.get_cache_file_path(symbol, days)
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'result': result,
-                    'cache_time': datetime.now().timestamp()
-                }, f)
-        except Exception as e:
-            logger.error(f"[{symbol}] Error saving sentiment cache: {str(e)}")
+    def store_sentiment(self, symbol, days, result):
+        """Save a result to the sentiment store"""
+        self.store.put(f"{symbol}_{days}", result, self.cache_expiry)
 
     def clean_text(self, text):
         """Clean and normalize text for sentiment analysis"""
@@ -234,13 +209,26 @@ class NewsSentimentAnalyzer:
             dict: Sentiment score and magnitude
         """
         text = self.clean_text(text)
+        counts = self.keyword_matcher.count(text)
+        return self._score_keywords(text, counts['positive'], counts['negative'])
+
+    def analyze_sentiment_batch(self, texts):
+        """
+        Rule-based sentiment analysis for many texts in one matcher pass
 
-        # Count positive and negative keywords
-        positive_count = sum(
-            1 for keyword in self.positive_keywords if keyword in text)
-        negative_count = sum(
-            1 for keyword in self.negative_keywords if keyword in text)
+        Args:
+            texts (list): Texts to analyze
+
+        Returns:
+            list: Sentiment score and magnitude for each text
+        """
+        cleaned = [self.clean_text(text) for text in texts]
+        counts = self.keyword_matcher.count_batch(cleaned)
+        return [self._score_keywords(text, c['positive'], c['negative'])
+                for text, c in zip(cleaned, counts)]
 
+    def _score_keywords(self, text, positive_count, negative_count):
+        """Turn keyword counts for a cleaned text into a sentiment result"""
         # Calculate sentiment score (-1 to 1)
         total_count = positive_count + negative_count
         if total_count == 0:
@@ -266,25 +254,71 @@ class NewsSentimentAnalyzer:
             'type': sentiment_type
         }
 
-    def get_fear_greed_based_sentiment(self):
-        """Get sentiment based on Fear & Greed Index when NewsAPI is unavailable"""
-        try:
-            # Make API request to alternative.me
-            url = "https://api.alternative.me/fng/?limit=1"
-            response = requests.get(url, timeout=10)
+    def summarize_articles(self, articles):
+        """
+        Score up to 10 articles in one batch and average them
 
-            if response.status_code != 200:
-                return {
-                    'score': 0,
-                    'magnitude': 0.3,
-                    'article_count': 0,
-                    'sentiment_type': 'neutral',
-                    'latest_headlines': [],
-                    'source': 'FallbackNeutral'
-                }
+        Args:
+            articles (list): NewsAPI articles
 
-            data = response.json()
-            if 'data' not in data or not data['data']:
+        Returns:
+            dict: Sentiment analysis results
+        """
+        total_score = 0
+        total_magnitude = 0
+        headlines = []
+
+        scored = articles[:10]
+        sentiments = self.analyze_sentiment_batch([
+            f"{article.get('title') or ''} {article.get('description') or ''}"
+            for article in scored
+        ])
+
+        for article, sentiment in zip(scored, sentiments):
+            # Add to totals
+            total_score += sentiment['score']
+            total_magnitude += sentiment['magnitude']
+
+            # Save headline and URL
+            headline = article.get('title', '')
+            url = article.get('url', '')
+            published_at = article.get('publishedAt', '')
+
+            if headline and url:
+                headlines.append({
+                    'title': headline,
+                    'url': url,
+                    'publishedAt': published_at,
+                    'sentiment': sentiment['type']
+                })
+
+        # Calculate average sentiment
+        avg_score = total_score / len(sentiments) if sentiments else 0
+        avg_magnitude = total_magnitude / len(sentiments) if sentiments else 0
+
+        # Determine overall sentiment
+        if avg_score > 0.2 and avg_magnitude > 0.2:
+            sentiment_type = "positive"
+        elif avg_score < -0.2 and avg_magnitude > 0.2:
+            sentiment_type = "negative"
+        else:
+            sentiment_type = "neutral"
+
+        return {
+            'score': avg_score,
+            'magnitude': avg_magnitude,
+            'article_count': len(articles),
+            'sentiment_type': sentiment_type,
+            'latest_headlines': headlines[:3],  # Top 3 latest headlines
+            'source': 'NewsAPI'
+        }
+
+    async def get_fear_greed_based_sentiment(self):
+        """Get sentiment based on Fear & Greed Index when NewsAPI is unavailable"""
+        try:
+            # Served from the shared provider, fetched at most once per publication
+            fng = await market_context.get_fear_greed_index()
+            if fng.get('source') == 'default':
                 return {
                     'score': 0,
                     'magnitude': 0.3,
@@ -295,8 +329,8 @@ class NewsSentimentAnalyzer:
                 }
 
             # Get fear & greed value (0-100)
-            fng_value = int(data['data'][0]['value'])
-            fng_classification = data['data'][0]['value_classification']
+            fng_value = fng['value']
+            fng_classification = fng['value_classification']
 
             # Convert to sentiment
             if fng_value >= 70:  # Greed/Extreme Greed
@@ -337,8 +371,11 @@ class NewsSentimentAnalyzer:
                 'source': 'FallbackNeutral'
             }
 
-    def update_market_sentiment(self):
+    async def update_market_sentiment(self):
         """Update market-wide sentiment for all cryptocurrencies"""
+        return await self.flight.do('market', self._update_market_sentiment)
+
+    async def _update_market_sentiment(self):
         try:
             # Check if we need to update (based on time)
             current_time = datetime.now().timestamp()
@@ -353,7 +390,7 @@ class NewsSentimentAnalyzer:
                     "Cannot update market sentiment - API limit reached")
                 if self.market_sentiment_cache:
                     return self.market_sentiment_cache
-                return self.get_fear_greed_based_sentiment()
+                return await self.get_fear_greed_based_sentiment()
 
             # Choose 2 random cryptos from top list to vary our queries
             search_terms = random.sample(self.top_crypto, 2)
@@ -374,15 +411,16 @@ class NewsSentimentAnalyzer:
             }
 
             logger.info(f"Fetching market-wide sentiment: {search_query}")
-            response = requests.get(url, params=params)
+            # Count the call before awaiting so concurrent lookups see the quota
             self.increment_api_counter()
+            response = await get_http_client().get(url, params=params)
 
             # Check for API errors
             if response.status_code != 200:
                 logger.warning(
                     f"NewsAPI error: {response.status_code} - {response.text}")
                 # Fallback to Fear & Greed Index
-                self.market_sentiment_cache = self.get_fear_greed_based_sentiment()
+                self.market_sentiment_cache = await self.get_fear_greed_based_sentiment()
                 self.market_sentiment_timestamp = current_time
                 return self.market_sentiment_cache
 
@@ -395,69 +433,15 @@ class NewsSentimentAnalyzer:
 
             if article_count == 0:
                 # Fallback to Fear & Greed Index
-                self.market_sentiment_cache = self.get_fear_greed_based_sentiment()
+                self.market_sentiment_cache = await self.get_fear_greed_based_sentiment()
                 self.market_sentiment_timestamp = current_time
                 return self.market_sentiment_cache
 
-            # Analyze sentiment for each article
-            total_score = 0
-            total_magnitude = 0
-            headlines = []
-            article_sentiments = []
-
-            for article in articles[:10]:  # Analyze up to 10 articles
-                title = self.clean_text(article.get('title', ''))
-                description = self.clean_text(article.get('description', ''))
-
-                # Combined text for sentiment analysis
-                combined_text = f"{title} {description}"
-
-                # Get sentiment for this article
-                sentiment = self.analyze_sentiment(combined_text)
-
-                # Add to totals
-                total_score += sentiment['score']
-                total_magnitude += sentiment['magnitude']
-
-                # Save headline and URL
-                headline = article.get('title', '')
-                url = article.get('url', '')
-                published_at = article.get('publishedAt', '')
-
-                if headline and url:
-                    headlines.append({
-                        'title': headline,
-                        'url': url,
-                        'publishedAt': published_at,
-                        'sentiment': sentiment['type']
-                    })
-
-                article_sentiments.append(sentiment)
-
-            # Calculate average sentiment
-            avg_score = total_score / \
-                len(article_sentiments) if article_sentiments else 0
-            avg_magnitude = total_magnitude / \
-                len(article_sentiments) if article_sentiments else 0
-
-            # Determine overall sentiment
-            if avg_score > 0.2 and avg_magnitude > 0.2:
-                sentiment_type = "positive"
-            elif avg_score < -0.2 and avg_magnitude > 0.2:
-                sentiment_type = "negative"
-            else:
-                sentiment_type = "neutral"
-
-            # Prepare result
-            result = {
-                'score': avg_score,
-                'magnitude': avg_magnitude,
-                'article_count': article_count,
-                'sentiment_type': sentiment_type,
-                'latest_headlines': headlines[:3],  # Top 3 latest headlines
-                'source': 'NewsAPI',
-                'market_wide': True
-            }
+            # Same aggregation as per-symbol lookups, flagged as market-wide
+            result = self.summarize_articles(articles)
+            result['market_wide'] = True
+            sentiment_type = result['sentiment_type']
+            avg_score = result['score']
 
             # Add context message
             if sentiment_type == "positive":
@@ -479,9 +463,132 @@ class NewsSentimentAnalyzer:
         except Exception as e:
             logger.error(f"Error updating market sentiment: {str(e)}")
             # Fallback to Fear & Greed Index
-            return self.get_fear_greed_based_sentiment()
+            return await self.get_fear_greed_based_sentiment()
+
+    def get_cached_sentiment(self, symbol, days=2):
+        """Look up a still-valid sentiment in memory, then on disk"""
+        return self.store.get(f"{symbol}_{days}")
+
+    async def fetch_sentiments(self, symbols, days=2, cycle_seconds=None):
+        """
+        Resolve news sentiment for a whole scan cycle in one batch.
+        Cached results are collected first, the rest are fetched concurrently.
+
+        Args:
+            symbols (list): Trading pairs to look up
+            days (int): Number of days to look back
+            cycle_seconds (float): Caller's time between scan cycles, for quota planning
+
+        Returns:
+            dict: Sentiment analysis results keyed by symbol
+        """
+        resolved = {}
+        sources = {'memory': 0, 'disk': 0}
+        missing = []
+
+        # One store lookup for the whole cycle
+        cached = self.store.get_many(f"{symbol}_{days}" for symbol in symbols)
+        for symbol in dict.fromkeys(symbols):
+            cached_result, source = cached.get(f"{symbol}_{days}", (None, None))
+            if cached_result:
+                resolved[symbol] = cached_result
+                sources[source] += 1
+            else:
+                missing.append(symbol)
+
+        if missing:
+            resolved.update(await self.fetch_planned_sentiments(missing, days, cycle_seconds))
+
+        logger.info(
+            f"Resolved news sentiment for {len(resolved)} symbols: {sources['memory']} from memory, "
+            f"{sources['disk']} from disk, {len(missing)} fetched")
+        return resolved
+
+    async def run_news_query(self, query, days=2):
+        """Run one NewsAPI query and return its articles, or None on error"""
+        from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        params = {
+            'q': query,
+            'from': from_date,
+            'sortBy': 'publishedAt',
+            'language': 'en',
+            'pageSize': 100,
+            'apiKey': self.api_key
+        }
+
+        # Count the call before awaiting so concurrent queries see the quota
+        self.increment_api_counter()
+        try:
+            response = await get_http_client().get(
+                'https://newsapi.org/v2/everything', params=params)
+        except Exception as e:
+            logger.warning(f"NewsAPI request failed for '{query}': {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            logger.warning(
+                f"NewsAPI error: {response.status_code} - {response.text}")
+            return None
+        return response.json().get('articles', [])
+
+    async def fetch_planned_sentiments(self, symbols, days=2, cycle_seconds=None):
+        """
+        Fetch sentiment for uncached symbols through combined, quota-planned queries
+
+        Args:
+            symbols (list): Symbols in priority order (most traded first)
+            days (int): Number of days to look back
+            cycle_seconds (float): Time between scan cycles (default: the planner's)
+
+        Returns:
+            dict: Sentiment analysis results keyed by symbol
+        """
+        self.reset_api_counter_if_due()
+        seconds_until_reset = (
+            self.api_calls_reset_time - datetime.now()).total_seconds()
+        max_calls = self.planner.calls_for_cycle(
+            self.api_calls_today, seconds_until_reset, cycle_seconds)
+
+        search_terms = {symbol: self.get_search_term(symbol) for symbol in symbols}
+        queries = self.planner.plan(symbols, search_terms, max_calls) if self.api_key else []
+        responses = await asyncio.gather(
+            *(self.run_news_query(q['query'], days) for q in queries))
+
+        results = {}
+        to_store = {}
+        attempted = set()
+        for query, articles in zip(queries, responses):
+            if articles is None:
+                continue
+            attempted.update(query['terms'])
+            matched = self.planner.split_articles(articles, query['terms'])
+            for symbol, symbol_articles in matched.items():
+                if symbol_articles:
+                    result = self.summarize_articles(symbol_articles)
+                    to_store[f"{symbol}_{days}"] = result
+                    results[symbol] = result
+
+        uncovered = [symbol for symbol in symbols if symbol not in results]
+        if uncovered:
+            market_sentiment = await self.update_market_sentiment()
+            for symbol in uncovered:
+                result = market_sentiment.copy()
+                if symbol in attempted:
+                    # Queried but not in the news: cache like a normal lookup
+                    result['note'] = f"No articles for {symbol}, using market sentiment"
+                    to_store[f"{symbol}_{days}"] = result
+                else:
+                    # Out of budget this cycle: don't cache so a later cycle can cover it
+                    result['note'] = f"Using market-wide sentiment for {symbol} (API budget)"
+                results[symbol] = result
+
+        self.store.put_many(to_store, self.cache_expiry)
+        logger.info(
+            f"News sentiment: {len(symbols) - len(uncovered)} symbols from "
+            f"{len(queries)} combined queries, {len(uncovered)} on market-wide sentiment")
+        return results
 
-    def fetch_sentiment(self, symbol, days=2):
+    async def fetch_sentiment(self, symbol, days=2):
         """
         Fetch news sentiment for a cryptocurrency
 
@@ -492,24 +599,15 @@ class NewsSentimentAnalyzer:
         Returns:
             dict: Sentiment analysis results
         """
-        try:
-            # Generate cache key
-            cache_key = f"{symbol}_{days}"
-            current_time = datetime.now().timestamp()
+        return await self.flight.do(
+            f"{symbol}_{days}", self._fetch_sentiment, symbol, days)
 
-            # First check memory cache
-            if cache_key in self.memory_cache:
-                cached_result, cache_time = self.memory_cache[cache_key]
-                # Return cached result if still valid
-                if current_time - cache_time < self.cache_expiry:
-                    logger.info(f"[{symbol}] Using in-memory sentiment cache")
-                    return cached_result
-
-            # Then check file cache
-            cached_result = self.load_cached_sentiment(symbol, days)
+    async def _fetch_sentiment(self, symbol, days):
+        try:
+            # First check memory, then file cache
+            cached_result, source = self.get_cached_sentiment(symbol, days)
             if cached_result:
-                # Also update memory cache
-                self.memory_cache[cache_key] = (cached_result, current_time)
+                logger.debug(f"[{symbol}] Using {source} sentiment cache")
                 return cached_result
 
             # If we're API rate limited or low on quota,
@@ -519,15 +617,14 @@ class NewsSentimentAnalyzer:
                     f"[{symbol}] Using market-wide sentiment due to API limit")
 
                 # Get/update market sentiment
-                market_sentiment = self.update_market_sentiment()
+                market_sentiment = await self.update_market_sentiment()
 
                 # Create a copy for this symbol
                 result = market_sentiment.copy()
                 result['note'] = f"Using market-wide sentiment for {symbol} (API limit)"
 
                 # Cache the result
-                self.memory_cache[cache_key] = (result, current_time)
-                self.save_cached_sentiment(symbol, days, result)
+                self.store_sentiment(symbol, days, result)
 
                 return result
 
@@ -548,11 +645,12 @@ class NewsSentimentAnalyzer:
                 'apiKey': self.api_key
             }
 
-            response = requests.get(url, params=params)
-
-            # Increment the API counter regardless of response
+            # Increment the API counter regardless of response, before awaiting
+            # so concurrent lookups see the reserved quota
             self.increment_api_counter()
 
+            response = await get_http_client().get(url, params=params)
+
             # Check for API errors
             if response.status_code != 200:
                 logger.warning(
@@ -561,15 +659,14 @@ class NewsSentimentAnalyzer:
                 # Use market sentiment as fallback
                 logger.info(
                     f"[{symbol}] Using market-wide sentiment as fallback")
-                market_sentiment = self.update_market_sentiment()
+                market_sentiment = await self.update_market_sentiment()
 
                 # Add specific symbol info to the result
                 result = market_sentiment.copy()
                 result['note'] = f"API error for {symbol}, using market sentiment"
 
                 # Cache the result
-                self.memory_cache[cache_key] = (result, current_time)
-                self.save_cached_sentiment(symbol, days, result)
+                self.store_sentiment(symbol, days, result)
 
                 return result
 
@@ -582,76 +679,20 @@ class NewsSentimentAnalyzer:
             if article_count == 0:
                 logger.info(
                     f"[{symbol}] No articles found, using market sentiment")
-                market_sentiment = self.update_market_sentiment()
+                market_sentiment = await self.update_market_sentiment()
 
                 # Add specific symbol info to the result
                 result = market_sentiment.copy()
                 result['note'] = f"No articles for {symbol}, using market sentiment"
 
                 # Cache the result
-                self.memory_cache[cache_key] = (result, current_time)
-                self.save_cached_sentiment(symbol, days, result)
+                self.store_sentiment(symbol, days, result)
 
                 return result
 
-            # Analyze sentiment for each article
-            total_score = 0
-            total_magnitude = 0
-            headlines = []
-            article_sentiments = []
-
-            for article in articles[:10]:  # Analyze up to 10 articles
-                title = self.clean_text(article.get('title', ''))
-                description = self.clean_text(article.get('description', ''))
-
-                # Combined text for sentiment analysis
-                combined_text = f"{title} {description}"
-
-                # Get sentiment for this article
-                sentiment = self.analyze_sentiment(combined_text)
-
-                # Add to totals
-                total_score += sentiment['score']
-                total_magnitude += sentiment['magnitude']
-
-                # Save headline and URL
-                headline = article.get('title', '')
-                url = article.get('url', '')
-                published_at = article.get('publishedAt', '')
-
-                if headline and url:
-                    headlines.append({
-                        'title': headline,
-                        'url': url,
-                        'publishedAt': published_at,
-                        'sentiment': sentiment['type']
-                    })
-
-                article_sentiments.append(sentiment)
-
-            # Calculate average sentiment
-            avg_score = total_score / \
-                len(article_sentiments) if article_sentiments else 0
-            avg_magnitude = total_magnitude / \
-                len(article_sentiments) if article_sentiments else 0
-
-            # Determine overall sentiment
-            if avg_score > 0.2 and avg_magnitude > 0.2:
-                sentiment_type = "positive"
-            elif avg_score < -0.2 and avg_magnitude > 0.2:
-                sentiment_type = "negative"
-            else:
-                sentiment_type = "neutral"
-
-            # Prepare result
-            result = {
-                'score': avg_score,
-                'magnitude': avg_magnitude,
-                'article_count': article_count,
-                'sentiment_type': sentiment_type,
-                'latest_headlines': headlines[:3],  # Top 3 latest headlines
-                'source': 'NewsAPI'
-            }
+            result = self.summarize_articles(articles)
+            sentiment_type = result['sentiment_type']
+            avg_magnitude = result['magnitude']
 
             # Add context message
             if sentiment_type == "positive":
@@ -668,8 +709,7 @@ class NewsSentimentAnalyzer:
                 logger.info(f"[{symbol}] Neutral news sentiment")
 
             # Cache the result
-            self.memory_cache[cache_key] = (result, current_time)
-            self.save_cached_sentiment(symbol, days, result)
+            self.store_sentiment(symbol, days, result)
 
             return result
 
@@ -679,7 +719,7 @@ class NewsSentimentAnalyzer:
 
             # Use market sentiment as fallback
             try:
-                market_sentiment = self.update_market_sentiment()
+                market_sentiment = await self.update_market_sentiment()
                 result = market_sentiment.copy()
                 result['note'] = f"Error for {symbol}, using market sentiment"
                 return result
@@ -793,28 +833,56 @@ class NewsSentimentAnalyzer:
             return confidence
 
 
-# Create a global instance
-sentiment_analyzer = NewsSentimentAnalyzer()
+# Global instance, built on first use so importing this module stays cheap
+_sentiment_analyzer = None
+
+
+def get_sentiment_analyzer():
+    """Get the global sentiment analyzer, creating it on first use"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        _sentiment_analyzer = NewsSentimentAnalyzer()
+    return _sentiment_analyzer
+
+
+def __getattr__(name):
+    # Keep `from core.news_sentiment import sentiment_analyzer` working
+    if name == 'sentiment_analyzer':
+        return get_sentiment_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions that use the global instance
 
 
-def fetch_sentiment(symbol, days=2):
+async def fetch_sentiment(symbol, days=2):
     """Wrapper for sentiment analyzer's fetch_sentiment method"""
-    return sentiment_analyzer.fetch_sentiment(symbol, days)
+    return await get_sentiment_analyzer().fetch_sentiment(symbol, days)
+
+
+async def fetch_sentiments(symbols, days=2, cycle_seconds=None):
+    """Wrapper for sentiment analyzer's fetch_sentiments method"""
+    return await get_sentiment_analyzer().fetch_sentiments(symbols, days, cycle_seconds)
 
 
 def adjust_confidence(confidence, sentiment_data, direction=None, symbol=None):
     """Wrapper for sentiment analyzer's adjust_confidence method"""
-    return sentiment_analyzer.adjust_confidence_with_sentiment(confidence, sentiment_data, direction, symbol)
+    return get_sentiment_analyzer().adjust_confidence_with_sentiment(confidence, sentiment_data, direction, symbol)
+
+
+async def refresh_market_sentiment():
+    """Refresh market-wide sentiment in the background so the first scan finds it cached"""
+    try:
+        await get_sentiment_analyzer().update_market_sentiment()
+    except Exception as e:
+        logger.error(f"Error refreshing market sentiment: {str(e)}")
 
 
 # Test function
-if __name__ == "__main__":
-    # Simple test
+async def _test():
     print("Testing news sentiment analysis...")
-    for symbol in ["BTC/USDT", "ETH/USDT", "DOGE/USDT"]:
-        sentiment = fetch_sentiment(symbol)
+    symbols = ["BTC/USDT", "ETH/USDT", "DOGE/USDT"]
+    sentiments = await fetch_sentiments(symbols)
+    for symbol, sentiment in sentiments.items():
         print(
             f"Sentiment for {symbol}: {sentiment['sentiment_type']} (Score: {sentiment['score']:.2f})")
 
@@ -826,9 +894,15 @@ if __name__ == "__main__":
             print(f"  {direction} confidence: {base_confidence} → {adjusted}")
 
     print("\nTesting market sentiment...")
-    market_sentiment = sentiment_analyzer.update_market_sentiment()
+    sentiment_analyzer = get_sentiment_analyzer()
+    market_sentiment = await sentiment_analyzer.update_market_sentiment()
     print(
         f"Market sentiment: {market_sentiment['sentiment_type']} (Score: {market_sentiment['score']:.2f})")
 
     print(f"\nAPI calls today: {sentiment_analyzer.api_calls_today}/100")
+    await close_http_client()
     print("Testing complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(_test())
@@ -0,0 +1,126 @@
+import math
+import calendar
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+
+class ScanPlanner:
+    """
+    Decides which symbols a scan cycle should spend time on.
+    Symbols in cooldown or failure backoff are dropped before scheduling and
+    the rest are ordered by a volume/volatility priority score.
+
+    With a store (the scanners' ClusterStore) cooldowns and backoff are
+    written through to it and reloaded before every plan, so all nodes and
+    restarts see the same state; without one they are kept in memory.
+    """
+
+    def __init__(self, cooldown_period=21600, base_backoff=300, max_backoff=6 * 3600,
+                 store=None):
+        self.cooldown_period = cooldown_period  # Seconds a symbol rests after a signal
+        self.base_backoff = base_backoff        # First failure backoff in seconds
+        self.max_backoff = max_backoff          # Backoff never grows beyond this
+        self.store = store
+        self.cooldowns = {}                     # symbol -> time of last signal
+        self.failures = {}                      # symbol -> (failure count, retry after)
+
+    def load(self):
+        """Replace the in-memory cooldowns and backoff with the store's"""
+        if self.store is None:
+            return
+        cooldowns, failures = {}, {}
+        for symbol, (started, count, retry_after) in self.store.symbol_states().items():
+            if started is not None:
+                cooldowns[symbol] = datetime.utcfromtimestamp(started)
+            if count and retry_after is not None:
+                failures[symbol] = (count, datetime.utcfromtimestamp(retry_after))
+        self.cooldowns = cooldowns
+        self.failures = failures
+
+    def in_cooldown(self, symbol: str, now: Optional[datetime] = None) -> bool:
+        """Check if a symbol recently produced a signal"""
+        started = self.cooldowns.get(symbol)
+        if started is None:
+            return False
+        now = now or datetime.utcnow()
+        if now < started + timedelta(seconds=self.cooldown_period):
+            return True
+        del self.cooldowns[symbol]
+        return False
+
+    def in_backoff(self, symbol: str, now: Optional[datetime] = None) -> bool:
+        """Check if a symbol is waiting out a failure backoff"""
+        failure = self.failures.get(symbol)
+        if failure is None:
+            return False
+        now = now or datetime.utcnow()
+        return now < failure[1]
+
+    def start_cooldown(self, symbol: str, now: Optional[datetime] = None):
+        """Put a symbol in cooldown after it produced a signal"""
+        self.cooldowns[symbol] = now or datetime.utcnow()
+        self.failures.pop(symbol, None)
+        if self.store is not None:
+            self.store.start_cooldown(
+                symbol, calendar.timegm(self.cooldowns[symbol].utctimetuple()))
+
+    def record_failure(self, symbol: str, now: Optional[datetime] = None):
+        """Back off a symbol exponentially after a failed analysis"""
+        now = now or datetime.utcnow()
+        if self.store is not None:
+            # Counted in the store, so failures on other nodes add up
+            count, delay = self.store.record_failure(
+                symbol, self.base_backoff, self.max_backoff, calendar.timegm(now.utctimetuple()))
+        else:
+            count = self.failures.get(symbol, (0, now))[0] + 1
+            delay = min(self.base_backoff * 2 ** (count - 1), self.max_backoff)
+        self.failures[symbol] = (count, now + timedelta(seconds=delay))
+        logger.info(
+            f"[{symbol}] Backing off for {delay / 60:.0f} minutes after {count} failure(s)")
+
+    def record_success(self, symbol: str):
+        """Clear the failure backoff after a completed analysis"""
+        self.failures.pop(symbol, None)
+        if self.store is not None:
+            self.store.record_success(symbol)
+
+    def priority_score(self, ticker: Dict) -> float:
+        """Score a ticker by traded volume, boosted by its 24h volatility"""
+        volume = ticker.get('quoteVolume') or 0
+        change = abs(ticker.get('percentage') or 0)
+        if volume <= 0:
+            return 0.0
+        # Log volume keeps a single mega-cap from drowning out volatility
+        return math.log10(volume) * (1 + change / 10)
+
+    def plan(self, tickers: Dict[str, Dict], limit: Optional[int] = None) -> List[str]:
+        """
+        Build the ordered symbol list for the next scan cycle
+
+        Args:
+            tickers (dict): Candidate symbols mapped to their ticker data
+            limit (int): Maximum number of symbols to schedule
+
+        Returns:
+            list: Symbols ready to scan, highest priority first
+        """
+        self.load()
+        now = datetime.utcnow()
+        cooling = [s for s in tickers if self.in_cooldown(s, now)]
+        backing_off = [s for s in tickers
+                       if s not in cooling and self.in_backoff(s, now)]
+        skipped = set(cooling) | set(backing_off)
+
+        ready = [s for s in tickers if s not in skipped]
+        ready.sort(key=lambda s: self.priority_score(tickers[s]), reverse=True)
+        if limit is not None:
+            ready = ready[:limit]
+
+        logger.info(
+            f"Scan plan: {len(ready)} symbols scheduled, {len(cooling)} in cooldown, "
+            f"{len(backing_off)} in failure backoff")
+        return ready
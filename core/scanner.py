@@ -0,0 +1,908 @@
+import os
+import sys
+import time
+import signal as os_signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import Dict, List
+from datetime import datetime
+
+# Add parent directory to path when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scan_planner import ScanPlanner
+from core.hash_ring import HashRing
+from data.market_cache import market_cache
+from data.exchange_pool import get_exchange, close_exchanges, exchange_pool
+from data.request_coalescer import request_coalescer
+from data.weight_limiter import weight_limiter
+from data.work_queue import WorkQueue, DEFAULT_DB_PATH
+from data.cluster_store import ClusterStore, DEFAULT_DB_PATH as CLUSTER_DB_PATH
+from utils.logger import get_performance_tracker, setup_logging, attach_to_queue, get_log_queue
+from utils import metrics, tracing
+from utils.metrics import STORAGE_WRITE_SECONDS
+from utils.profiling import ProfileSession
+from utils import executors
+from utils.executors import run_io
+from utils.http_client import close_http_client
+from utils.config import get_config
+
+log = logging.getLogger("crypto-signal-bot")
+
+EXCHANGE = None  # Shared pooled client, set when a scanner process starts
+# Symbol limit, volume floor, confidence threshold, cooldown and timeframes
+# come from the "scanner" section of config/confidence_config.json, see get_config()
+ANALYSIS_BARS = 200  # Same limit as the analysis so its fetches hit the memo
+SCAN_INTERVAL = 1800  # Length of a scan cycle; cycles are aligned across nodes
+POLL_INTERVAL = 5  # How often idle workers and the supervisor check the queue
+HEARTBEAT_INTERVAL = 15
+
+SYMBOL_SECONDS = metrics.histogram(
+    'symbol_scan_seconds', 'Time to scan one symbol across all timeframes', ['outcome'],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300))
+CYCLE_SECONDS = metrics.histogram(
+    'scan_cycle_seconds', 'Time from planning a cycle until its queue drained',
+    buckets=(30, 60, 120, 300, 600, 900, 1200, 1800, 3600))
+CYCLE_SYMBOLS = metrics.gauge('scan_cycle_symbols', 'Symbols scanned by this node in the last cycle')
+CYCLE_SIGNALS = metrics.gauge('scan_cycle_signals', 'Signals found by this node in the last cycle')
+SIGNALS = metrics.counter('signals_total', 'Signals found by this node')
+
+_predictor = None
+
+
+def get_predictor():
+    """Get the signal predictor, loading the ML stack on first use"""
+    global _predictor
+    if _predictor is None:
+        from model.predictor import SignalPredictor
+        _predictor = SignalPredictor()
+        log.info("Signal Predictor initialized successfully")
+    return _predictor
+
+
+async def init_exchange():
+    """Connect the process's pooled exchange client, retrying until markets load"""
+    global EXCHANGE
+    while EXCHANGE is None:
+        try:
+            exchange = await get_exchange()
+            await market_cache.load_markets(exchange)
+            EXCHANGE = exchange
+            log.info("Binance API connection successful")
+        except Exception as e:
+            log.error("Error connecting to exchange: %s, retrying in 60s", e)
+            await asyncio.sleep(60)
+    return EXCHANGE
+
+
+def client_stats() -> Dict:
+    """Exchange client, coalescer and rate limiter counters published with each heartbeat"""
+    return {"clients": exchange_pool.stats(), "coalescer": request_coalescer.stats(),
+            "limiter": weight_limiter.stats()}
+
+
+async def update_signal_statuses_task():
+    """Background task to periodically update signal statuses"""
+    from script.update_signal_status import SignalStatusUpdater
+
+    while True:
+        try:
+            updater = SignalStatusUpdater(await get_exchange())
+            await updater.update_signal_statuses()
+        except Exception as e:
+            log.error("Error updating signal statuses: %s", e)
+
+        # Wait for 15 minutes before next update
+        await asyncio.sleep(15 * 60)  # 15 minutes
+
+
+async def fetch_ohlcv(symbol: str, timeframe: str, limit: int = 100) -> "pd.DataFrame":
+    import pandas as pd
+
+    # Rate limits are handled by the pooled client: requests wait for weight
+    # budget and 429s are retried after their Retry-After
+    try:
+        ohlcv = await request_coalescer.fetch_ohlcv(EXCHANGE, symbol, timeframe, limit=limit)
+        df = pd.DataFrame(
+            ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+    except Exception as e:
+        log.error("[%s] Error fetching OHLCV for %s: %s", symbol, timeframe, e)
+        return pd.DataFrame()
+
+
+async def get_high_volume_symbols() -> Dict[str, Dict]:
+    """Get USDT pairs above the volume floor, mapped to their tickers"""
+    try:
+        min_volume = get_config().min_volume
+        tickers = await market_cache.get_tickers(EXCHANGE)
+        candidates = {
+            symbol: tickers[symbol]
+            for symbol in market_cache.get_volume_ranking('USDT', min_volume)
+        }
+        log.info("Selected %d USDT pairs with volume >= $%g", len(candidates), min_volume)
+        return candidates
+    except Exception as e:
+        log.error("Error fetching symbols: %s", e)
+        return {}
+
+
+async def save_signal_to_csv(signal: Dict):
+    """Append a signal to the CSV logs without blocking the event loop"""
+    await run_io(_write_signal_csv, signal)
+
+
+def _write_signal_csv(signal: Dict):
+    import pandas as pd
+
+    try:
+        # Make a copy of the signal to avoid modifying the original
+        signal_copy = signal.copy()
+
+        # Ensure timestamp is properly formatted
+        if 'timestamp' in signal_copy:
+            if isinstance(signal_copy['timestamp'], pd.Timestamp):
+                signal_copy['timestamp'] = signal_copy['timestamp'].strftime(
+                    '%Y-%m-%d %H:%M:%S')
+            elif isinstance(signal_copy['timestamp'], (int, float)):
+                signal_copy['timestamp'] = datetime.fromtimestamp(
+                    signal_copy['timestamp'] /
+                    1000 if signal_copy['timestamp'] > 1000000000000 else signal_copy['timestamp']
+                ).strftime('%Y-%m-%d %H:%M:%S')
+            elif signal_copy['timestamp'] == 'timestamp' or not signal_copy['timestamp']:
+                signal_copy['timestamp'] = datetime.now().strftime(
+                    '%Y-%m-%d %H:%M:%S')
+        else:
+            signal_copy['timestamp'] = datetime.now().strftime(
+                '%Y-%m-%d %H:%M:%S')
+
+        # Add status if not present
+        if 'status' not in signal_copy:
+            signal_copy['status'] = 'pending'
+
+        # Add timeframe if missing
+        if 'timeframe' not in signal_copy and 'tp1' in signal_copy and isinstance(signal_copy['tp1'], str) and len(signal_copy['tp1']) <= 3:
+            signal_copy['timeframe'] = signal_copy['tp1']
+
+        # Add missing possibility fields with default values
+        if 'tp1_possibility' not in signal_copy:
+            signal_copy['tp1_possibility'] = 0.7
+        if 'tp2_possibility' not in signal_copy:
+            signal_copy['tp2_possibility'] = 0.5
+        if 'tp3_possibility' not in signal_copy:
+            signal_copy['tp3_possibility'] = 0.3
+
+        # Make sure we have numeric values where required
+        numeric_fields = ['entry', 'tp1', 'tp2', 'tp3', 'sl', 'confidence']
+        for field in numeric_fields:
+            if field in signal_copy and not isinstance(signal_copy[field], (int, float)):
+                try:
+                    signal_copy[field] = float(
+                        str(signal_copy[field]).replace(',', ''))
+                except (ValueError, TypeError):
+                    log.warning("Couldn't convert %s to number: %s", field, signal_copy[field])
+
+        # Check if file exists to determine if we need headers
+        file_exists = os.path.exists('logs/signals_log_new.csv')
+
+        # Create DataFrame and save to CSV
+        df = pd.DataFrame([signal_copy])
+        with STORAGE_WRITE_SECONDS.time('signals_csv'):
+            df.to_csv('logs/signals_log_new.csv', mode='a', index=False,
+                      header=not file_exists)
+        log.info("Signal logged to logs/signals_log_new.csv with timestamp %s",
+                 signal_copy['timestamp'])
+
+        # Also add to performance tracking
+        try:
+            # Create performance record explicitly
+            perf_record = {
+                'symbol': signal_copy['symbol'],
+                'direction': signal_copy['direction'],
+                'timeframe': signal_copy.get('timeframe', ''),
+                'confidence': signal_copy['confidence'],
+                'success': '',
+                'timestamp': signal_copy['timestamp'],
+                'entry': signal_copy['entry'],
+                'exit_price': 0,
+                'tp1': signal_copy['tp1'],
+                'tp2': signal_copy['tp2'],
+                'tp3': signal_copy['tp3'],
+                'sl': signal_copy['sl'],
+                'status': 'pending',
+                'profit_loss': 0,
+                'hit_time': '',
+                'duration_minutes': 0
+            }
+
+            # Check if performance file exists
+            perf_file = "logs/signal_performance.csv"
+            if not os.path.exists(perf_file):
+                pd.DataFrame([perf_record]).to_csv(perf_file, index=False)
+                log.info("Created performance file with new signal")
+            else:
+                # Check if signal already exists in performance tracking
+                perf_df = pd.read_csv(perf_file)
+                exists = False
+
+                for _, perf in perf_df.iterrows():
+                    if (perf['symbol'] == signal_copy['symbol'] and
+                            str(perf['timestamp']) == str(signal_copy['timestamp'])):
+                        exists = True
+                        break
+
+                if not exists:
+                    # Add new record
+                    perf_df = pd.concat(
+                        [perf_df, pd.DataFrame([perf_record])], ignore_index=True)
+                    perf_df.to_csv(perf_file, index=False)
+                    log.info("Added signal to performance tracking")
+                else:
+                    log.info("Signal already exists in performance tracking")
+
+        except Exception as e:
+            log.error("Error updating performance tracking: %s", e)
+
+    except Exception as e:
+        log.error("Error saving signal to CSV: %s", e)
+
+
+async def process_symbol(symbol: str, context: Dict = None) -> str:
+    """
+    Analyze one symbol and publish its signal, if any
+
+    Returns:
+        str: Outcome for the supervisor's planner: 'signal', 'no_signal' or 'no_data'
+    """
+    log.info("[%s] Starting multi-timeframe analysis", symbol)
+    settings = get_config()
+
+    timeframe_data = {}
+    for timeframe in settings.timeframes:
+        with tracing.span('fetch_ohlcv', timeframe=timeframe) as span:
+            df = await fetch_ohlcv(symbol, timeframe, limit=ANALYSIS_BARS)
+            span.set(rows=len(df))
+        if not df.empty:
+            timeframe_data[timeframe] = df
+        else:
+            log.warning("[%s] No OHLCV data for %s", symbol, timeframe)
+
+    if not timeframe_data:
+        log.warning("[%s] No data available for any timeframe", symbol)
+        return 'no_data'
+
+    from core.analysis import analyze_symbol_multi_timeframe
+
+    with tracing.span('analyze_multi_timeframe'):
+        result = await analyze_symbol_multi_timeframe(
+            EXCHANGE, symbol, list(settings.timeframes), get_predictor(), bars=ANALYSIS_BARS, context=context)
+
+    if result and 'signals' in result and result['signals']:
+        best_signal = max(result['signals'],
+                          key=lambda x: x['confidence'], default=None)
+        if best_signal and best_signal['confidence'] >= settings.confidence_threshold:
+            # Add trade type
+            best_signal['trade_type'] = "Normal" if best_signal['confidence'] >= 80 else "Scalping"
+
+            # Keep timestamp as 2025 as this seems to be your current year setting
+            current_time = datetime.now()
+            best_signal['timestamp'] = current_time.strftime(
+                '%Y-%m-%d %H:%M:%S')
+
+            # Ensure all required fields exist
+            required_fields = ['tp1_possibility',
+                               'tp2_possibility', 'tp3_possibility', 'timeframe']
+            for field in required_fields:
+                if field not in best_signal:
+                    if 'possibility' in field:
+                        best_signal[field] = 0.7 if 'tp1' in field else 0.5 if 'tp2' in field else 0.3
+                    elif field == 'timeframe':
+                        best_signal[field] = next(iter(timeframe_data.keys()))
+
+            # Send signal to Telegram only if confidence is high enough
+            telegram_sent = False
+            try:
+                from telebot.sender import send_telegram_signal
+                with tracing.span('send_telegram'):
+                    telegram_sent = await send_telegram_signal(symbol, best_signal)
+                if telegram_sent:
+                    log.info("[%s] HIGH CONFIDENCE (%.2f%%) Telegram signal sent successfully",
+                             best_signal['symbol'], best_signal['confidence'])
+                else:
+                    log.info("[%s] Signal recorded but not sent to Telegram (confidence below 90%%)",
+                             best_signal['symbol'])
+            except Exception as e:
+                log.error("Error sending Telegram signal: %s", e)
+
+            # Always save the signal to CSV regardless of Telegram status
+            with tracing.span('save_signal'):
+                await save_signal_to_csv(best_signal)
+
+            if telegram_sent:
+                log.info("✅ HIGH CONFIDENCE Signal SENT to Telegram ✅")
+            else:
+                log.debug("📊 Signal recorded but not sent to Telegram")
+            return 'signal'
+
+        else:
+            log.info("⚠️ %s - No signal with sufficient confidence", symbol)
+    else:
+        log.info("⚠️ %s - No valid signals", symbol)
+    return 'no_signal'
+
+
+async def check_and_fix_signal_logs():
+    """Check signal logs for timestamp issues and fix them"""
+    log.info("Checking signal logs for timestamp issues...")
+
+    for logfile in ['logs/signals_log.csv', 'logs/signals_log_new.csv']:
+        if os.path.exists(logfile):
+            try:
+                import pandas as pd
+                df = pd.read_csv(logfile)
+                if 'timestamp' in df.columns:
+                    # Check for literal "timestamp" values
+                    timestamp_issues = (df['timestamp'] == 'timestamp').sum()
+                    if timestamp_issues > 0:
+                        log.warning("Found %d rows with literal 'timestamp' value in %s",
+                                    timestamp_issues, logfile)
+                        # Replace with current time
+                        df.loc[df['timestamp'] == 'timestamp', 'timestamp'] = datetime.now().strftime(
+                            '%Y-%m-%d %H:%M:%S')
+
+                    # Save fixed file
+                    df.to_csv(logfile, index=False)
+                    log.info("Fixed %s timestamp issues", logfile)
+            except Exception as e:
+                log.error("Error checking %s: %s", logfile, e)
+
+    log.info("Signal log check complete")
+
+
+async def check_signal_status():
+    """Background task to periodically check and update signal statuses"""
+    import pandas as pd
+
+    while True:
+        try:
+            log.info("Running signal status check...")
+
+            # Load files
+            signals_file = "logs/signals_log_new.csv"
+            if not os.path.exists(signals_file):
+                log.warning("Signals file not found")
+                await asyncio.sleep(3600)  # Wait and retry later
+                continue
+
+            try:
+                # Update to use the current pandas parameter
+                df = await run_io(pd.read_csv, signals_file, on_bad_lines='skip')
+
+                # Check for column issues
+                if 'status' not in df.columns:
+                    df['status'] = 'pending'
+                    log.info("Added missing 'status' column")
+
+                # Save the fixed CSV
+                await run_io(df.to_csv, signals_file, index=False)
+
+                # Filter for pending signals
+                pending_signals = df[df['status'] == 'pending']
+            except Exception as e:
+                log.error("Error loading signal file: %s", e)
+
+                # Try to fix the CSV file manually
+                try:
+                    with open(signals_file, 'r') as f:
+                        lines = f.readlines()
+
+                    # Get header line
+                    header = lines[0].strip()
+                    headers = header.split(',')
+                    num_columns = len(headers)
+
+                    # Fix other lines
+                    fixed_lines = [header]
+                    for i, line in enumerate(lines[1:], 1):
+                        cols = line.strip().split(',')
+                        if len(cols) > num_columns:
+                            # Too many columns - combine some values
+                            fixed_line = ','.join(
+                                cols[:num_columns-1]) + ',"' + ','.join(cols[num_columns-1:]) + '"'
+                        elif len(cols) < num_columns:
+                            # Too few columns - add empty values
+                            fixed_line = line.strip() + ',' * (num_columns - len(cols) - 1)
+                        else:
+                            fixed_line = line.strip()
+                        fixed_lines.append(fixed_line)
+
+                    # Write fixed file
+                    with open(signals_file + '.fixed', 'w') as f:
+                        f.write('\n'.join(fixed_lines))
+
+                    # Try to load the fixed file
+                    df = pd.read_csv(signals_file + '.fixed',
+                                     on_bad_lines='skip')
+                    df.to_csv(signals_file, index=False)
+                    log.info("Fixed CSV file format issues")
+
+                    # Filter for pending signals
+                    pending_signals = df[df['status'] == 'pending']
+                except Exception as fix_error:
+                    log.error("Failed to fix CSV file: %s", fix_error)
+                    await asyncio.sleep(3600)  # Wait and retry later
+                    continue
+
+            if len(pending_signals) == 0:
+                log.info("No pending signals to check")
+                await asyncio.sleep(3600)  # Check again in an hour
+                continue
+
+            log.info("Checking %d pending signals", len(pending_signals))
+
+            # Reuse the pooled client for price checks
+            exchange = await get_exchange()
+
+            # Check each signal
+            updates = 0
+            for idx, signal in pending_signals.iterrows():
+                symbol = signal['symbol']
+                direction = signal['direction']
+
+                try:
+                    entry = float(signal['entry'])
+                    tp1 = float(signal['tp1'])
+                    tp2 = float(signal['tp2'])
+                    tp3 = float(signal['tp3'])
+                    sl = float(signal['sl'])
+
+                    # Get current price
+                    ticker = await request_coalescer.fetch_ticker(exchange, symbol)
+                    current_price = ticker['last']
+
+                    # Check for TP/SL hits
+                    status = None
+                    profit_loss = 0
+                    success = "NO"
+
+                    if direction == "LONG":
+                        if current_price <= sl:
+                            status = "sl"
+                            profit_loss = (current_price - entry) / entry * 100
+                        elif current_price >= tp3:
+                            status = "tp3"
+                            profit_loss = (current_price - entry) / entry * 100
+                            success = "YES"
+                        elif current_price >= tp2:
+                            status = "tp2"
+                            profit_loss = (current_price - entry) / entry * 100
+                            success = "YES"
+                        elif current_price >= tp1:
+                            status = "tp1"
+                            profit_loss = (current_price - entry) / entry * 100
+                            success = "YES"
+                    elif direction == "SHORT":
+                        if current_price >= sl:
+                            status = "sl"
+                            profit_loss = (entry - current_price) / entry * 100
+                        elif current_price <= tp3:
+                            status = "tp3"
+                            profit_loss = (entry - current_price) / entry * 100
+                            success = "YES"
+                        elif current_price <= tp2:
+                            status = "tp2"
+                            profit_loss = (entry - current_price) / entry * 100
+                            success = "YES"
+                        elif current_price <= tp1:
+                            status = "tp1"
+                            profit_loss = (entry - current_price) / entry * 100
+                            success = "YES"
+
+                    if status:
+                        # Update signal in CSV
+                        df.at[idx, 'status'] = status
+                        df.at[idx, 'exit_price'] = current_price
+                        df.at[idx, 'profit_loss'] = round(profit_loss, 2)
+                        updates += 1
+
+                        # Update performance tracking
+                        try:
+                            await run_io(
+                                get_performance_tracker().update_signal_status,
+                                symbol,
+                                signal['timestamp'],
+                                status,
+                                exit_price=current_price,
+                                profit_loss=profit_loss,
+                                success=success
+                            )
+                            log.info("Updated %s signal to %s, P/L: %.2f%%", symbol, status, profit_loss)
+                        except Exception as e:
+                            log.error("Error updating performance: %s", e)
+
+                except Exception as e:
+                    log.error("Error checking %s: %s", symbol, e)
+
+            # Save updated signals
+            if updates > 0:
+                await run_io(df.to_csv, signals_file, index=False)
+                log.info("Updated %d signals", updates)
+
+            await asyncio.sleep(3600)  # Check every hour
+
+        except Exception as e:
+            log.error("Error in signal status check: %s", e)
+            await asyncio.sleep(3600)  # Retry in an hour
+
+
+async def prepare_signal_logs():
+    # First check and fix signal logs
+    await check_and_fix_signal_logs()
+
+    # Sync existing signals to performance tracking
+    get_performance_tracker().sync_pending_signals()
+
+
+def current_cycle() -> int:
+    """Number of the scan cycle in progress, the same on every node"""
+    return int(time.time() // SCAN_INTERVAL)
+
+
+def update_profile_session(queue: WorkQueue, worker_id: str, session, job):
+    """
+    Start a profiling session when the API requested one, track scan cycles
+    for it and publish its results once it has run its course
+    """
+    if session is None:
+        request = queue.next_profile_request(worker_id)
+        if request is None:
+            return None
+        session = ProfileSession(
+            request['id'], request['mode'], request['amount'], bool(request['memory']))
+        queue.start_profile(request['id'], worker_id)
+        session.start()
+
+    if job is not None:
+        session.observe_cycle(job['cycle'])
+    elif session.current_cycle is not None and not queue.pending(session.current_cycle):
+        session.observe_cycle(None)  # The worker's cycle has drained
+
+    if session.expired():
+        queue.finish_profile(session.request_id, worker_id, session.stop())
+        return None
+    return session
+
+
+async def keep_alive(queue: WorkQueue, worker_id: str, symbol: str, processed: int, failed: int):
+    """
+    Refresh the worker's heartbeat while a symbol is in flight, so a slow
+    symbol (e.g. one waiting on the weight limiter) is not taken for a dead
+    worker and requeued while it is still being analyzed
+    """
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        try:
+            queue.heartbeat(worker_id, 'worker', 'running', symbol, processed, failed)
+        except Exception as e:
+            log.error("Error publishing heartbeat for %s: %s", worker_id, e)
+
+
+async def run_worker(worker_id: str, db_path: str = DEFAULT_DB_PATH, node_id: str = None):
+    """
+    Claim symbols from the work queue and analyze them until stopped. Workers
+    do not pause between symbols; the shared weight limiter paces requests.
+    """
+    queue = WorkQueue(db_path, node_id=node_id)
+    processed = failed = 0
+    tracing.configure(worker_id)
+    queue.heartbeat(worker_id, 'worker', 'connecting')
+    await init_exchange()
+    last_heartbeat = 0.0
+    session = None  # Active on-demand profiling session
+
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            session = update_profile_session(queue, worker_id, session, job)
+            if job is None:
+                if time.time() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                    queue.heartbeat(worker_id, 'worker', 'idle', processed=processed,
+                                    failed=failed, stats=client_stats())
+                    queue.publish_metrics(worker_id, metrics.snapshot())
+                    last_heartbeat = time.time()
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+
+            symbol = job['symbol']
+            queue.heartbeat(worker_id, 'worker', 'running', symbol, processed, failed)
+            heartbeat = asyncio.create_task(keep_alive(queue, worker_id, symbol, processed, failed))
+            started = time.perf_counter()
+            with tracing.trace('scan_symbol', symbol=symbol, cycle=job['cycle']) as root:
+                try:
+                    outcome = await process_symbol(symbol, job['context'])
+                    queue.complete(job['id'], outcome, worker_id=worker_id)
+                except Exception as e:
+                    log.error("Error processing %s: %s", symbol, e)
+                    queue.complete(job['id'], 'error', str(e), worker_id=worker_id)
+                    outcome = 'error'
+                    failed += 1
+                finally:
+                    heartbeat.cancel()
+                root.set(outcome=outcome)
+            processed += 1
+            SYMBOL_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+
+            queue.heartbeat(worker_id, 'worker', 'paused', processed=processed,
+                            failed=failed, stats=client_stats())
+            queue.publish_metrics(worker_id, metrics.snapshot())
+            last_heartbeat = time.time()
+    finally:
+        if session is not None:
+            queue.finish_profile(session.request_id, worker_id, session.stop())
+        queue.remove_worker(worker_id)
+        await close_exchanges()
+        await close_http_client()
+
+
+def _worker_main(worker_id: str, db_path: str, log_queue=None, node_id: str = None):
+    """Entry point of a spawned worker process"""
+    if log_queue is not None:
+        attach_to_queue(log_queue, worker_id)
+    # Scanner workers already run in parallel; one analysis process each is enough
+    executors.CPU_WORKERS = 1
+    os_signal.signal(os_signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(run_worker(worker_id, db_path, node_id))
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+
+class ScanSupervisor:
+    """
+    Plans scan cycles for one scanner node and keeps its worker processes
+    running. Nodes split the ranked USDT universe on a consistent-hash ring
+    of the live nodes and lease each symbol for the cycle in the shared
+    cluster store, so every symbol is analyzed once per cycle no matter how
+    many nodes run. Symbols of nodes that leave are taken over by the new
+    owner once their leases expire.
+    """
+
+    def __init__(self, num_workers=2, db_path=DEFAULT_DB_PATH, cluster_db=CLUSTER_DB_PATH,
+                 node_id=None):
+        self.num_workers = num_workers
+        self.db_path = db_path
+        self.node_id = node_id or f"{os.uname().nodename}-{os.getpid()}"
+        # Nodes on one host may share db_path; the queue keeps to this node's jobs
+        self.queue = WorkQueue(db_path, node_id=self.node_id)
+        self.cluster = ClusterStore(cluster_db)
+        # Cooldown and backoff are kept in the cluster store so they hold for
+        # whichever node owns a symbol after the ring changes
+        self.planner = ScanPlanner(cooldown_period=get_config().cooldown_period,
+                                   store=self.cluster)
+        self.worker_id = f"supervisor-{os.getpid()}"
+        self.processes = {}  # worker id -> Process
+        self.context = multiprocessing.get_context('spawn')
+        self.candidates = []  # Ranked symbols of the current cycle, before sharding
+        self.queued = set()   # Symbols this node queued in the current cycle
+        self.completed = set()  # Symbols whose leases were marked done
+
+    def start_worker(self, worker_id: str):
+        process = self.context.Process(
+            target=_worker_main, args=(worker_id, self.db_path, get_log_queue(), self.node_id),
+            name=worker_id, daemon=True)
+        process.start()
+        self.processes[worker_id] = process
+        log.info("Started scanner worker %s (pid %s)", worker_id, process.pid)
+
+    def check_workers(self):
+        """Restart worker processes that exited and requeue their jobs"""
+        for worker_id, process in list(self.processes.items()):
+            if not process.is_alive():
+                log.warning("Scanner worker %s exited with code %s, restarting",
+                            worker_id, process.exitcode)
+                self.queue.remove_worker(worker_id)
+                self.start_worker(worker_id)
+        self.queue.requeue_stale()
+
+    def stop_workers(self):
+        for process in self.processes.values():
+            process.terminate()
+        for worker_id, process in self.processes.items():
+            process.join(timeout=10)
+            self.queue.remove_worker(worker_id)
+        self.processes.clear()
+
+    def heartbeat(self, status: str):
+        self.queue.heartbeat(self.worker_id, 'supervisor', status,
+                             stats={**client_stats(), 'node': self.node_id})
+        self.queue.publish_metrics(self.worker_id, metrics.snapshot())
+        self.cluster.heartbeat(self.node_id, len(self.processes) or self.num_workers,
+                               {'status': status, 'queued': len(self.queued)})
+
+    def ring(self) -> HashRing:
+        """Hash ring of the live nodes, always including this one"""
+        nodes = [node['node_id'] for node in self.cluster.live_nodes()]
+        return HashRing(set(nodes) | {self.node_id})
+
+    async def enqueue_owned(self, cycle: int, symbols) -> int:
+        """Lease symbols for the cycle, resolve their news sentiment and queue them"""
+        symbols = self.cluster.acquire(self.node_id, cycle, symbols)
+        if not symbols:
+            return 0
+
+        # Resolve news sentiment for the whole batch before analysis starts
+        try:
+            from core.news_sentiment import fetch_sentiments
+            sentiments = await fetch_sentiments(symbols, cycle_seconds=SCAN_INTERVAL)
+        except Exception as e:
+            log.error("Error prefetching news sentiment: %s", e)
+            sentiments = {}
+
+        self.queued.update(symbols)
+        return self.queue.enqueue(
+            cycle, {symbol: {'sentiment': sentiments.get(symbol)} for symbol in symbols})
+
+    async def plan_cycle(self, cycle: int) -> int:
+        """Queue this node's shard of the cycle, highest priority first"""
+        request_coalescer.purge_expired()
+        self.queued = set()
+        self.completed = set()
+        settings = get_config()
+        # Settings reloaded since the last cycle take effect from this one
+        self.planner.cooldown_period = settings.cooldown_period
+        candidates = await get_high_volume_symbols()
+        self.candidates = self.planner.plan(candidates, limit=settings.symbol_limit)
+
+        ring = self.ring()
+        owned = [s for s in self.candidates if ring.owner(s) == self.node_id]
+        log.info("Scanning %d of %d symbols across %s on node %s (%d nodes)",
+                 len(owned), len(self.candidates), list(settings.timeframes),
+                 self.node_id, len(ring.nodes))
+        return await self.enqueue_owned(cycle, owned)
+
+    async def adopt_orphans(self, cycle: int) -> int:
+        """
+        Take over symbols that moved to this node after the ring changed,
+        e.g. because their owner left, unless already analyzed this cycle
+        """
+        ring = self.ring()
+        finished = self.cluster.finished(cycle)
+        orphans = [s for s in self.candidates
+                   if s not in self.queued and s not in finished
+                   and ring.owner(s) == self.node_id]
+        adopted = await self.enqueue_owned(cycle, orphans) if orphans else 0
+        if adopted:
+            log.info("Adopted %d symbols from other nodes for cycle %s", adopted, cycle)
+        return adopted
+
+    def complete_leases(self, cycle: int):
+        """
+        Mark the leases of finished jobs done so no node scans them again, and
+        update cooldowns and backoff from their outcomes right away
+        """
+        for result in self.queue.results(cycle):
+            symbol = result['symbol']
+            if symbol in self.completed:
+                continue
+            if result['outcome'] == 'signal':
+                self.planner.start_cooldown(symbol)
+                log.info("[%s] Added to cooldown for %g hours across all timeframes",
+                         symbol, self.planner.cooldown_period / 3600)
+            elif result['outcome'] == 'no_signal':
+                self.planner.record_success(symbol)
+            else:
+                self.planner.record_failure(symbol)
+            self.cluster.complete(self.node_id, cycle, symbol)
+            self.completed.add(symbol)
+
+    def apply_results(self, cycle: int):
+        """Publish the cycle's totals"""
+        results = self.queue.results(cycle)
+        signals = sum(1 for r in results if r['outcome'] == 'signal')
+        errors = sum(1 for r in results if r['outcome'] in ('error', 'no_data'))
+        CYCLE_SYMBOLS.set(len(results))
+        CYCLE_SIGNALS.set(signals)
+        SIGNALS.inc(signals)
+        log.info("Cycle %s complete: %d symbols, %d signals, %d failures",
+                 cycle, len(results), signals, errors)
+
+    def release_dropped(self, jobs: List[Dict]):
+        """Release the leases of dropped jobs so their symbols can be taken again this cycle"""
+        leases = {}
+        for job in jobs:
+            # Jobs queued before they were tagged with a node have no known lease owner
+            if job['node'] is not None:
+                leases.setdefault((job['node'], job['cycle']), []).append(job['symbol'])
+        for (node_id, cycle), symbols in leases.items():
+            self.cluster.release(node_id, cycle, symbols)
+
+    async def run(self):
+        dropped = self.queue.cancel_pending()
+        if dropped:
+            log.info("Dropped %d queued jobs from a previous run", len(dropped))
+            self.release_dropped(dropped)
+        self.heartbeat('connecting')
+        await init_exchange()
+
+        for i in range(self.num_workers):
+            self.start_worker(f"{self.node_id}-worker-{i + 1}")
+
+        # Background tasks that used to run inside the API process
+        from core.news_sentiment import refresh_market_sentiment
+        asyncio.create_task(check_signal_status())
+        asyncio.create_task(update_signal_statuses_task())
+        asyncio.create_task(refresh_market_sentiment())
+
+        while True:
+            cycle = current_cycle()
+            next_cycle = (cycle + 1) * SCAN_INTERVAL
+            try:
+                self.heartbeat('planning')
+                started = time.perf_counter()
+                queued = await self.plan_cycle(cycle)
+                log.info("Queued %d symbols for cycle %s", queued, cycle)
+
+                # Run until the cycle ends and the queue is drained, picking up
+                # symbols from nodes that leave in the meantime
+                drained = False
+                while time.time() < next_cycle or self.queue.pending(cycle):
+                    self.check_workers()
+                    pending = self.queue.pending(cycle)
+                    self.heartbeat('scanning' if pending else 'waiting')
+                    self.complete_leases(cycle)
+                    if not pending and not drained:
+                        CYCLE_SECONDS.observe(time.perf_counter() - started)
+                        log.info("Scan complete, waiting for next cycle...")
+                        drained = True
+                    await self.adopt_orphans(cycle)
+                    await asyncio.sleep(POLL_INTERVAL if pending else HEARTBEAT_INTERVAL)
+
+                self.complete_leases(cycle)
+                self.apply_results(cycle)
+                self.queue.prune()
+                self.cluster.prune(cycle - 48)
+            except Exception as e:
+                log.error("Error in scan cycle: %s", e)
+                # Keep workers alive and the heartbeat fresh until the next cycle
+                while time.time() < next_cycle:
+                    self.check_workers()
+                    self.heartbeat('waiting')
+                    await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+async def _run_supervisor(num_workers: int, db_path: str, cluster_db: str, node_id: str):
+    supervisor = ScanSupervisor(num_workers, db_path, cluster_db, node_id)
+    try:
+        await supervisor.run()
+    finally:
+        supervisor.stop_workers()
+        supervisor.queue.remove_worker(supervisor.worker_id)
+        supervisor.cluster.leave(supervisor.node_id)
+        await close_exchanges()
+        await close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scan supervisor and its workers")
+    parser.add_argument("--workers", type=int, default=int(os.getenv('SCANNER_WORKERS', 2)))
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--cluster-db", default=CLUSTER_DB_PATH,
+                        help="Store shared by all scanner nodes")
+    parser.add_argument("--node-id", default=os.getenv('SCANNER_NODE_ID'),
+                        help="Stable node name (default: hostname-pid)")
+    args = parser.parse_args()
+
+    # Workers and their pools log through the supervisor's writer thread
+    setup_logging("supervisor", log_file="scanner.log", shared=True)
+    os_signal.signal(os_signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(_run_supervisor(args.workers, args.db, args.cluster_db, args.node_id))
+    except (KeyboardInterrupt, SystemExit):
+        log.info("Scanner stopped")
+
+
+if __name__ == "__main__":
+    main()
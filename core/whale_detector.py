@@ -22,7 +22,7 @@ def detect_whale_activity(symbol, df):
     try:
         # Check for sufficient data
         if len(df) < 20:
-            logger.warning(f"[{symbol}] Insufficient data for whale detection")
+            logger.warning("[%s] Insufficient data for whale detection", symbol)
             return {
                 'detected': False,
                 'score': 0,
@@ -58,20 +58,19 @@ def detect_whale_activity(symbol, df):
         # Check for volume spike
         if volume_spike:
             whale_score += 30
-            logger.info(
-                f"[{symbol}] Volume spike detected: current {current_volume:.2f} > 2x SMA5 {volume_sma_5:.2f}")
+            logger.debug("[%s] Volume spike detected: current %.2f > 2x SMA5 %.2f",
+                         symbol, current_volume, volume_sma_5)
 
         # Check for abnormal volume
         if abnormal_volume:
             whale_score += 30
-            logger.info(
-                f"[{symbol}] Abnormal volume detected: current {current_volume:.2f} > 3x avg {avg_volume:.2f}")
+            logger.debug("[%s] Abnormal volume detected: current %.2f > 3x avg %.2f",
+                         symbol, current_volume, avg_volume)
 
         # Check for accumulation pattern (high volume, small price movement)
         if minimal_price_move and current_volume > avg_volume * 1.5:
             whale_score += 40
-            logger.info(
-                f"[{symbol}] Accumulation pattern: high volume with minimal price movement")
+            logger.debug("[%s] Accumulation pattern: high volume with minimal price movement", symbol)
 
         # Determine activity type
         activity_type = None
@@ -85,8 +84,8 @@ def detect_whale_activity(symbol, df):
         detected = whale_score >= 30  # 30% threshold for detection
 
         if detected:
-            logger.info(
-                f"[{symbol}] 🐋 Whale activity detected with score: {whale_score}%, type: {activity_type}")
+            logger.debug("[%s] 🐋 Whale activity detected with score: %s%%, type: %s",
+                         symbol, whale_score, activity_type)
 
         return {
             'detected': detected,
@@ -97,7 +96,7 @@ def detect_whale_activity(symbol, df):
         }
 
     except Exception as e:
-        logger.error(f"[{symbol}] Error in whale detection: {str(e)}")
+        logger.error("[%s] Error in whale detection: %s", symbol, e)
         return {
             'detected': False,
             'score': 0,
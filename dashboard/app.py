@@ -4,7 +4,6 @@ from fastapi.templating import Jinja2Templates
 import pandas as pd
 import os
 import json
-import matplotlib.pyplot as plt
 import numpy as np
 from io import BytesIO
 import base64
@@ -143,6 +142,8 @@ def get_success_by_confidence(df):
 
 def generate_confidence_chart(df):
     """Generate base64 encoded chart image of confidence over time"""
+    import matplotlib.pyplot as plt
+
     try:
         if len(df) < 5 or 'timestamp' not in df.columns or 'confidence' not in df.columns:
             return ""
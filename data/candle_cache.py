@@ -0,0 +1,115 @@
+import sys
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.helpers import next_candle_close
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+
+def estimate_size(value) -> int:
+    """Rough memory footprint of a cached value in bytes"""
+    if hasattr(value, 'memory_usage'):  # pandas DataFrame / Series
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class CandleCache:
+    """
+    LRU cache keyed by (symbol, timeframe) whose entries stay valid until the
+    next candle close of their timeframe. Eviction is bounded by memory size.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # (symbol, timeframe) -> (expires_at, size, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, symbol: str, timeframe: str) -> Optional[Any]:
+        """Get a cached value if its candle has not closed yet"""
+        key = (symbol, timeframe)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.time() >= entry[0]:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def peek(self, symbol: str, timeframe: str) -> Optional[Any]:
+        """Get a live value without touching counters or LRU order"""
+        entry = self._entries.get((symbol, timeframe))
+        if entry is None or time.time() >= entry[0]:
+            return None
+        return entry[2]
+
+    def put(self, symbol: str, timeframe: str, value, expires_at: float = None):
+        """Cache a value until the current candle of its timeframe closes"""
+        key = (symbol, timeframe)
+        if key in self._entries:
+            self._remove(key)
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.warning(
+                f"[{symbol}] {timeframe} entry of {size} bytes exceeds candle cache size")
+            return
+
+        expires_at = expires_at or next_candle_close(timeframe)
+        self._entries[key] = (expires_at, size, value)
+        self.current_bytes += size
+
+        # Evict least recently used entries until we fit again
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def __contains__(self, key) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and time.time() < entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry[1]
+
+    def purge_expired(self):
+        """Drop every entry whose candle has closed"""
+        now = time.time()
+        for key in [k for k, v in self._entries.items() if v[0] <= now]:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions
+        }
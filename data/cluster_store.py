@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+# Shared by every scanner node. SQLite stands in for a networked store, so
+# nodes on one host (or on a shared volume) can coordinate through it.
+DEFAULT_DB_PATH = os.getenv('SCANNER_CLUSTER_DB', os.path.join("data", "cluster.db"))
+
+
+class ClusterStore:
+    """
+    Node membership and symbol leases shared by all scanner nodes.
+    Nodes publish heartbeats; the live ones form the hash ring. Before a node
+    analyzes a symbol it takes a lease on (symbol, cycle), so a symbol is
+    scanned once per cycle even while shards move between nodes. Leases of
+    a node that stops heartbeating expire and can be taken over. Cooldown and
+    failure backoff per symbol live here too, so they hold for whichever
+    node owns the symbol and survive restarts.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, stale_after=90, lease_ttl=300):
+        self.db_path = db_path
+        self.stale_after = stale_after  # Heartbeat age after which a node leaves the ring
+        self.lease_ttl = lease_ttl      # Lease lifetime, extended by the owner's heartbeat
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly where needed
+        self.conn = sqlite3.connect(
+            db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                node_id TEXT PRIMARY KEY,
+                host TEXT,
+                pid INTEGER,
+                workers INTEGER NOT NULL DEFAULT 0,
+                info TEXT,
+                started_at REAL,
+                heartbeat REAL
+            );
+            CREATE TABLE IF NOT EXISTS leases (
+                symbol TEXT NOT NULL,
+                cycle INTEGER NOT NULL,
+                owner TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'leased',
+                expires_at REAL NOT NULL,
+                finished_at REAL,
+                PRIMARY KEY (symbol, cycle)
+            );
+            CREATE INDEX IF NOT EXISTS leases_owner ON leases (owner, status);
+            CREATE TABLE IF NOT EXISTS symbol_state (
+                symbol TEXT PRIMARY KEY,
+                cooldown_started REAL,
+                failures INTEGER NOT NULL DEFAULT 0,
+                retry_after REAL,
+                updated REAL NOT NULL
+            );
+        """)
+
+    def heartbeat(self, node_id: str, workers: int, info: Dict = None):
+        """Publish a node's liveness and extend the leases it still holds"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO nodes (node_id, host, pid, workers, info, started_at, heartbeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(node_id) DO UPDATE SET workers = excluded.workers, "
+                "info = COALESCE(excluded.info, nodes.info), heartbeat = excluded.heartbeat",
+                (node_id, os.uname().nodename, os.getpid(), workers,
+                 json.dumps(info, default=str) if info is not None else None, now, now))
+            self.conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE owner = ? AND status = 'leased'",
+                (now + self.lease_ttl, node_id))
+
+    def leave(self, node_id: str):
+        """Remove a node and release its unfinished leases right away"""
+        with self._lock:
+            self.conn.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,))
+            self.conn.execute(
+                "DELETE FROM leases WHERE owner = ? AND status = 'leased'", (node_id,))
+
+    def live_nodes(self) -> List[Dict]:
+        """Nodes with a recent heartbeat, ordered by id"""
+        rows = self.conn.execute(
+            "SELECT node_id, host, pid, workers, info, started_at, heartbeat FROM nodes "
+            "WHERE heartbeat >= ? ORDER BY node_id",
+            (time.time() - self.stale_after,)).fetchall()
+        nodes = []
+        for row in rows:
+            node = dict(row)
+            node['info'] = json.loads(node['info']) if node['info'] else None
+            nodes.append(node)
+        return nodes
+
+    def total_workers(self) -> int:
+        """Scanner workers across all live nodes"""
+        return sum(node['workers'] for node in self.live_nodes())
+
+    def acquire(self, node_id: str, cycle: int, symbols: Iterable[str]) -> List[str]:
+        """
+        Take leases on symbols for a scan cycle
+
+        A symbol is granted when nobody holds it yet, or when the previous
+        owner's lease expired before it finished. Finished symbols are never
+        granted again within the same cycle.
+
+        Returns:
+            list: The symbols this node now owns, in the given order
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return []
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT INTO leases (symbol, cycle, owner, expires_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(symbol, cycle) DO UPDATE SET owner = excluded.owner, "
+                    "expires_at = excluded.expires_at "
+                    "WHERE leases.status = 'leased' AND leases.expires_at < ?",
+                    [(symbol, cycle, node_id, now + self.lease_ttl, now) for symbol in symbols])
+                owned = set()
+                # Stay below SQLite's bound-parameter limit
+                for i in range(0, len(symbols), 500):
+                    chunk = symbols[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    owned.update(row[0] for row in self.conn.execute(
+                        f"SELECT symbol FROM leases WHERE cycle = ? AND owner = ? "
+                        f"AND status = 'leased' AND symbol IN ({placeholders})",
+                        (cycle, node_id, *chunk)).fetchall())
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [symbol for symbol in symbols if symbol in owned]
+
+    def complete(self, node_id: str, cycle: int, symbol: str):
+        """Mark a leased symbol as analyzed for the cycle"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE leases SET status = 'done', finished_at = ? "
+                "WHERE symbol = ? AND cycle = ? AND owner = ?",
+                (time.time(), symbol, cycle, node_id))
+
+    def release(self, node_id: str, cycle: int, symbols: Iterable[str]):
+        """Give up unfinished leases, e.g. for jobs dropped from the queue"""
+        with self._lock:
+            self.conn.executemany(
+                "DELETE FROM leases WHERE symbol = ? AND cycle = ? AND owner = ? "
+                "AND status = 'leased'", [(symbol, cycle, node_id) for symbol in symbols])
+
+    def start_cooldown(self, symbol: str, started: float):
+        """Record that a symbol produced a signal, clearing its failure backoff"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO symbol_state (symbol, cooldown_started, failures, retry_after, updated) "
+                "VALUES (?, ?, 0, NULL, ?) ON CONFLICT(symbol) DO UPDATE SET "
+                "cooldown_started = excluded.cooldown_started, failures = 0, retry_after = NULL, "
+                "updated = excluded.updated", (symbol, started, time.time()))
+
+    def record_failure(self, symbol: str, base_backoff: float, max_backoff: float,
+                       now: float = None) -> Tuple[int, float]:
+        """
+        Count a failed analysis and push the symbol's retry time back
+        exponentially
+
+        Returns:
+            tuple: (consecutive failures, backoff in seconds)
+        """
+        now = now or time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT failures FROM symbol_state WHERE symbol = ?", (symbol,)).fetchone()
+                count = (row[0] if row else 0) + 1
+                delay = min(base_backoff * 2 ** (count - 1), max_backoff)
+                self.conn.execute(
+                    "INSERT INTO symbol_state (symbol, failures, retry_after, updated) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(symbol) DO UPDATE SET "
+                    "failures = excluded.failures, retry_after = excluded.retry_after, "
+                    "updated = excluded.updated", (symbol, count, now + delay, now))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return count, delay
+
+    def record_success(self, symbol: str):
+        """Clear a symbol's failure backoff"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE symbol_state SET failures = 0, retry_after = NULL, updated = ? "
+                "WHERE symbol = ? AND failures > 0", (time.time(), symbol))
+
+    def symbol_states(self) -> Dict[str, Tuple[Optional[float], int, Optional[float]]]:
+        """symbol -> (cooldown start, consecutive failures, retry after) for every tracked symbol"""
+        return {row['symbol']: (row['cooldown_started'], row['failures'], row['retry_after'])
+                for row in self.conn.execute(
+                    "SELECT symbol, cooldown_started, failures, retry_after FROM symbol_state")}
+
+    def finished(self, cycle: int) -> Set[str]:
+        """Symbols already analyzed in a cycle, by any node"""
+        return {row[0] for row in self.conn.execute(
+            "SELECT symbol FROM leases WHERE cycle = ? AND status = 'done'", (cycle,))}
+
+    def prune(self, before_cycle: int) -> int:
+        """Delete leases of old cycles and nodes that left long ago"""
+        with self._lock:
+            deleted = self.conn.execute(
+                "DELETE FROM leases WHERE cycle < ?", (before_cycle,)).rowcount
+            self.conn.execute(
+                "DELETE FROM nodes WHERE heartbeat < ?", (time.time() - 24 * 3600,))
+            # Cooldowns are at most 30 days (see utils/config.py)
+            self.conn.execute(
+                "DELETE FROM symbol_state WHERE updated < ? AND COALESCE(retry_after, 0) < ?",
+                (time.time() - 30 * 86400, time.time()))
+        return deleted
+
+    def stats(self, cycle: int = None) -> Dict:
+        query = "SELECT owner, status, COUNT(*) FROM leases"
+        params = ()
+        if cycle is not None:
+            query += " WHERE cycle = ?"
+            params = (cycle,)
+        leases = {}
+        for owner, status, count in self.conn.execute(query + " GROUP BY owner, status", params):
+            leases.setdefault(owner, {})[status] = count
+        return {
+            'nodes': [node['node_id'] for node in self.live_nodes()],
+            'workers': self.total_workers(),
+            'leases': leases
+        }
+
+    def close(self):
+        self.conn.close()
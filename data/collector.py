@@ -2,32 +2,33 @@ import asyncio
 import ccxt.async_support as ccxt
 import pandas as pd
 from utils.logger import log
-import cachetools
+from data.exchange_pool import get_exchange
+from data.request_coalescer import fetch_ohlcv
+from data.candle_cache import CandleCache
 
-data_cache = cachetools.TTLCache(maxsize=100, ttl=300)  # 5-minute cache
+# Entries live until the next candle close of their timeframe
+data_cache = CandleCache(max_bytes=32 * 1024 * 1024)
 
 async def fetch_realtime_data(symbol, timeframe="15m"):
     try:
-        if symbol in data_cache:
-            log(f"[{symbol}] Using cached OHLCV data")
-            return data_cache[symbol]
+        cached = data_cache.get(symbol, timeframe)
+        if cached is not None:
+            log(f"[{symbol}] Using cached {timeframe} OHLCV data")
+            return cached
 
-        exchange = ccxt.binance({"enableRateLimit": True})
-        ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, limit=100)
+        exchange = await get_exchange()
+        ohlcv = await fetch_ohlcv(exchange, symbol, timeframe, limit=100)
         if not ohlcv or len(ohlcv) < 50:
             log(f"[{symbol}] Insufficient OHLCV data", level='WARNING')
-            await exchange.close()
             return None
 
         df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"], dtype="float32")
         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        data_cache[symbol] = df
+        data_cache.put(symbol, timeframe, df)
         log(f"[{symbol}] Fetched OHLCV data")
-        await exchange.close()
         return df
     except Exception as e:
         log(f"[{symbol}] Error fetching OHLCV: {e}", level='ERROR')
-        await exchange.close()
         return None
 
 async def websocket_collector(symbol, timeframe="15m"):
@@ -41,7 +42,7 @@ async def websocket_collector(symbol, timeframe="15m"):
 
             df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"], dtype="float32")
             df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            data_cache[symbol] = df
+            data_cache.put(symbol, timeframe, df)
             log(f"[{symbol}] Updated WebSocket OHLCV data")
             await asyncio.sleep(60)  # Update every minute
     except Exception as e:
@@ -0,0 +1,143 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Dict
+from urllib.parse import urlsplit
+
+from data.weight_limiter import weight_limiter
+from utils import metrics
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+REQUEST_SECONDS = metrics.histogram(
+    'exchange_request_seconds', 'Exchange HTTP request latency', ['exchange', 'endpoint'])
+REQUEST_ERRORS = metrics.counter(
+    'exchange_request_errors_total', 'Failed exchange HTTP requests', ['exchange', 'endpoint'])
+
+
+class ExchangePool:
+    """
+    Process-wide registry of async ccxt clients.
+    Clients are created once per (exchange, config), keep their aiohttp session
+    and loaded markets warm, count every HTTP request and close together on shutdown.
+    Binance clients also go through the shared request-weight limiter.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._stats = {}
+        self._lock = asyncio.Lock()
+
+    def _make_key(self, exchange_id: str, config: Dict) -> str:
+        return f"{exchange_id}:{json.dumps(config, sort_keys=True, default=str)}"
+
+    def _make_label(self, exchange_id: str, config: Dict) -> str:
+        """Readable client name for stats, without credentials"""
+        public = {k: v for k, v in config.items()
+                  if k not in ('apiKey', 'secret', 'password', 'uid')}
+        return f"{exchange_id}:{json.dumps(public, sort_keys=True, default=str)}"
+
+    def _instrument(self, key: str, client):
+        """Wrap the client's low-level fetch so every HTTP request is counted"""
+        stats = {
+            'client': None,
+            'requests': 0,
+            'errors': 0,
+            'total_seconds': 0.0,
+            'last_request': None,
+            'created': time.time()
+        }
+        self._stats[key] = stats
+        fetch = client.fetch
+
+        async def counted_fetch(url, method='GET', headers=None, body=None):
+            stats['requests'] += 1
+            stats['last_request'] = time.time()
+            endpoint = urlsplit(url).path  # Without the query, to keep label values bounded
+            start = time.perf_counter()
+            try:
+                return await fetch(url, method, headers, body)
+            except Exception:
+                stats['errors'] += 1
+                REQUEST_ERRORS.labels(client.id, endpoint).inc()
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                stats['total_seconds'] += elapsed
+                REQUEST_SECONDS.labels(client.id, endpoint).observe(elapsed)
+
+        client.fetch = counted_fetch
+
+    async def get(self, exchange_id: str = 'binance', load_markets: bool = True, **config):
+        """
+        Get a shared async client, creating it on first use
+
+        Args:
+            exchange_id (str): ccxt exchange id
+            load_markets (bool): Make sure markets are loaded before returning
+            **config: Extra ccxt options (API keys, defaultType, ...)
+
+        Returns:
+            ccxt async exchange instance
+        """
+        config = {'enableRateLimit': True, **config}
+        key = self._make_key(exchange_id, config)
+
+        async with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Imported on first use: ccxt alone takes most of a second to load
+                import ccxt.async_support as ccxt
+                client = getattr(ccxt, exchange_id)(config)
+                self._instrument(key, client)
+                # After instrumenting, so limiter waits are not counted as request time
+                weight_limiter.install(client)
+                self._stats[key]['client'] = self._make_label(exchange_id, config)
+                self._clients[key] = client
+                logger.info(f"Created pooled {exchange_id} client")
+
+        if load_markets and not client.markets:
+            await client.load_markets()
+        return client
+
+    def stats(self) -> Dict[str, Dict]:
+        """Get per-client request counters"""
+        result = {}
+        for stats in self._stats.values():
+            requests = stats['requests']
+            result[stats['client']] = {
+                **stats,
+                'avg_seconds': stats['total_seconds'] / requests if requests else 0.0
+            }
+        return result
+
+    async def close_all(self):
+        """Close every pooled client and forget it"""
+        async with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+
+        for key, client in clients:
+            try:
+                await client.close()
+                stats = self._stats.get(key, {})
+                logger.info(
+                    f"Closed pooled {client.id} client after {stats.get('requests', 0)} requests")
+            except Exception as e:
+                logger.error(f"Error closing pooled {client.id} client: {str(e)}")
+
+
+# Create a global instance for the whole process
+exchange_pool = ExchangePool()
+
+
+async def get_exchange(exchange_id: str = 'binance', load_markets: bool = True, **config):
+    """Wrapper for the pool's get method"""
+    return await exchange_pool.get(exchange_id, load_markets, **config)
+
+
+async def close_exchanges():
+    """Wrapper for the pool's close_all method"""
+    await exchange_pool.close_all()
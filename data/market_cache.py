@@ -0,0 +1,125 @@
+import math
+import time
+import asyncio
+import logging
+from ccxt.base.decimal_to_precision import TICK_SIZE
+from typing import Dict, List, Optional
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+
+class MarketMetadataCache:
+    """
+    In-memory cache of exchange markets and tickers.
+    Markets load once and refresh on a long TTL or when a listing change shows
+    up in the tickers; precision, limits and volume rankings are served from memory.
+    """
+
+    def __init__(self, markets_ttl=6 * 3600, tickers_ttl=300):
+        self.markets_ttl = markets_ttl  # Markets rarely change, refresh every 6 hours
+        self.tickers_ttl = tickers_ttl  # Volumes move, refresh every 5 minutes
+        self.markets = {}
+        self.tickers = {}
+        self.markets_loaded_at = 0
+        self.precision_mode = None  # ccxt precisionMode of the exchange the markets came from
+        self.tickers_loaded_at = 0
+        self._unlisted = set()  # Ticker symbols that stayed unknown after a reload
+        self._lock = asyncio.Lock()
+
+    @property
+    def markets_loaded(self) -> bool:
+        return bool(self.markets)
+
+    def _markets_stale(self) -> bool:
+        return time.time() - self.markets_loaded_at >= self.markets_ttl
+
+    def _tickers_stale(self) -> bool:
+        return time.time() - self.tickers_loaded_at >= self.tickers_ttl
+
+    async def load_markets(self, exchange, force=False) -> Dict:
+        """Load markets from the exchange unless the cached copy is still fresh"""
+        async with self._lock:
+            if self.markets and not force and not self._markets_stale():
+                return self.markets
+
+            previous = set(self.markets)
+            # A pooled client may already hold fresh markets from its first load
+            markets = await exchange.load_markets(reload=bool(previous) or force)
+            self.markets = dict(markets)
+            self.precision_mode = getattr(exchange, 'precisionMode', None)
+            self.markets_loaded_at = time.time()
+
+            if previous:
+                listed = set(self.markets) - previous
+                delisted = previous - set(self.markets)
+                if listed or delisted:
+                    logger.info(
+                        f"Market listings changed: {len(listed)} new, {len(delisted)} removed")
+            logger.info(f"Loaded {len(self.markets)} markets into cache")
+            return self.markets
+
+    async def get_tickers(self, exchange, force=False) -> Dict[str, Dict]:
+        """Get all tickers, reloading markets when a new listing appears"""
+        if not self.markets or self._markets_stale():
+            await self.load_markets(exchange)
+
+        if self.tickers and not force and not self._tickers_stale():
+            return self.tickers
+
+        tickers = await exchange.fetch_tickers()
+        self.tickers = tickers
+        self.tickers_loaded_at = time.time()
+
+        # Tickers for symbols we have no market for mean something was listed
+        unknown = [symbol for symbol in tickers
+                   if symbol not in self.markets and symbol not in self._unlisted]
+        if unknown:
+            logger.info(
+                f"Detected {len(unknown)} tickers without cached markets, reloading markets")
+            await self.load_markets(exchange, force=True)
+            self._unlisted.update(s for s in unknown if s not in self.markets)
+
+        return self.tickers
+
+    def get_market(self, symbol: str) -> Optional[Dict]:
+        """Get cached market metadata for a symbol"""
+        return self.markets.get(symbol)
+
+    def get_precision(self, symbol: str, default: int = 3) -> int:
+        """Get the number of price decimals for a symbol"""
+        market = self.markets.get(symbol)
+        if not market:
+            return default
+        precision = (market.get('precision') or {}).get('price')
+        if precision is None:
+            return default
+        # ccxt reports either decimal places or a tick size depending on the exchange
+        if self.precision_mode == TICK_SIZE or (
+                self.precision_mode is None and isinstance(precision, float)):
+            if precision <= 0:
+                return default
+            return max(0, int(math.ceil(-math.log10(precision) - 1e-9)))
+        return int(precision)
+
+    def get_limits(self, symbol: str) -> Dict:
+        """Get amount, price and cost limits for a symbol"""
+        market = self.markets.get(symbol)
+        if not market:
+            return {}
+        return market.get('limits') or {}
+
+    def get_volume_ranking(self, quote: str = 'USDT', min_volume: float = 0) -> List[str]:
+        """Get symbols for a quote currency ordered by 24h quote volume"""
+        suffix = f"/{quote}"
+        ranked = [
+            (symbol, ticker.get('quoteVolume') or 0)
+            for symbol, ticker in self.tickers.items()
+            if symbol.endswith(suffix) and (ticker.get('quoteVolume') or 0) >= min_volume
+        ]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return [symbol for symbol, _ in ranked]
+
+
+# Create a global instance shared by the bot
+market_cache = MarketMetadataCache()
@@ -0,0 +1,115 @@
+import time
+import asyncio
+import logging
+from typing import Dict, List
+
+from data.candle_cache import CandleCache
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one in-flight future.
+    Every caller awaiting the key gets the same result or exception.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0   # Calls that actually ran
+        self.shared = 0  # Calls that joined an in-flight future
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self._inflight.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone
+        return await asyncio.shield(future)
+
+
+class RequestCoalescer:
+    """
+    Single-flight layer in front of exchange OHLCV and ticker fetches.
+    OHLCV results are memoized until the next candle close of their timeframe,
+    tickers for a few seconds, so bursts never become duplicate exchange calls.
+    """
+
+    def __init__(self, ticker_ttl=5, ohlcv_max_bytes=64 * 1024 * 1024):
+        self.ticker_ttl = ticker_ttl
+        self.ohlcv_max_bytes = ohlcv_max_bytes
+        self.flight = SingleFlight()
+        self._ohlcv = {}    # exchange id -> CandleCache of (limit, rows)
+        self._tickers = {}  # (exchange, symbol) -> (expires_at, ticker)
+        self.hits = 0
+        self.misses = 0
+
+    async def fetch_ohlcv(self, exchange, symbol: str, timeframe: str, limit: int = 100) -> List:
+        """Fetch OHLCV rows, sharing in-flight requests and candle-close memos"""
+        cache = self._ohlcv.get(exchange.id)
+        if cache is None:
+            cache = self._ohlcv[exchange.id] = CandleCache(self.ohlcv_max_bytes)
+
+        cached = cache.get(symbol, timeframe)
+        if cached and limit <= cached[0]:
+            self.hits += 1
+            return cached[1][-limit:]
+
+        self.misses += 1
+        rows = await self.flight.do(
+            ('ohlcv', exchange.id, symbol, timeframe, limit),
+            exchange.fetch_ohlcv, symbol, timeframe, limit=limit)
+        # Keep the larger fetch when a smaller one lands for the same candle
+        current = cache.peek(symbol, timeframe)
+        if rows and not (current and current[0] > limit):
+            cache.put(symbol, timeframe, (limit, rows))
+        return rows
+
+    async def fetch_ticker(self, exchange, symbol: str) -> Dict:
+        """Fetch a ticker, sharing in-flight requests and a short memo"""
+        key = (exchange.id, symbol)
+        cached = self._tickers.get(key)
+        if cached and time.time() < cached[0]:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        ticker = await self.flight.do(('ticker', key), exchange.fetch_ticker, symbol)
+        self._tickers[key] = (time.time() + self.ticker_ttl, ticker)
+        return ticker
+
+    def purge_expired(self):
+        """Drop memo entries whose candle has closed"""
+        now = time.time()
+        for cache in self._ohlcv.values():
+            cache.purge_expired()
+        self._tickers = {k: v for k, v in self._tickers.items() if v[0] > now}
+
+    def stats(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'exchange_calls': self.flight.calls,
+            'shared_in_flight': self.flight.shared,
+            'ticker_entries': len(self._tickers),
+            'ohlcv_cache': {exchange_id: cache.stats() for exchange_id, cache in self._ohlcv.items()}
+        }
+
+
+# Create a global instance shared by every caller in the process
+request_coalescer = RequestCoalescer()
+
+
+async def fetch_ohlcv(exchange, symbol, timeframe, limit=100):
+    """Wrapper for the coalescer's fetch_ohlcv method"""
+    return await request_coalescer.fetch_ohlcv(exchange, symbol, timeframe, limit)
+
+
+async def fetch_ticker(exchange, symbol):
+    """Wrapper for the coalescer's fetch_ticker method"""
+    return await request_coalescer.fetch_ticker(exchange, symbol)
@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils import metrics
+from utils.metrics import STORAGE_WRITE_SECONDS
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+DEFAULT_DB_PATH = os.path.join("data", "sentiment_cache.db")
+LEGACY_CACHE_DIR = os.path.join("data", "sentiment_cache")
+
+LOOKUPS = metrics.counter(
+    'sentiment_cache_lookups_total', 'Sentiment cache lookups by result', ['result'])
+
+
+class SentimentStore:
+    """
+    Sentiment results in a single SQLite table with per-row expiry, fronted by
+    a bounded in-memory LRU. Lookups and writes for a whole scan cycle go
+    through get_many/put_many, so a cycle costs one query and one commit.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, memory_size=512, legacy_dir=LEGACY_CACHE_DIR):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.legacy_dir = legacy_dir
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = {'memory': 0, 'disk': 0}
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and import legacy JSON files"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_expires ON sentiment (expires_at)")
+            self._conn.commit()
+            self._migrate_legacy()
+        return self._conn
+
+    def _remember(self, key: str, value, expires_at: float):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Look up one unexpired value
+
+        Returns:
+            tuple: (value, 'memory' | 'disk') or (None, None)
+        """
+        return self.get_many([key]).get(key, (None, None))
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Dict, str]]:
+        """
+        Look up unexpired values, memory first and the rest in one query
+
+        Returns:
+            dict: key -> (value, 'memory' | 'disk') for every key found
+        """
+        now = time.time()
+        found = {}
+        remaining = []
+
+        for key in dict.fromkeys(keys):
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                found[key] = (entry[1], 'memory')
+                self.hits['memory'] += 1
+            else:
+                self._memory.pop(key, None)
+                remaining.append(key)
+
+        if remaining:
+            with self._lock:
+                conn = self._connect()
+                rows = []
+                # Stay below SQLite's bound-parameter limit
+                for i in range(0, len(remaining), 500):
+                    chunk = remaining[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(conn.execute(
+                        f"SELECT key, value, expires_at FROM sentiment "
+                        f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                        (*chunk, now)).fetchall())
+
+            for key, value, expires_at in rows:
+                value = json.loads(value)
+                self._remember(key, value, expires_at)
+                found[key] = (value, 'disk')
+                self.hits['disk'] += 1
+
+        disk_hits = sum(1 for k in remaining if k in found)
+        self.misses += len(remaining) - disk_hits
+        LOOKUPS.labels('memory').inc(len(found) - disk_hits)
+        LOOKUPS.labels('disk').inc(disk_hits)
+        LOOKUPS.labels('miss').inc(len(remaining) - disk_hits)
+        return found
+
+    def put(self, key: str, value: Dict, ttl: float):
+        """Store one value for ttl seconds"""
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, items: Dict[str, Dict], ttl: float):
+        """Store several values for ttl seconds in one transaction"""
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        for key, value in items.items():
+            self._remember(key, value, expires_at)
+
+        try:
+            with self._lock, STORAGE_WRITE_SECONDS.time('sentiment_db'):
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO sentiment (key, value, stored_at, expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(key, json.dumps(value), now, expires_at) for key, value in items.items()])
+        except Exception as e:
+            logger.error(f"Error saving sentiment cache: {str(e)}")
+
+    def purge_expired(self) -> int:
+        """Delete expired rows and memory entries"""
+        now = time.time()
+        self._memory = OrderedDict(
+            (k, v) for k, v in self._memory.items() if v[0] > now)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM sentiment WHERE expires_at <= ?", (now,)).rowcount
+        return deleted
+
+    def _migrate_legacy(self, ttl=4 * 3600):
+        """Move still-valid per-symbol JSON files into the table and delete them"""
+        if not os.path.isdir(self.legacy_dir):
+            return
+
+        rows = []
+        files = [f for f in os.listdir(self.legacy_dir) if f.endswith("d.json")]
+        for name in files:
+            path = os.path.join(self.legacy_dir, name)
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                cache_time = data.get('cache_time', 0)
+                if cache_time + ttl > time.time():
+                    # BTC_USDT_2d.json -> BTC/USDT_2
+                    base, days = name[:-len("d.json")].rsplit("_", 1)
+                    symbol = base.replace("_", "/", 1)
+                    rows.append((f"{symbol}_{days}", json.dumps(data.get('result')),
+                                 cache_time, cache_time + ttl))
+                os.remove(path)
+            except Exception as e:
+                logger.warning(f"Skipping legacy sentiment cache file {name}: {str(e)}")
+
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment (key, value, stored_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)", rows)
+        try:
+            os.rmdir(self.legacy_dir)
+        except OSError:
+            pass
+        logger.info(
+            f"Migrated {len(rows)} of {len(files)} legacy sentiment cache files to {self.db_path}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict:
+        return {
+            'memory_entries': len(self._memory),
+            'memory_size': self.memory_size,
+            'memory_hits': self.hits['memory'],
+            'disk_hits': self.hits['disk'],
+            'misses': self.misses
+        }
@@ -0,0 +1,349 @@
+import os
+import time
+import random
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from utils.executors import get_thread_pool, run_io
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+DEFAULT_DB_PATH = os.getenv('EXCHANGE_RATE_DB', os.path.join("data", "rate_limit.db"))
+
+# Request weight budget per minute and IP, by API host
+BUCKETS = {
+    'api.binance.com': ('binance-spot', 6000),
+    'fapi.binance.com': ('binance-futures', 2400),
+}
+
+# Endpoint weights; a list holds (max limit, weight) steps for the 'limit' parameter
+SPOT_WEIGHTS = {
+    '/api/v3/ping': 1,
+    '/api/v3/time': 1,
+    '/api/v3/exchangeInfo': 20,
+    '/api/v3/depth': [(100, 5), (500, 25), (1000, 50), (5000, 250)],
+    '/api/v3/trades': 25,
+    '/api/v3/historicalTrades': 25,
+    '/api/v3/aggTrades': 4,
+    '/api/v3/klines': 2,
+    '/api/v3/uiKlines': 2,
+    '/api/v3/avgPrice': 2,
+    '/api/v3/ticker/price': 2,
+    '/api/v3/ticker/bookTicker': 2,
+}
+
+FUTURES_WEIGHTS = {
+    '/fapi/v1/ping': 1,
+    '/fapi/v1/time': 1,
+    '/fapi/v1/exchangeInfo': 1,
+    '/fapi/v1/depth': [(50, 2), (100, 5), (500, 10), (1000, 20)],
+    '/fapi/v1/trades': 5,
+    '/fapi/v1/aggTrades': 20,
+    '/fapi/v1/klines': [(99, 1), (499, 2), (1000, 5), (1500, 10)],
+    '/fapi/v1/premiumIndex': 1,
+    '/fapi/v1/fundingRate': 1,
+    '/fapi/v1/ticker/price': 1,
+    '/fapi/v1/ticker/bookTicker': 2,
+}
+
+
+def request_weight(url: str) -> Tuple[Optional[str], int, float]:
+    """
+    Look up the bucket, its budget and the weight of one request
+
+    Returns:
+        tuple: (bucket name, weight limit per minute, request weight), with a
+        None bucket for hosts the limiter does not manage
+    """
+    parts = urlsplit(url)
+    bucket = BUCKETS.get(parts.hostname)
+    if bucket is None:
+        return None, 0, 0
+    name, limit = bucket
+    path = parts.path
+    params = parse_qs(parts.query)
+    has_symbol = 'symbol' in params
+
+    if path == '/api/v3/ticker/24hr':
+        if has_symbol:
+            weight = 2
+        elif 'symbols' in params:
+            count = params['symbols'][0].count(',') + 1
+            weight = 2 if count <= 20 else 40 if count <= 100 else 80
+        else:
+            weight = 80
+        return name, limit, weight
+    if path == '/fapi/v1/ticker/24hr':
+        return name, limit, 1 if has_symbol else 40
+
+    weights = SPOT_WEIGHTS if name == 'binance-spot' else FUTURES_WEIGHTS
+    weight = weights.get(path, 1)
+    if isinstance(weight, list):
+        try:
+            requested = int(params.get('limit', ['100'])[0])
+        except ValueError:
+            requested = 100
+        weight = next((w for top, w in weight if requested <= top), weight[-1][1])
+    elif path.endswith(('/ticker/price', '/ticker/bookTicker')) and not has_symbol:
+        weight *= 2  # All symbols at once
+    return name, limit, weight
+
+
+class WeightLimiter:
+    """
+    Request-weight limiter shared by every coroutine, process and script that
+    talks to Binance. Weight used in the current one-minute window is kept in
+    a SQLite row per API host; callers reserve their request's weight and wait
+    for the next window when the budget is spent. Used-weight response headers
+    correct the count with the server's view (which includes other clients on
+    the same IP), and a 429/418 blocks the bucket for its Retry-After.
+    Async callers reach SQLite from the I/O thread pool only, so a bucket
+    locked by another process never blocks their event loop.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, headroom=0.95, window=60, max_wait=300):
+        self.db_path = db_path
+        self.headroom = headroom  # Share of the budget to use, room for clock skew
+        self.window = window
+        self.max_wait = max_wait  # Longer blocks (IP bans) fail instead of waiting
+        self._conn = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0  # 429/418 responses seen
+        self._blocked = {}  # bucket -> blocked until, seen by this process before it reaches SQLite
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA busy_timeout=30000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, window INTEGER NOT NULL, used REAL NOT NULL, "
+                "blocked_until REAL NOT NULL DEFAULT 0)")
+        return self._conn
+
+    def reserve(self, bucket: str, limit: int, weight: float) -> float:
+        """
+        Take weight from the bucket if it fits in the current window
+
+        Returns:
+            float: 0 when granted, otherwise seconds to wait before trying again
+        """
+        now = time.time()
+        window = int(now // self.window)
+        capacity = limit * self.headroom
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window, used, blocked_until FROM buckets WHERE name = ?",
+                    (bucket,)).fetchone()
+                used = row[1] if row and row[0] == window else 0.0
+                blocked_until = row[2] if row else 0.0
+
+                if blocked_until > now:
+                    wait = blocked_until - now
+                elif used + weight <= capacity or used == 0:
+                    used += weight
+                    wait = 0.0
+                else:
+                    wait = (window + 1) * self.window - now
+
+                conn.execute(
+                    "INSERT INTO buckets (name, window, used, blocked_until) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET window = excluded.window, "
+                    "used = excluded.used, blocked_until = excluded.blocked_until",
+                    (bucket, window, used, blocked_until))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _check_wait(self, bucket: str, wait: float):
+        if wait > self.max_wait:
+            raise RuntimeError(
+                f"{bucket} requests blocked for {wait:.0f}s, not waiting that long")
+        self.waits += 1
+        self.wait_seconds += wait
+
+    async def acquire(self, url: str):
+        """Wait until the request for url fits in its bucket's budget"""
+        bucket, limit, weight = request_weight(url)
+        if bucket is None:
+            return
+        self.requests += 1
+        while True:
+            wait = self._blocked.get(bucket, 0.0) - time.time()
+            if wait <= 0:
+                wait = await run_io(self.reserve, bucket, limit, weight)
+            if not wait:
+                return
+            self._check_wait(bucket, wait)
+            # Jitter so waiting processes do not all retry at the same instant
+            await asyncio.sleep(wait + random.uniform(0, 0.25))
+
+    def acquire_blocking(self, url: str):
+        """acquire for synchronous clients and scripts"""
+        bucket, limit, weight = request_weight(url)
+        if bucket is None:
+            return
+        self.requests += 1
+        while True:
+            wait = self.reserve(bucket, limit, weight)
+            if not wait:
+                return
+            self._check_wait(bucket, wait)
+            time.sleep(wait + random.uniform(0, 0.25))
+
+    def _retry_after(self, headers: Dict) -> float:
+        try:
+            return float(headers.get('retry-after', self.window))
+        except (TypeError, ValueError):
+            return self.window
+
+    def observe(self, url: str, status: int, headers: Dict):
+        """Correct the bucket from a response's used-weight and Retry-After headers"""
+        bucket, _, _ = request_weight(url)
+        if bucket is None or not headers:
+            return
+        headers = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+        window = int(now // self.window)
+
+        server_used = None
+        try:
+            server_used = float(headers['x-mbx-used-weight-1m'])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        blocked_until = None
+        if status in (418, 429):
+            self.throttled += 1
+            retry_after = self._retry_after(headers)
+            blocked_until = now + retry_after
+            logger.warning(
+                f"Binance returned {status} for {bucket}, pausing its requests for {retry_after:.0f}s")
+
+        if server_used is None and blocked_until is None:
+            return
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT INTO buckets (name, window, used, blocked_until) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET "
+                    "used = CASE WHEN buckets.window = excluded.window "
+                    "THEN MAX(buckets.used, excluded.used) ELSE excluded.used END, "
+                    "window = excluded.window, "
+                    "blocked_until = MAX(buckets.blocked_until, excluded.blocked_until)",
+                    (bucket, window, server_used or 0.0, blocked_until or 0.0))
+        except Exception as e:
+            logger.error(f"Error updating rate limit state: {str(e)}")
+
+    def install(self, client) -> bool:
+        """
+        Route a ccxt client's requests through the limiter
+
+        Works for async and sync clients. Requests that hit a 429/418 wait out
+        the Retry-After and are retried instead of failing.
+
+        Returns:
+            bool: False if the client's exchange is not managed by the limiter
+        """
+        if not client.id.startswith('binance'):
+            return False
+        if getattr(client, '_weight_limited', False):
+            return True
+        client._weight_limited = True
+
+        on_rest_response = client.on_rest_response
+        fetch = client.fetch
+        is_async = asyncio.iscoroutinefunction(fetch)
+
+        def observed_response(code, reason, url, method, response_headers, response_body,
+                              request_headers, request_body):
+            if is_async:
+                # Called on the event loop; record the headers in the background,
+                # but block this process's retries of a throttled bucket at once
+                headers = {k.lower(): v for k, v in (response_headers or {}).items()}
+                bucket = request_weight(url)[0]
+                if bucket is not None and code in (418, 429):
+                    self._blocked[bucket] = time.time() + self._retry_after(headers)
+                get_thread_pool().submit(self.observe, url, code, headers)
+            else:
+                self.observe(url, code, response_headers)
+            return on_rest_response(code, reason, url, method, response_headers,
+                                    response_body, request_headers, request_body)
+
+        client.on_rest_response = observed_response
+        client.enableRateLimit = False  # The shared budget replaces ccxt's per-process throttle
+
+        import ccxt
+        throttled_errors = (ccxt.RateLimitExceeded, ccxt.DDoSProtection)
+
+        if is_async:
+            async def limited_fetch(url, method='GET', headers=None, body=None):
+                for attempt in range(3):
+                    await self.acquire(url)
+                    try:
+                        return await fetch(url, method, headers, body)
+                    except throttled_errors:
+                        if attempt == 2:
+                            raise
+        else:
+            def limited_fetch(url, method='GET', headers=None, body=None):
+                for attempt in range(3):
+                    self.acquire_blocking(url)
+                    try:
+                        return fetch(url, method, headers, body)
+                    except throttled_errors:
+                        if attempt == 2:
+                            raise
+
+        client.fetch = limited_fetch
+        return True
+
+    def usage(self) -> Dict[str, Dict]:
+        """Weight used per bucket in the current window, across all processes"""
+        now = time.time()
+        window = int(now // self.window)
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, window, used, blocked_until FROM buckets").fetchall()
+        limits = dict(BUCKETS.values())
+        return {
+            name: {
+                'used': used if row_window == window else 0.0,
+                'limit': limits.get(name),
+                'blocked_for': max(0.0, round(blocked_until - now, 1))
+            }
+            for name, row_window, used, blocked_until in rows
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 2),
+            'throttled': self.throttled
+        }
+
+
+# Create a global instance; the SQLite file is what processes share
+weight_limiter = WeightLimiter()
+
+
+def limit_exchange(client) -> bool:
+    """Wrapper for the limiter's install method"""
+    return weight_limiter.install(client)
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+DEFAULT_DB_PATH = os.path.join("data", "scanner.db")
+
+
+class WorkQueue:
+    """
+    SQLite work queue and status store shared by the scan supervisor, its
+    worker processes and the API. The supervisor enqueues one job per symbol
+    and cycle, workers claim jobs atomically and report outcomes, and every
+    process publishes a heartbeat row the API can read.
+
+    Scanner nodes on one host may share the database: a queue opened with a
+    node_id only claims, counts, requeues and cancels that node's jobs. The
+    API opens it without one and sees every node.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, stale_after=300, node_id=None):
+        self.db_path = db_path
+        self.stale_after = stale_after  # Heartbeat age after which a worker counts as dead
+        self.node_id = node_id
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly where needed
+        self.conn = sqlite3.connect(
+            db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()  # Serializes explicit transactions across threads
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cycle INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                context TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                worker TEXT,
+                outcome TEXT,
+                error TEXT,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                node TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+            CREATE INDEX IF NOT EXISTS jobs_cycle ON jobs (cycle);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                role TEXT NOT NULL,
+                pid INTEGER,
+                status TEXT,
+                current_symbol TEXT,
+                processed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                stats TEXT,
+                started_at REAL,
+                heartbeat REAL,
+                node TEXT
+            );
+            CREATE TABLE IF NOT EXISTS metrics (
+                worker_id TEXT PRIMARY KEY,
+                snapshot TEXT NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS profile_requests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL DEFAULT 'all',
+                mode TEXT NOT NULL,
+                amount REAL NOT NULL,
+                memory INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS profile_results (
+                request_id INTEGER NOT NULL,
+                worker_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                started_at REAL,
+                finished_at REAL,
+                PRIMARY KEY (request_id, worker_id)
+            );
+        """)
+        # Databases created before jobs and workers were tagged with their node
+        for table in ('jobs', 'workers'):
+            columns = [row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if 'node' not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN node TEXT")
+
+    def _node_filter(self):
+        """SQL condition and parameters limiting a jobs query to this node"""
+        if self.node_id is None:
+            return "", ()
+        return " AND node = ?", (self.node_id,)
+
+    def enqueue(self, cycle: int, jobs: Dict[str, Dict]) -> int:
+        """Queue one job per symbol, in the given (priority) order"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT INTO jobs (cycle, symbol, context, enqueued_at, node) VALUES (?, ?, ?, ?, ?)",
+                    [(cycle, symbol, json.dumps(context, default=str), now, self.node_id)
+                     for symbol, context in jobs.items()])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(jobs)
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Atomically take the oldest queued job, or None when the queue is empty"""
+        node_filter, params = self._node_filter()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT id, cycle, symbol, context FROM jobs "
+                    f"WHERE status = 'queued'{node_filter} ORDER BY id LIMIT 1", params).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, started_at = ? WHERE id = ?",
+                        (worker_id, time.time(), row['id']))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'cycle': row['cycle'],
+            'symbol': row['symbol'],
+            'context': json.loads(row['context']) if row['context'] else None
+        }
+
+    def complete(self, job_id: int, outcome: str, error: str = None, worker_id: str = None):
+        """
+        Record a job's outcome ('signal', 'no_signal', 'no_data' or 'error').
+        With worker_id, only while the job is still that worker's, so a job
+        that was requeued and claimed again is not finished twice.
+        """
+        query = ("UPDATE jobs SET status = ?, outcome = ?, error = ?, finished_at = ? "
+                 "WHERE id = ? AND status = 'running'")
+        params = ('failed' if outcome == 'error' else 'done', outcome, error, time.time(), job_id)
+        if worker_id is not None:
+            query += " AND worker = ?"
+            params += (worker_id,)
+        if not self.conn.execute(query, params).rowcount:
+            logger.warning(f"Job {job_id} was no longer running; outcome {outcome} dropped")
+
+    def requeue_stale(self) -> int:
+        """Put running jobs back in the queue when their worker stopped heartbeating"""
+        cutoff = time.time() - self.stale_after
+        node_filter, params = self._node_filter()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL, started_at = NULL "
+            "WHERE status = 'running' AND worker NOT IN "
+            f"(SELECT worker_id FROM workers WHERE heartbeat >= ?){node_filter}",
+            (cutoff,) + params)
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} jobs from stale workers")
+        return cursor.rowcount
+
+    def pending(self, cycle: int = None) -> int:
+        """Number of queued or running jobs, optionally for one cycle"""
+        node_filter, params = self._node_filter()
+        query = f"SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running'){node_filter}"
+        if cycle is not None:
+            query += " AND cycle = ?"
+            params += (cycle,)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def results(self, cycle: int) -> List[Dict]:
+        """Finished jobs of a cycle"""
+        node_filter, params = self._node_filter()
+        rows = self.conn.execute(
+            "SELECT symbol, outcome, error, worker, started_at, finished_at FROM jobs "
+            f"WHERE cycle = ? AND status IN ('done', 'failed'){node_filter} ORDER BY id",
+            (cycle,) + params).fetchall()
+        return [dict(row) for row in rows]
+
+    def last_cycle(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(cycle), 0) FROM jobs").fetchone()[0]
+
+    def cancel_pending(self) -> List[Dict]:
+        """
+        Drop this node's queued jobs, e.g. left over from a previous supervisor
+        run, and those of nodes with no live process left. Other live nodes'
+        jobs are kept.
+
+        Returns:
+            list: The dropped jobs' node, cycle and symbol, so their leases can be released
+        """
+        if self.node_id is None:
+            rows = self.conn.execute(
+                "DELETE FROM jobs WHERE status = 'queued' RETURNING node, cycle, symbol").fetchall()
+        else:
+            rows = self.conn.execute(
+                "DELETE FROM jobs WHERE status = 'queued' AND (node IS NULL OR node = ? OR node NOT IN "
+                "(SELECT node FROM workers WHERE heartbeat >= ? AND node IS NOT NULL)) "
+                "RETURNING node, cycle, symbol",
+                (self.node_id, time.time() - self.stale_after)).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self, keep_cycles=48) -> int:
+        """Delete jobs of old cycles"""
+        return self.conn.execute(
+            "DELETE FROM jobs WHERE cycle <= ?", (self.last_cycle() - keep_cycles,)).rowcount
+
+    def heartbeat(self, worker_id: str, role: str, status: str, current_symbol: str = None,
+                  processed: int = 0, failed: int = 0, stats: Dict = None):
+        """Publish a process's status row"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO workers (worker_id, role, pid, status, current_symbol, processed, failed, "
+            "stats, started_at, heartbeat, node) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET role = excluded.role, pid = excluded.pid, "
+            "node = excluded.node, "
+            "status = excluded.status, current_symbol = excluded.current_symbol, "
+            "processed = excluded.processed, failed = excluded.failed, "
+            "stats = COALESCE(excluded.stats, workers.stats), heartbeat = excluded.heartbeat",
+            (worker_id, role, os.getpid(), status, current_symbol, processed, failed,
+             json.dumps(stats, default=str) if stats is not None else None, now, now,
+             self.node_id))
+
+    def remove_worker(self, worker_id: str):
+        self.conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+        self.conn.execute("DELETE FROM metrics WHERE worker_id = ?", (worker_id,))
+
+    def publish_metrics(self, worker_id: str, snapshot: Dict):
+        """Store a process's latest metrics snapshot for the API to serve"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metrics (worker_id, snapshot, updated) VALUES (?, ?, ?)",
+            (worker_id, json.dumps(snapshot), time.time()))
+
+    def metrics_snapshots(self) -> Dict[str, Dict]:
+        """Latest metrics snapshot of every live process"""
+        rows = self.conn.execute(
+            "SELECT m.worker_id, m.snapshot FROM metrics m JOIN workers w USING (worker_id) "
+            "WHERE w.heartbeat >= ?", (time.time() - self.stale_after,)).fetchall()
+        return {row['worker_id']: json.loads(row['snapshot']) for row in rows}
+
+    def workers(self) -> List[Dict]:
+        """Status rows of every process, with heartbeat age and liveness"""
+        now = time.time()
+        result = []
+        for row in self.conn.execute("SELECT * FROM workers ORDER BY worker_id").fetchall():
+            worker = dict(row)
+            worker['stats'] = json.loads(worker['stats']) if worker['stats'] else None
+            worker['heartbeat_age'] = round(now - (worker['heartbeat'] or 0), 1)
+            worker['alive'] = worker['heartbeat_age'] < self.stale_after
+            result.append(worker)
+        return result
+
+    def request_profile(self, mode: str, amount: float, memory: bool = False,
+                        target: str = 'all') -> int:
+        """Ask scanner workers to profile themselves; returns the request id"""
+        return self.conn.execute(
+            "INSERT INTO profile_requests (target, mode, amount, memory, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (target, mode, amount, int(memory), time.time())).lastrowid
+
+    def next_profile_request(self, worker_id: str, max_age=600) -> Optional[Dict]:
+        """Oldest recent request for this worker that it has not picked up yet"""
+        row = self.conn.execute(
+            "SELECT * FROM profile_requests r WHERE created_at >= ? "
+            "AND target IN ('all', ?) AND NOT EXISTS (SELECT 1 FROM profile_results p "
+            "WHERE p.request_id = r.id AND p.worker_id = ?) ORDER BY id LIMIT 1",
+            (time.time() - max_age, worker_id, worker_id)).fetchone()
+        return dict(row) if row else None
+
+    def start_profile(self, request_id: int, worker_id: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profile_results (request_id, worker_id, status, started_at) "
+            "VALUES (?, ?, 'running', ?)", (request_id, worker_id, time.time()))
+
+    def finish_profile(self, request_id: int, worker_id: str, result: Dict):
+        self.conn.execute(
+            "UPDATE profile_results SET status = 'done', result = ?, finished_at = ? "
+            "WHERE request_id = ? AND worker_id = ?",
+            (json.dumps(result, default=str), time.time(), request_id, worker_id))
+
+    def profile(self, request_id: int) -> Optional[Dict]:
+        """A profiling request with the status and results of each worker"""
+        row = self.conn.execute(
+            "SELECT * FROM profile_requests WHERE id = ?", (request_id,)).fetchone()
+        if row is None:
+            return None
+        request = dict(row)
+        request['memory'] = bool(request['memory'])
+        request['workers'] = {}
+        for result in self.conn.execute(
+                "SELECT * FROM profile_results WHERE request_id = ? ORDER BY worker_id",
+                (request_id,)).fetchall():
+            request['workers'][result['worker_id']] = {
+                'status': result['status'],
+                'started_at': result['started_at'],
+                'finished_at': result['finished_at'],
+                'result': json.loads(result['result']) if result['result'] else None
+            }
+        return request
+
+    def profiles(self, limit=20) -> List[Dict]:
+        """Recent profiling requests with per-worker status, without results"""
+        requests = []
+        for row in self.conn.execute(
+                "SELECT * FROM profile_requests ORDER BY id DESC LIMIT ?", (limit,)).fetchall():
+            request = dict(row)
+            request['memory'] = bool(request['memory'])
+            request['workers'] = dict(self.conn.execute(
+                "SELECT worker_id, status FROM profile_results WHERE request_id = ?",
+                (row['id'],)).fetchall())
+            requests.append(request)
+        return requests
+
+    def stats(self) -> Dict:
+        counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            'cycle': self.last_cycle(),
+            'queued': counts.get('queued', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0)
+        }
+
+    def close(self):
+        self.conn.close()
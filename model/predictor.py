@@ -2,32 +2,134 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
-import json
-import os
-import traceback
+import time
 from core.whale_detector import detect_whale_activity
 from core.news_sentiment import fetch_sentiment, adjust_confidence
 from core.ml_prediction import get_ml_prediction
+from utils.executors import run_cpu
+from utils import metrics, tracing
+from utils.profiling import active_session
+from utils.config import get_config
 
 # Get logger
 logger = logging.getLogger("crypto-signal-bot")
 
-# Load confidence configuration
-try:
-    config_path = os.path.join('config', 'confidence_config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            CONFIDENCE_CONFIG = json.load(f)
-        TELEGRAM_MIN_CONFIDENCE = CONFIDENCE_CONFIG.get(
-            'telegram_minimum', 90.0)
-        BASE_MIN_CONFIDENCE = CONFIDENCE_CONFIG.get('base_minimum', 70.0)
-    else:
-        TELEGRAM_MIN_CONFIDENCE = 90.0
-        BASE_MIN_CONFIDENCE = 70.0
-except Exception as e:
-    logger.warning(f"Error loading confidence config: {str(e)}")
-    TELEGRAM_MIN_CONFIDENCE = 90.0
-    BASE_MIN_CONFIDENCE = 70.0
+PHASE_SECONDS = metrics.histogram(
+    'analysis_phase_seconds', 'CPU time of each analysis phase in the process pool', ['phase'])
+ANALYSIS_SECONDS = metrics.histogram(
+    'analysis_seconds', 'Round trip of one analysis through the process pool', ['timeframe'])
+
+
+REQUIRED_INDICATORS = ['rsi', 'macd', 'macdsignal', 'upper_band', 'lower_band', 'atr']
+
+
+def compute_indicators(df):
+    """Calculate technical indicators"""
+    try:
+        if df.empty or len(df) < 20:
+            return df
+
+        # Calculate RSI (14)
+        delta = df['close'].diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
+        rs = gain / loss
+        df['rsi'] = 100 - (100 / (1 + rs))
+
+        # Calculate MACD (12, 26, 9)
+        exp1 = df['close'].ewm(span=12, adjust=False).mean()
+        exp2 = df['close'].ewm(span=26, adjust=False).mean()
+        df['macd'] = exp1 - exp2
+        df['macdsignal'] = df['macd'].ewm(span=9, adjust=False).mean()
+        df['macdhist'] = df['macd'] - df['macdsignal']
+
+        # Calculate Bollinger Bands (20, 2)
+        df['sma20'] = df['close'].rolling(window=20).mean()
+        df['stddev'] = df['close'].rolling(window=20).std()
+        df['upper_band'] = df['sma20'] + (df['stddev'] * 2)
+        df['lower_band'] = df['sma20'] - (df['stddev'] * 2)
+
+        # Calculate ATR (14)
+        high_low = df['high'] - df['low']
+        high_close = np.abs(df['high'] - df['close'].shift())
+        low_close = np.abs(df['low'] - df['close'].shift())
+        ranges = pd.concat([high_low, high_close, low_close], axis=1)
+        true_range = np.max(ranges, axis=1)
+        df['atr'] = true_range.rolling(14).mean()
+
+        # Calculate Volume SMA (20)
+        if 'volume' in df.columns:
+            df['volume_sma20'] = df['volume'].rolling(window=20).mean()
+
+        # Calculate EMAs for ML prediction
+        df['ema_20'] = df['close'].ewm(span=20, adjust=False).mean()
+        df['ema_50'] = df['close'].ewm(span=50, adjust=False).mean()
+
+        # Calculate support and resistance
+        _calculate_support_resistance(df)
+
+        return df
+
+    except Exception as e:
+        logger.error(f"Error calculating indicators: {str(e)}")
+        return df
+
+def _calculate_support_resistance(df):
+    """Calculate basic support and resistance levels"""
+    try:
+        if len(df) < 30:
+            return
+
+        # Find local minima and maxima
+        window = 10
+        df['min_low'] = df['low'].rolling(window=window, center=True).min()
+        df['max_high'] = df['high'].rolling(
+            window=window, center=True).max()
+
+        # Find recent support (lows)
+        recent_lows = df[df['low'] == df['min_low']].iloc[-5:]['low']
+        last_support = recent_lows.mean(
+        ) if not recent_lows.empty else df.iloc[-1]['low'] * 0.98
+
+        # Find recent resistance (highs)
+        recent_highs = df[df['high'] == df['max_high']].iloc[-5:]['high']
+        last_resistance = recent_highs.mean(
+        ) if not recent_highs.empty else df.iloc[-1]['high'] * 1.02
+
+        # Add to dataframe
+        df['last_support'] = last_support
+        df['last_resistance'] = last_resistance
+
+    except Exception as e:
+        logger.warning(f"Error calculating support/resistance: {str(e)}")
+
+
+def analyze_frame(symbol, df):
+    """
+    CPU-heavy part of a prediction: indicators, whale detection and ML inference.
+    Runs in a worker process, so it only takes and returns picklable data.
+
+    Returns:
+        tuple: (df with indicators, whale data, ML prediction, phase timings),
+        whale data and prediction None when the required indicators could not
+        be calculated. Timings are returned because metrics recorded in the
+        pool process would never reach the /metrics endpoint.
+    """
+    timings = {}
+    started = time.perf_counter()
+    df = compute_indicators(df)
+    timings['indicators'] = time.perf_counter() - started
+    if not all(indicator in df.columns for indicator in REQUIRED_INDICATORS):
+        return df, None, None, timings
+
+    started = time.perf_counter()
+    whale_data = detect_whale_activity(symbol, df)
+    timings['whale'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ml_prediction = get_ml_prediction(symbol, df)
+    timings['ml'] = time.perf_counter() - started
+    return df, whale_data, ml_prediction, timings
 
 
 class SignalPredictor:
@@ -44,28 +146,51 @@ class SignalPredictor:
             "sentiment": 0.12,       # News sentiment weight
             "ml_prediction": 0.12     # ML prediction weight
         }
-        self.confidence_threshold = BASE_MIN_CONFIDENCE
 
-    async def predict_signal(self, symbol, df, timeframe):
-        """Generate trade signals based on technical indicators and external factors"""
+    @property
+    def confidence_threshold(self):
+        """Minimum confidence for a signal, from the live config"""
+        return get_config().base_minimum
+
+    async def predict_signal(self, symbol, df, timeframe, context=None):
+        """
+        Generate trade signals based on technical indicators and external factors
+
+        Args:
+            symbol (str): Trading pair symbol
+            df (pandas.DataFrame): OHLCV data
+            timeframe (str): Timeframe of the data
+            context (dict): Per-symbol data resolved before the scan, e.g. 'sentiment'
+        """
         try:
             if len(df) < 20:
-                logger.warning(f"[{symbol}] Not enough data for prediction")
+                logger.warning("[%s] Not enough data for prediction", symbol)
                 return None
 
-            # Calculate technical indicators
-            df = await self.calculate_indicators(df)
+            # One snapshot per prediction so a reload can't change thresholds midway
+            settings = get_config()
+
+            # Indicators, whale detection and ML inference run in the process pool
+            with ANALYSIS_SECONDS.time(timeframe), tracing.span('process_pool'):
+                # An admin profiling session profiles the analysis inside the pool
+                session = active_session()
+                if session is not None:
+                    result = await session.run_cpu(analyze_frame, symbol, df)
+                else:
+                    result = await run_cpu(analyze_frame, symbol, df)
+                df, whale_data, ml_prediction, timings = result
+                for phase, seconds in timings.items():
+                    PHASE_SECONDS.labels(phase).observe(seconds)
+                    tracing.record(phase, seconds)
 
             # Get the latest candle data
             latest = df.iloc[-1]
 
             # Check for required indicators
-            required_indicators = [
-                'rsi', 'macd', 'macdsignal', 'upper_band', 'lower_band', 'atr']
-            if not all(indicator in df.columns for indicator in required_indicators):
+            if whale_data is None:
                 missing = [
-                    ind for ind in required_indicators if ind not in df.columns]
-                logger.warning(f"[{symbol}] Missing indicators: {missing}")
+                    ind for ind in REQUIRED_INDICATORS if ind not in df.columns]
+                logger.warning("[%s] Missing indicators: %s", symbol, missing)
                 return None
 
             # RSI conditions
@@ -102,8 +227,7 @@ class SignalPredictor:
                 support_resistance_bullish = False
                 support_resistance_bearish = False
 
-            # Detect whale activity
-            whale_data = detect_whale_activity(symbol, df)
+            # Whale activity detected in the worker
             whale_activity = whale_data['detected']
             whale_type = whale_data['type']
             whale_score = whale_data['score']
@@ -114,13 +238,15 @@ class SignalPredictor:
             whale_bearish = whale_activity and (
                 whale_type == 'bearish_distribution')
 
-            # Get news sentiment
-            sentiment_data = fetch_sentiment(symbol)
+            # Get news sentiment, resolved once per scan cycle when available
+            sentiment_data = (context or {}).get('sentiment')
+            if sentiment_data is None:
+                with tracing.span('sentiment'):
+                    sentiment_data = await fetch_sentiment(symbol)
             sentiment_bullish = sentiment_data['sentiment_type'] == 'positive'
             sentiment_bearish = sentiment_data['sentiment_type'] == 'negative'
 
-            # Get ML prediction
-            ml_prediction = get_ml_prediction(symbol, df)
+            # ML prediction from the worker
             ml_direction = ml_prediction.get('direction')
             ml_confidence = ml_prediction.get('confidence', 0)
             ml_patterns = ml_prediction.get('patterns', [])
@@ -131,8 +257,7 @@ class SignalPredictor:
 
             # Log any detected patterns
             if ml_patterns:
-                logger.info(
-                    f"[{symbol}] Detected candlestick patterns: {', '.join(ml_patterns)}")
+                logger.info("[%s] Detected candlestick patterns: %s", symbol, ', '.join(ml_patterns))
 
             # Combine conditions
             long_conditions = [
@@ -172,17 +297,17 @@ class SignalPredictor:
                 ml_boost = min((ml_confidence - 50) / 5,
                                10) if ml_confidence > 50 else 0
                 long_confidence += ml_boost
-                logger.info(
-                    f"[{symbol}] ML prediction matches LONG direction: boosting confidence by {ml_boost:.2f}%")
+                logger.debug("[%s] ML prediction matches LONG direction: boosting confidence by %.2f%%",
+                             symbol, ml_boost)
             elif ml_direction == 'SHORT' and short_confidence > long_confidence:
                 ml_boost = min((ml_confidence - 50) / 5,
                                10) if ml_confidence > 50 else 0
                 short_confidence += ml_boost
-                logger.info(
-                    f"[{symbol}] ML prediction matches SHORT direction: boosting confidence by {ml_boost:.2f}%")
+                logger.debug("[%s] ML prediction matches SHORT direction: boosting confidence by %.2f%%",
+                             symbol, ml_boost)
 
             # Choose the direction with higher confidence
-            if long_confidence > short_confidence and long_confidence >= self.confidence_threshold:
+            if long_confidence > short_confidence and long_confidence >= settings.base_minimum:
                 direction = "LONG"
                 confidence = long_confidence
 
@@ -193,7 +318,7 @@ class SignalPredictor:
                 tp2 = entry * 1.03   # 3% take profit
                 tp3 = entry * 1.05   # 5% take profit
 
-            elif short_confidence >= self.confidence_threshold:
+            elif short_confidence >= settings.base_minimum:
                 direction = "SHORT"
                 confidence = short_confidence
 
@@ -206,8 +331,8 @@ class SignalPredictor:
 
             else:
                 # No clear signal
-                logger.info(
-                    f"[{symbol}] Low confidence: {max(long_confidence, short_confidence):.2f}%")
+                logger.debug("[%s] Low confidence: %.2f%%", symbol,
+                             max(long_confidence, short_confidence))
                 return None
 
             # Create signal dict
@@ -236,7 +361,7 @@ class SignalPredictor:
                 "ml_prediction": ml_direction,
                 "ml_confidence": round(ml_confidence, 2),
                 "candlestick_patterns": ml_patterns,
-                "send_to_telegram": confidence >= TELEGRAM_MIN_CONFIDENCE
+                "send_to_telegram": confidence >= settings.telegram_minimum
             }
 
             # If support and resistance values exist, add them to the signal
@@ -249,36 +374,35 @@ class SignalPredictor:
                 signal["headlines"] = sentiment_data['latest_headlines']
 
             logger.info(
-                f"[{symbol}] Prediction for {timeframe}: {direction}, Confidence: {confidence:.2f}%")
-            logger.info(
-                f"[{symbol}] Signal generated - Direction: {direction}, Confidence: {confidence:.2f}%, Entry: {entry}, TP1: {tp1}, TP2: {tp2}, TP3: {tp3}")
+                "[%s] Signal generated for %s - Direction: %s, Confidence: %.2f%%, "
+                "Entry: %s, TP1: %s, TP2: %s, TP3: %s",
+                symbol, timeframe, direction, confidence, entry, tp1, tp2, tp3)
 
             # Log special factors
             if whale_activity:
-                logger.info(
-                    f"[{symbol}] 🐋 Whale activity detected - Type: {whale_type}, Score: {whale_score}")
+                logger.info("[%s] 🐋 Whale activity detected - Type: %s, Score: %s",
+                            symbol, whale_type, whale_score)
 
             if sentiment_data['sentiment_type'] != 'neutral':
-                logger.info(
-                    f"[{symbol}] 📰 News sentiment: {sentiment_data['sentiment_type']} (Score: {sentiment_data.get('score', 0):.2f})")
+                logger.info("[%s] 📰 News sentiment: %s (Score: %.2f)", symbol,
+                            sentiment_data['sentiment_type'], sentiment_data.get('score', 0))
 
             if ml_direction:
-                logger.info(
-                    f"[{symbol}] 🧠 ML prediction: {ml_direction} (Confidence: {ml_confidence:.2f}%)")
+                logger.debug("[%s] 🧠 ML prediction: %s (Confidence: %.2f%%)",
+                             symbol, ml_direction, ml_confidence)
 
             # Log if signal qualifies for Telegram
-            if confidence >= TELEGRAM_MIN_CONFIDENCE:
-                logger.info(
-                    f"[{symbol}] ✅ HIGH CONFIDENCE signal qualifies for Telegram ({confidence:.2f}% ≥ {TELEGRAM_MIN_CONFIDENCE}%)")
+            if confidence >= settings.telegram_minimum:
+                logger.info("[%s] ✅ HIGH CONFIDENCE signal qualifies for Telegram (%.2f%% ≥ %s%%)",
+                            symbol, confidence, settings.telegram_minimum)
             else:
-                logger.info(
-                    f"[{symbol}] Signal below Telegram threshold ({confidence:.2f}% < {TELEGRAM_MIN_CONFIDENCE}%)")
+                logger.debug("[%s] Signal below Telegram threshold (%.2f%% < %s%%)",
+                             symbol, confidence, settings.telegram_minimum)
 
             return signal
 
-        except Exception as e:
-            logger.error(f"[{symbol}] Error in predict_signal: {str(e)}")
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("[%s] Error in predict_signal", symbol)
             return None
 
     def _calculate_confidence(self, conditions):
@@ -354,81 +478,5 @@ class SignalPredictor:
         return round(confidence, 2)
 
     async def calculate_indicators(self, df):
-        """Calculate technical indicators"""
-        try:
-            if df.empty or len(df) < 20:
-                return df
-
-            # Calculate RSI (14)
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-            loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-
-            # Calculate MACD (12, 26, 9)
-            exp1 = df['close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['close'].ewm(span=26, adjust=False).mean()
-            df['macd'] = exp1 - exp2
-            df['macdsignal'] = df['macd'].ewm(span=9, adjust=False).mean()
-            df['macdhist'] = df['macd'] - df['macdsignal']
-
-            # Calculate Bollinger Bands (20, 2)
-            df['sma20'] = df['close'].rolling(window=20).mean()
-            df['stddev'] = df['close'].rolling(window=20).std()
-            df['upper_band'] = df['sma20'] + (df['stddev'] * 2)
-            df['lower_band'] = df['sma20'] - (df['stddev'] * 2)
-
-            # Calculate ATR (14)
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            df['atr'] = true_range.rolling(14).mean()
-
-            # Calculate Volume SMA (20)
-            if 'volume' in df.columns:
-                df['volume_sma20'] = df['volume'].rolling(window=20).mean()
-
-            # Calculate EMAs for ML prediction
-            df['ema_20'] = df['close'].ewm(span=20, adjust=False).mean()
-            df['ema_50'] = df['close'].ewm(span=50, adjust=False).mean()
-
-            # Calculate support and resistance
-            await self._calculate_support_resistance(df)
-
-            return df
-
-        except Exception as e:
-            logger.error(f"Error calculating indicators: {str(e)}")
-            return df
-
-    async def _calculate_support_resistance(self, df):
-        """Calculate basic support and resistance levels"""
-        try:
-            if len(df) < 30:
-                return
-
-            # Find local minima and maxima
-            window = 10
-            df['min_low'] = df['low'].rolling(window=window, center=True).min()
-            df['max_high'] = df['high'].rolling(
-                window=window, center=True).max()
-
-            # Find recent support (lows)
-            recent_lows = df[df['low'] == df['min_low']].iloc[-5:]['low']
-            last_support = recent_lows.mean(
-            ) if not recent_lows.empty else df.iloc[-1]['low'] * 0.98
-
-            # Find recent resistance (highs)
-            recent_highs = df[df['high'] == df['max_high']].iloc[-5:]['high']
-            last_resistance = recent_highs.mean(
-            ) if not recent_highs.empty else df.iloc[-1]['high'] * 1.02
-
-            # Add to dataframe
-            df['last_support'] = last_support
-            df['last_resistance'] = last_resistance
-
-        except Exception as e:
-            logger.warning(f"Error calculating support/resistance: {str(e)}")
+        """Calculate technical indicators in the process pool"""
+        return await run_cpu(compute_indicators, df)
@@ -4,6 +4,7 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from joblib import dump
 from utils.logger import log
+from data.weight_limiter import limit_exchange
 from core.candle_patterns import is_bullish_engulfing, is_bearish_engulfing, is_doji, is_hammer, is_shooting_star, is_three_white_soldiers, is_three_black_crows
 import ccxt
 
@@ -74,6 +75,7 @@ def train_model(symbol, ohlcv, model_path="models/rf_model.joblib"):
 
 if __name__ == "__main__":
     exchange = ccxt.binance()
+    limit_exchange(exchange)
     symbol = "BTC/USDT"
     ohlcv = exchange.fetch_ohlcv(symbol, timeframe="15m", limit=2880)  # ~30 days
     train_model(symbol, ohlcv)
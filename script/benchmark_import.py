@@ -0,0 +1,86 @@
+"""
+Measure cold-start import time of the bot's modules.
+
+Each module is imported in a fresh interpreter with `-X importtime`, so the
+numbers include everything the import pulls in. Run from the repo root:
+
+    python script/benchmark_import.py
+    python script/benchmark_import.py core.news_sentiment --runs 10 --top 15
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+DEFAULT_MODULES = [
+    "core.news_sentiment",
+    "core.market_sentiment",
+    "model.predictor",
+    "main",
+]
+
+
+def import_profile(module):
+    """
+    Import a module in a fresh interpreter and parse its -X importtime output
+
+    Returns:
+        tuple: (total microseconds, list of (cumulative us, self us, name))
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=parent_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    # The requested module is the last (outermost) entry
+    total = next((c for c, _, n in reversed(entries) if n.strip() == module), 0)
+    return total, entries
+
+
+def benchmark(module, runs=5, top=10):
+    """Print the median cold import time and the slowest imports of one module"""
+    totals = []
+    entries = []
+    for _ in range(runs):
+        total, entries = import_profile(module)
+        totals.append(total)
+
+    print(f"\n{module}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f}, {runs} runs)")
+
+    # Slowest direct dependencies of the last run (one indent level deep)
+    direct = [e for e in entries
+              if e[2].startswith("   ") and not e[2].startswith("     ")]
+    for cumulative_us, self_us, name in sorted(direct, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f})  {name.strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold import time")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            benchmark(module, args.runs, args.top)
+        except Exception as e:
+            print(f"\n{module}: import failed - {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Micro-benchmarks for the indicator, pattern and whale kernels.
+
+Each kernel runs on synthetic OHLCV of 100 to 100k bars, and over panels of
+10 to 500 symbols of scan-sized frames (200 bars), in this process. The
+report gives the median time per call, ns per bar and the scaling exponent k
+in time ~ bars^k: k near 1 is linear, near 0 means a fixed cost dominates
+(e.g. kernels that only look at the last candles). Run from the repo root:
+
+    python script/benchmark_kernels.py
+    python script/benchmark_kernels.py --kernels patterns. whale --sizes 1000 100000
+    python script/benchmark_kernels.py --panels 10 500 --compare logs/benchmarks/<old>.json
+
+Results are saved as JSON under logs/benchmarks/ next to the scan benchmark's.
+"""
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import statistics
+from datetime import datetime
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from script.benchmark_scan import RESULTS_DIR, git_commit
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_PANELS = [10, 50, 100, 500]
+PANEL_BARS = 200  # Bars per symbol in a scan
+MIN_SECONDS = 0.2  # Keep repeating a measurement until it has run this long
+
+
+def make_ohlcv(bars, seed=0):
+    """Random-walk OHLCV frame indexed by 15m timestamps"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, bars)))
+    volume = np.abs(rng.normal(1e5, 3e4, bars)) * np.where(rng.random(bars) < 0.03, 5, 1)
+    index = pd.date_range(end=pd.Timestamp.now().floor('15min'), periods=bars, freq='15min')
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close,
+                         'volume': volume}, index=index)
+
+
+def kernels():
+    """
+    Name -> (function(df), copies input): kernels that add columns to the
+    frame they are given get a fresh copy per call, made outside the timing
+    """
+    from core import candle_patterns
+    from core.indicators import calculate_indicators
+    from core.whale_detector import detect_whale_activity
+    from model.predictor import compute_indicators
+    from utils.support_resistance import calculate_support_resistance
+    from utils.fibonacci import calculate_fibonacci_levels
+
+    result = {
+        'indicators.calculate_indicators': (calculate_indicators, False),
+        # SignalPredictor.calculate_indicators sends this to the process pool
+        'SignalPredictor.calculate_indicators': (compute_indicators, True),
+    }
+    for name in sorted(dir(candle_patterns)):
+        if name.startswith('is_'):
+            result[f'patterns.{name}'] = (getattr(candle_patterns, name), False)
+    result['detect_whale_activity'] = (lambda df: detect_whale_activity('BENCH/USDT', df), False)
+    result['calculate_support_resistance'] = (
+        lambda df: calculate_support_resistance('BENCH/USDT', df), True)
+    result['calculate_fibonacci_levels'] = (calculate_fibonacci_levels, False)
+    return result
+
+
+def measure(run, prepare, max_repeats):
+    """
+    Median seconds of run(prepare()) over repeats, stopping after MIN_SECONDS
+    of measured time once at least three repeats are done
+    """
+    timings = []
+    while len(timings) < max_repeats:
+        args = prepare()
+        started = time.perf_counter()
+        run(args)
+        timings.append(time.perf_counter() - started)
+        if len(timings) >= 3 and sum(timings) >= MIN_SECONDS:
+            break
+    return statistics.median(timings), len(timings)
+
+
+def scaling_exponent(points):
+    """Least-squares slope of log(time) over log(bars)"""
+    if len(points) < 2:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if not denominator:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator, 2)
+
+
+def bench_sizes(func, copies, sizes, repeats):
+    rows = []
+    for bars in sizes:
+        df = make_ohlcv(bars)
+        prepare = (lambda: df.copy()) if copies else (lambda: df)
+        seconds, runs = measure(func, prepare, repeats)
+        rows.append({'bars': bars, 'ms': round(seconds * 1000, 4),
+                     'ns_per_bar': round(seconds * 1e9 / bars, 1), 'repeats': runs})
+    return rows
+
+
+def bench_panels(func, copies, panels, repeats):
+    rows = []
+    frames = [make_ohlcv(PANEL_BARS, seed) for seed in range(max(panels))]
+    for symbols in panels:
+        panel = frames[:symbols]
+        if copies:
+            prepare = lambda: [df.copy() for df in panel]
+        else:
+            prepare = lambda: panel
+
+        def run(dfs):
+            for df in dfs:
+                func(df)
+
+        seconds, runs = measure(run, prepare, repeats)
+        rows.append({'symbols': symbols, 'ms': round(seconds * 1000, 3),
+                     'us_per_symbol': round(seconds * 1e6 / symbols, 1),
+                     'ns_per_bar': round(seconds * 1e9 / (symbols * PANEL_BARS), 1),
+                     'repeats': runs})
+    return rows
+
+
+def print_kernel(name, result):
+    exponent = result['scaling_exponent']
+    print(f"\n{name}  (time ~ bars^{exponent if exponent is not None else '?'})")
+    for row in result['sizes']:
+        print(f"  {row['bars']:>8} bars   {row['ms']:>11.3f} ms  {row['ns_per_bar']:>11.1f} ns/bar")
+    for row in result['panels']:
+        print(f"  {row['symbols']:>5} symbols   {row['ms']:>11.3f} ms  "
+              f"{row['us_per_symbol']:>9.1f} us/symbol  {row['ns_per_bar']:>8.1f} ns/bar")
+
+
+def compare(old, new, threshold=0.10):
+    """Print ns/bar changes per kernel and size, flagging regressions"""
+    print(f"\nComparing {old['commit']} -> {new['commit']} (regression threshold {threshold:.0%})")
+    print(f"  {'':<52}{'before':>11}{'after':>11}{'change':>9}")
+    for name, result in new['kernels'].items():
+        before = old['kernels'].get(name)
+        if not before:
+            continue
+        pairs = [(f"{row['bars']} bars", row, 'bars') for row in result['sizes']] + \
+                [(f"{row['symbols']} symbols", row, 'symbols') for row in result['panels']]
+        for label, row, key in pairs:
+            source = before['sizes'] if key == 'bars' else before['panels']
+            previous = next((r for r in source if r[key] == row[key]), None)
+            if not previous or not previous['ns_per_bar']:
+                continue
+            change = (row['ns_per_bar'] - previous['ns_per_bar']) / previous['ns_per_bar']
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"  {name[:38] + ' ' + label:<52}{previous['ns_per_bar']:>11.1f}"
+                  f"{row['ns_per_bar']:>11.1f}{change:>+9.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator, pattern and whale kernels")
+    parser.add_argument("--kernels", nargs="*", default=[],
+                        help="Only kernels whose name contains one of these")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--panels", nargs="*", type=int, default=DEFAULT_PANELS)
+    parser.add_argument("--repeats", type=int, default=50, help="Maximum repeats per measurement")
+    parser.add_argument("--compare", metavar="RESULTS", help="Baseline results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+
+    results = {
+        'commit': git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'panel_bars': PANEL_BARS,
+        'kernels': {}
+    }
+    available = kernels()
+    # The kernels log every call; keep the benchmark's output and logs clean
+    # (after the imports, which configure the logger)
+    logging.getLogger("crypto-signal-bot").setLevel(logging.ERROR)
+
+    for name, (func, copies) in available.items():
+        if args.kernels and not any(pattern in name for pattern in args.kernels):
+            continue
+        sizes = bench_sizes(func, copies, args.sizes, args.repeats)
+        result = {
+            'sizes': sizes,
+            'panels': bench_panels(func, copies, args.panels, args.repeats) if args.panels else [],
+            'scaling_exponent': scaling_exponent([(r['bars'], r['ms']) for r in sizes])
+        }
+        results['kernels'][name] = result
+        print_kernel(name, result)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"kernels-{datetime.now().strftime('%Y%m%d-%H%M%S')}-"
+                                     f"{results['commit']}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
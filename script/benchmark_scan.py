@@ -0,0 +1,502 @@
+"""
+Offline benchmark of the scan path against a replayed exchange.
+
+Recorded OHLCV and ticker fixtures are served by ReplayExchange, a stand-in
+for the ccxt client with configurable request latency, so runs need no
+network and are repeatable. Each stage runs in a fresh interpreter, so its
+peak RSS is its own:
+
+    scan            process_symbol end to end: throughput and per-symbol latency
+    predict_signal  SignalPredictor.predict_signal, including the process pool
+    patterns        each candle pattern function in core/candle_patterns.py
+    ml_predict      MLPredictor.predict on frames with indicators
+    persistence     _write_signal_csv (signal CSV and performance tracking)
+
+Results are saved as JSON under logs/benchmarks/ with the git commit, so
+runs can be compared between commits. Run from the repo root:
+
+    python script/benchmark_scan.py --record               # needs network
+    python script/benchmark_scan.py --latency 0.05 --jitter 0.02
+    python script/benchmark_scan.py --stages patterns ml_predict --iterations 200
+    python script/benchmark_scan.py --compare logs/benchmarks/<old>.json
+    python script/benchmark_scan.py --compare <old>.json <new>.json
+
+Without a fixture file a deterministic synthetic one is generated, which is
+fine for comparing commits but not for absolute numbers.
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+DEFAULT_FIXTURES = os.path.join(parent_dir, "script", "fixtures", "binance_scan.json.gz")
+RESULTS_DIR = os.path.join(parent_dir, "logs", "benchmarks")
+STAGES = ["scan", "predict_signal", "patterns", "ml_predict", "persistence"]
+TIMEFRAMES = ["15m", "1h", "4h", "1d"]  # Same as core/scanner.py
+BARS = 200
+TIMEFRAME_MS = {"15m": 900000, "1h": 3600000, "4h": 14400000, "1d": 86400000}
+
+# Context the supervisor would have resolved, so no news API is called
+NEUTRAL_CONTEXT = {
+    'sentiment': {
+        'score': 0,
+        'magnitude': 0.3,
+        'article_count': 0,
+        'sentiment_type': 'neutral',
+        'latest_headlines': [],
+        'source': 'Benchmark'
+    }
+}
+
+
+class ReplayExchange:
+    """
+    Async ccxt stand-in serving recorded markets, tickers and OHLCV.
+    Every request sleeps for latency plus up to jitter seconds, like a round
+    trip to the exchange, and is counted per method.
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, seed=0):
+        self.id = fixtures.get('exchange', 'binance')
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.markets = {}
+        self.calls = {}
+        self._random = random.Random(seed)
+
+    async def _request(self, method):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def load_markets(self, reload=False, params=None):
+        if not self.markets or reload:
+            await self._request('load_markets')
+            self.markets = dict(self.fixtures['markets'])
+        return self.markets
+
+    async def fetch_tickers(self, symbols=None, params=None):
+        await self._request('fetch_tickers')
+        tickers = self.fixtures['tickers']
+        return {s: tickers[s] for s in symbols} if symbols else dict(tickers)
+
+    async def fetch_ticker(self, symbol, params=None):
+        await self._request('fetch_ticker')
+        return self.fixtures['tickers'][symbol]
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params=None):
+        await self._request('fetch_ohlcv')
+        rows = self.fixtures['ohlcv'].get(symbol, {}).get(timeframe, [])
+        if since is not None:
+            rows = [row for row in rows if row[0] >= since]
+        return [list(row) for row in (rows[-limit:] if limit else rows)]
+
+    async def close(self):
+        pass
+
+
+def load_fixtures(path):
+    with gzip.open(path, 'rt') as f:
+        return json.load(f)
+
+
+def save_fixtures(path, fixtures):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt') as f:
+        json.dump(fixtures, f)
+
+
+def synthetic_fixtures(count=20, bars=BARS, seed=42):
+    """Deterministic random-walk candles for count symbols"""
+    rng = random.Random(seed)
+    end = int(time.time() // 86400) * 86400000
+    markets, tickers, ohlcv = {}, {}, {}
+    for i in range(count):
+        base = f"SYN{i:02d}"
+        symbol = f"{base}/USDT"
+        start_price = 10 ** rng.uniform(-2, 4)
+        ohlcv[symbol] = {}
+        for timeframe in TIMEFRAMES:
+            step = TIMEFRAME_MS[timeframe]
+            price = start_price
+            rows = []
+            for n in range(bars):
+                open_ = price
+                close = max(open_ * (1 + rng.gauss(0, 0.01)), 1e-8)
+                high = max(open_, close) * (1 + abs(rng.gauss(0, 0.004)))
+                low = min(open_, close) * (1 - abs(rng.gauss(0, 0.004)))
+                volume = abs(rng.gauss(1e5, 3e4)) * (5 if rng.random() < 0.03 else 1)
+                rows.append([end - (bars - n) * step, open_, high, low, close, volume])
+                price = close
+            ohlcv[symbol][timeframe] = rows
+        last = ohlcv[symbol]["15m"][-1]
+        markets[symbol] = {'symbol': symbol, 'base': base, 'quote': 'USDT', 'active': True,
+                           'precision': {'price': 4, 'amount': 2}, 'limits': {}}
+        tickers[symbol] = {'symbol': symbol, 'last': last[4], 'close': last[4],
+                           'quoteVolume': 5e6 + rng.uniform(0, 5e8), 'timestamp': last[0]}
+    return {'exchange': 'binance', 'synthetic': True, 'recorded_at': None,
+            'markets': markets, 'tickers': tickers, 'ohlcv': ohlcv}
+
+
+async def record_fixtures(path, count, bars):
+    """Record the top USDT pairs by volume from the live exchange"""
+    import ccxt.async_support as ccxt
+    from data.weight_limiter import limit_exchange
+
+    exchange = ccxt.binance()
+    limit_exchange(exchange)
+    try:
+        markets = await exchange.load_markets()
+        tickers = await exchange.fetch_tickers()
+        ranked = sorted((s for s in tickers if s.endswith('/USDT')),
+                        key=lambda s: tickers[s].get('quoteVolume') or 0, reverse=True)[:count]
+        ohlcv = {}
+        for symbol in ranked:
+            ohlcv[symbol] = {tf: await exchange.fetch_ohlcv(symbol, tf, limit=bars)
+                             for tf in TIMEFRAMES}
+            print(f"Recorded {symbol}")
+    finally:
+        await exchange.close()
+
+    keep = ('symbol', 'base', 'quote', 'active', 'precision', 'limits')
+    fixtures = {
+        'exchange': 'binance',
+        'synthetic': False,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'markets': {s: {k: markets[s].get(k) for k in keep} for s in ranked},
+        'tickers': {s: {k: v for k, v in tickers[s].items() if k != 'info'} for s in ranked},
+        'ohlcv': ohlcv
+    }
+    save_fixtures(path, fixtures)
+    print(f"Saved {len(ranked)} symbols to {path}")
+
+
+def summarize(durations):
+    """Latency summary in milliseconds"""
+    if not durations:
+        return {'count': 0}
+    ordered = sorted(durations)
+    count = len(ordered)
+    return {
+        'count': count,
+        'mean_ms': round(sum(ordered) / count * 1000, 3),
+        'p50_ms': round(ordered[count // 2] * 1000, 3),
+        'p95_ms': round(ordered[min(count - 1, int(0.95 * count))] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3)
+    }
+
+
+def frames(fixtures):
+    """OHLCV DataFrames indexed by timestamp, as the analysis builds them"""
+    import pandas as pd
+
+    result = []
+    for symbol, by_timeframe in fixtures['ohlcv'].items():
+        for timeframe, rows in by_timeframe.items():
+            df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
+            result.append((symbol, timeframe, df))
+    return result
+
+
+async def bench_scan(fixtures, args):
+    from core import scanner
+
+    exchange = ReplayExchange(fixtures, args.latency, args.jitter)
+    scanner.EXCHANGE = exchange
+    symbols = list(fixtures['ohlcv'])
+
+    # The first symbol starts the process pool and loads the ML stack; not timed
+    await scanner.process_symbol(symbols[0], NEUTRAL_CONTEXT)
+    timed = symbols[1:]
+
+    durations = []
+    outcomes = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def scan(symbol):
+        async with semaphore:
+            started = time.perf_counter()
+            outcome = await scanner.process_symbol(symbol, NEUTRAL_CONTEXT)
+            durations.append(time.perf_counter() - started)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(scan(symbol) for symbol in timed))
+    elapsed = time.perf_counter() - started
+    return {
+        'timings': {'process_symbol': summarize(durations)},
+        'symbols': len(timed),
+        'seconds': round(elapsed, 3),
+        'symbols_per_second': round(len(timed) / elapsed, 3) if elapsed else None,
+        'outcomes': outcomes,
+        'exchange_calls': exchange.calls
+    }
+
+
+async def bench_predict_signal(fixtures, args):
+    from core.scanner import get_predictor
+
+    predictor = get_predictor()
+    data = frames(fixtures)
+    await predictor.predict_signal(data[0][0], data[0][2], data[0][1], NEUTRAL_CONTEXT)
+
+    durations = []
+    for i in range(args.iterations):
+        symbol, timeframe, df = data[i % len(data)]
+        started = time.perf_counter()
+        await predictor.predict_signal(symbol, df, timeframe, NEUTRAL_CONTEXT)
+        durations.append(time.perf_counter() - started)
+    return {'timings': {'predict_signal': summarize(durations)}}
+
+
+async def bench_patterns(fixtures, args):
+    from core import candle_patterns
+
+    functions = [(name, getattr(candle_patterns, name)) for name in dir(candle_patterns)
+                 if name.startswith('is_') and callable(getattr(candle_patterns, name))]
+    data = frames(fixtures)
+    timings = {}
+    for name, func in functions:
+        durations = []
+        for i in range(args.iterations):
+            df = data[i % len(data)][2]
+            started = time.perf_counter()
+            func(df)
+            durations.append(time.perf_counter() - started)
+        timings[name] = summarize(durations)
+    return {'timings': timings}
+
+
+async def bench_ml_predict(fixtures, args):
+    from model.predictor import compute_indicators
+    from core.ml_prediction import ml_predictor
+
+    data = [(symbol, compute_indicators(df)) for symbol, _, df in frames(fixtures)]
+    durations = []
+    for i in range(args.iterations):
+        symbol, df = data[i % len(data)]
+        started = time.perf_counter()
+        ml_predictor.predict(symbol, df)
+        durations.append(time.perf_counter() - started)
+    return {'timings': {'MLPredictor.predict': summarize(durations)},
+            'model_loaded': ml_predictor.model_loaded}
+
+
+async def bench_persistence(fixtures, args):
+    from core.scanner import _write_signal_csv
+
+    symbols = list(fixtures['ohlcv'])
+    base = int(time.time() * 1000)
+    durations = []
+    for i in range(args.iterations):
+        price = float(fixtures['tickers'][symbols[i % len(symbols)]]['last'] or 1.0)
+        signal = {
+            'symbol': symbols[i % len(symbols)], 'direction': 'LONG', 'timeframe': '1h',
+            'confidence': 82.5, 'entry': price, 'tp1': price * 1.01, 'tp2': price * 1.02,
+            'tp3': price * 1.03, 'sl': price * 0.98, 'timestamp': base + i * 1000
+        }
+        started = time.perf_counter()
+        _write_signal_csv(signal)
+        durations.append(time.perf_counter() - started)
+    return {'timings': {'_write_signal_csv': summarize(durations)}}
+
+
+def run_stage(stage, args):
+    """Run one stage in this process and print its result as JSON"""
+    import logging
+    logging.getLogger("crypto-signal-bot").setLevel(logging.ERROR)
+    from utils.executors import shutdown_executors
+
+    fixtures = load_fixtures(args.fixtures)
+    bench = globals()[f"bench_{stage}"]
+    result = asyncio.run(bench(fixtures, args))
+    shutdown_executors()  # Pool processes must exit to count in RUSAGE_CHILDREN
+
+    # ru_maxrss is in kilobytes on Linux
+    result['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    result['pool_peak_rss_mb'] = round(
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    print(json.dumps(result))
+
+
+def make_sandbox():
+    """
+    Working directory for the stages: config and models are linked from the
+    repo, logs start from a copy so persistence writes never touch real logs
+    """
+    sandbox = tempfile.mkdtemp(prefix="scan-bench-")
+    for name in ("config", "models"):
+        source = os.path.join(parent_dir, name)
+        if os.path.exists(source):
+            os.symlink(source, os.path.join(sandbox, name))
+    os.makedirs(os.path.join(sandbox, "logs"))
+    performance = os.path.join(parent_dir, "logs", "signal_performance.csv")
+    if os.path.exists(performance):
+        shutil.copy(performance, os.path.join(sandbox, "logs"))
+    return sandbox
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=parent_dir,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=parent_dir).returncode
+        return f"{commit}-dirty" if dirty else commit
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(args):
+    fixtures = load_fixtures(args.fixtures)
+    env = dict(os.environ, TELEGRAM_ENABLED="false", TRACE_SAMPLE_RATE="0")
+    results = {
+        'commit': git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'options': {'latency': args.latency, 'jitter': args.jitter,
+                    'concurrency': args.concurrency, 'iterations': args.iterations},
+        'fixtures': {'path': os.path.relpath(args.fixtures, parent_dir),
+                     'symbols': len(fixtures['ohlcv']),
+                     'synthetic': fixtures.get('synthetic', False),
+                     'recorded_at': fixtures.get('recorded_at')},
+        'stages': {}
+    }
+
+    for stage in args.stages:
+        sandbox = make_sandbox()
+        try:
+            print(f"Running {stage}...", flush=True)
+            command = [sys.executable, os.path.abspath(__file__), "--stage", stage,
+                       "--fixtures", os.path.abspath(args.fixtures),
+                       "--latency", str(args.latency), "--jitter", str(args.jitter),
+                       "--concurrency", str(args.concurrency),
+                       "--iterations", str(args.iterations)]
+            completed = subprocess.run(command, cwd=sandbox, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+                print(f"  {stage} failed: {error}")
+                results['stages'][stage] = {'error': error}
+                continue
+            results['stages'][stage] = json.loads(completed.stdout.strip().splitlines()[-1])
+        finally:
+            shutil.rmtree(sandbox, ignore_errors=True)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{results['commit']}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return results, path
+
+
+def print_results(results):
+    for stage, result in results['stages'].items():
+        if 'error' in result:
+            continue
+        extra = ""
+        if 'symbols_per_second' in result:
+            extra = f", {result['symbols_per_second']} symbols/s over {result['symbols']} symbols"
+        print(f"\n{stage}: peak RSS {result['peak_rss_mb']} MB "
+              f"(pool {result['pool_peak_rss_mb']} MB){extra}")
+        for name, timing in result['timings'].items():
+            if not timing.get('count'):
+                continue
+            print(f"  {name:<28}{timing['count']:>6}  mean {timing['mean_ms']:>9.2f} ms  "
+                  f"p50 {timing['p50_ms']:>9.2f}  p95 {timing['p95_ms']:>9.2f}  "
+                  f"max {timing['max_ms']:>9.2f}")
+
+
+def compare(old, new, threshold=0.10):
+    """Print per-stage changes between two result files, flagging regressions"""
+    print(f"\nComparing {old['commit']} -> {new['commit']} (regression threshold {threshold:.0%})")
+    if old.get('options') != new.get('options') or old.get('fixtures') != new.get('fixtures'):
+        print("  Note: options or fixtures differ between the runs")
+
+    def line(label, before, after, higher_is_better=False):
+        if not before or after is None:
+            return
+        change = (after - before) / before
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        print(f"  {label:<44}{before:>11.2f}{after:>11.2f}{change:>+9.1%}{flag}")
+
+    print(f"  {'':<44}{'before':>11}{'after':>11}{'change':>9}")
+    for stage, result in new['stages'].items():
+        before = old['stages'].get(stage)
+        if not before or 'error' in before or 'error' in result:
+            continue
+        for name, timing in result['timings'].items():
+            previous = before['timings'].get(name, {})
+            line(f"{stage}/{name} p50 ms", previous.get('p50_ms'), timing.get('p50_ms'))
+            line(f"{stage}/{name} p95 ms", previous.get('p95_ms'), timing.get('p95_ms'))
+        if 'symbols_per_second' in result:
+            line(f"{stage} symbols/s", before.get('symbols_per_second'),
+                 result['symbols_per_second'], higher_is_better=True)
+        line(f"{stage} peak RSS MB", before.get('peak_rss_mb'), result.get('peak_rss_mb'))
+        line(f"{stage} pool peak RSS MB", before.get('pool_peak_rss_mb'),
+             result.get('pool_peak_rss_mb'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scan benchmark on a replayed exchange")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--record", action="store_true", help="Record fixtures from Binance")
+    parser.add_argument("--symbols", type=int, default=20, help="Symbols to record or generate")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per exchange request")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency, seconds")
+    parser.add_argument("--concurrency", type=int, default=1, help="Symbols scanned at once")
+    parser.add_argument("--iterations", type=int, default=50, help="Calls per micro-benchmark")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="Baseline results to compare this run with, or two result files")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        run_stage(args.stage, args)
+        return
+
+    if args.record:
+        asyncio.run(record_fixtures(args.fixtures, args.symbols, BARS))
+        return
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g:
+            compare(json.load(f), json.load(g), args.threshold)
+        return
+
+    if not os.path.exists(args.fixtures):
+        print(f"No fixtures at {args.fixtures}, generating {args.symbols} synthetic symbols")
+        save_fixtures(args.fixtures, synthetic_fixtures(args.symbols))
+
+    results, path = run_benchmarks(args)
+    print_results(results)
+    print(f"\nSaved results to {path}")
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            compare(json.load(f), results, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
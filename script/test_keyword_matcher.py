@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.keyword_matcher import KeywordMatcher, inflections
+from core.news_planner import term_patterns
+
+
+def make_matcher():
+    return KeywordMatcher({
+        'positive': ['surge', 'gain', 'rally', 'rising'],
+        'negative': ['ban', 'drop', 'crash', 'fall', 'falling']
+    })
+
+
+def test_inflections():
+    """Keywords get their real plural, past and -ing forms"""
+    assert inflections('ban') == ['ban', 'bans', 'banned', 'banning']
+    assert inflections('surge') == ['surge', 'surges', 'surged', 'surging']
+    assert inflections('rally') == ['rally', 'rallies', 'rallied', 'rallying']
+    assert inflections('crash') == ['crash', 'crashes', 'crashed', 'crashing']
+    assert inflections('gain') == ['gain', 'gains', 'gained', 'gaining']
+    assert inflections('rising') == ['rising']
+    assert inflections('fall') == ['fall', 'falls', 'fell', 'fallen', 'falling']
+
+
+def test_no_false_positives():
+    """'band' is not the keyword 'ban', nor 'urban' or 'against'"""
+    matcher = make_matcher()
+    found = matcher.match("The band played in an urban venue against the odds")
+    assert found == {'positive': set(), 'negative': set()}
+
+
+def test_inflected_forms_match():
+    """Doubled consonants and dropped e still map back to the keyword"""
+    matcher = make_matcher()
+    found = matcher.match("Regulators banned trading; prices were dropping after bans")
+    assert found['negative'] == {'ban', 'drop'}
+    found = matcher.match("Token surging as markets rallied, gains everywhere")
+    assert found['positive'] == {'surge', 'rally', 'gain'}
+
+
+def test_listed_form_keeps_its_keyword():
+    """'falling' is counted as itself when it is listed next to 'fall'"""
+    matcher = make_matcher()
+    assert matcher.match("Prices falling")['negative'] == {'falling'}
+    assert matcher.match("Prices fall")['negative'] == {'fall'}
+
+
+def test_count_batch_matches_count():
+    matcher = make_matcher()
+    texts = ["Bitcoin banned", "A band from the city", "Crashes and surges", None]
+    assert matcher.count_batch(texts) == [matcher.count(text) for text in texts]
+
+
+def test_term_patterns():
+    """Search terms match whole words and their inflections only"""
+    patterns = term_patterns('The Sandbox')
+    assert all(p.search("Sandbox launches new land sale") for p in patterns)
+    assert not all(p.search("Sandboxer tools for developers") for p in patterns)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name} passed")
@@ -0,0 +1,85 @@
+import os
+import sys
+import asyncio
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+import core.market_context as market_context_module
+from core.market_context import MarketContextProvider
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = '' if payload else 'Service Unavailable'
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Stands in for the shared HTTP client and counts requests"""
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = 0
+
+    async def get(self, url):
+        self.requests += 1
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def run_with_client(client, provider, calls):
+    original = market_context_module.get_http_client
+    market_context_module.get_http_client = lambda: client
+    try:
+        async def fetch_all():
+            return [await provider.get_fear_greed_index() for _ in range(calls)]
+        return asyncio.run(fetch_all())
+    finally:
+        market_context_module.get_http_client = original
+
+
+def test_outage_backoff_without_cached_value():
+    """A failing endpoint is retried once per error_ttl, not on every call"""
+    for response in (FakeResponse(503), ConnectionError("connection refused")):
+        client = FakeClient(response)
+        provider = MarketContextProvider(error_ttl=300)
+        results = run_with_client(client, provider, calls=5)
+        assert client.requests == 1
+        assert all(result['source'] == 'default' for result in results)
+        # Nothing real was fetched, so nothing is cached for peeking
+        assert provider.peek_fear_greed() is None
+
+
+def test_outage_serves_last_known_value():
+    """After an outage starts the last real index is served until the retry"""
+    payload = {'data': [{'value': '72', 'value_classification': 'Greed',
+                         'timestamp': '1700000000', 'time_until_update': '0'}]}
+    provider = MarketContextProvider(error_ttl=300, grace_period=0)
+    run_with_client(FakeClient(FakeResponse(200, payload)), provider, calls=1)
+
+    provider._expires_at = 0  # The index is due for a refresh
+    client = FakeClient(FakeResponse(503))
+    results = run_with_client(client, provider, calls=5)
+    assert client.requests == 1
+    assert all(result['value'] == 72 for result in results)
+
+
+def test_retries_after_error_ttl():
+    client = FakeClient(FakeResponse(503))
+    provider = MarketContextProvider(error_ttl=0)
+    run_with_client(client, provider, calls=3)
+    assert client.requests == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name} passed")
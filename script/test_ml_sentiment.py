@@ -74,7 +74,7 @@ async def test_functionality():
             df_with_indicators = await predictor.calculate_indicators(df)
 
             # 1. Test sentiment analysis with direction
-            sentiment_data = fetch_sentiment(symbol)
+            sentiment_data = await fetch_sentiment(symbol)
             log.info(
                 f"Sentiment for {symbol}: {sentiment_data['sentiment_type']}, score={sentiment_data.get('score', 0):.2f}")
 
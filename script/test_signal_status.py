@@ -0,0 +1,90 @@
+import os
+import sys
+import asyncio
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+import utils.confidence as confidence
+
+
+def write_performance_file(rows):
+    """Performance file with pending ETH/USDT signals plus the given rows"""
+    os.makedirs("logs", exist_ok=True)
+    base = {'symbol': 'ETH/USDT', 'direction': 'LONG', 'timeframe': '1h', 'confidence': 80,
+            'success': '', 'entry': 100.0, 'exit_price': 0, 'tp1': 105.0, 'tp2': 110.0,
+            'tp3': 115.0, 'sl': 95.0, 'status': 'pending', 'profit_loss': 0,
+            'hit_time': '', 'duration_minutes': 0}
+    records = [{**base, **row} for row in rows]
+    pd.DataFrame(records).to_csv("logs/signal_performance.csv", index=False)
+
+
+class in_temp_dir:
+    """Run with a fresh working directory and no confidence manager yet"""
+
+    def __enter__(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        confidence._confidence_manager = None
+
+    def __exit__(self, *exc):
+        confidence._confidence_manager = None
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+
+def test_performance_tracker_updates_success_rate():
+    """PerformanceTracker.update_signal_status moves the manager's aggregates"""
+    with in_temp_dir():
+        write_performance_file([
+            {'timestamp': '2026-01-01 00:00:00', 'success': 'YES', 'status': 'tp1'},
+            {'timestamp': '2026-01-01 01:00:00'},
+            {'timestamp': '2026-01-01 02:00:00'},
+        ])
+        from utils.performance_tracker import PerformanceTracker
+        tracker = PerformanceTracker()
+        manager = confidence.get_confidence_manager()
+        assert tracker.confidence_manager is manager
+        assert manager.get_success_rate('ETH/USDT', 'LONG', '1h') == (1, 1.0)
+
+        tracker.update_signal_status('ETH/USDT', '2026-01-01 01:00:00', 'sl', success='NO')
+        assert manager.get_success_rate('ETH/USDT', 'LONG', '1h') == (2, 0.5)
+
+        # A corrected outcome replaces the previous one instead of adding to it
+        tracker.update_signal_status('ETH/USDT', '2026-01-01 01:00:00', 'tp1', success='YES')
+        assert manager.get_success_rate('ETH/USDT', 'LONG', '1h') == (2, 1.0)
+
+
+def test_status_updater_updates_success_rate():
+    """SignalStatusUpdater resolves pending signals into the manager's aggregates"""
+    with in_temp_dir():
+        write_performance_file([
+            {'timestamp': '2026-01-01 00:00:00'},
+            {'timestamp': '2026-01-01 01:00:00'},
+        ])
+        import script.update_signal_status as updater_module
+
+        async def fake_ticker(exchange, symbol):
+            return {'last': 90.0}  # Below the stop loss
+
+        original = updater_module.fetch_ticker
+        updater_module.fetch_ticker = fake_ticker
+        try:
+            updater = updater_module.SignalStatusUpdater(exchange=object())
+            assert asyncio.run(updater.update_signal_statuses())
+        finally:
+            updater_module.fetch_ticker = original
+
+        manager = confidence.get_confidence_manager()
+        assert manager.get_success_rate('ETH/USDT', 'LONG', '1h') == (2, 0.0)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name} passed")
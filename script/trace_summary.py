@@ -0,0 +1,122 @@
+"""
+Summarize scan traces written by utils/tracing.py.
+
+Reads every JSONL trace file and prints, per scan cycle, the stages with the
+most time spent and the slowest symbols with their slowest stage. Run from
+the repo root:
+
+    python script/trace_summary.py
+    python script/trace_summary.py --cycles 3 --top 15
+    python script/trace_summary.py --cycle 995792 --dir logs/traces
+"""
+import os
+import sys
+import glob
+import json
+import argparse
+from collections import defaultdict
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from utils.tracing import TRACE_DIR
+
+
+def load_traces(trace_dir):
+    """
+    Read all spans and group them by trace
+
+    Returns:
+        dict: trace id -> list of span records
+    """
+    traces = defaultdict(list)
+    paths = sorted(glob.glob(os.path.join(trace_dir, "*.jsonl*")))
+    for path in paths:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partially written line
+                traces[record['trace']].append(record)
+    return traces
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize_cycle(cycle, roots, spans_by_trace, top):
+    total_seconds = sum(r['duration_ms'] for r in roots) / 1000
+    print(f"\nCycle {cycle}: {len(roots)} sampled symbols, {total_seconds:.1f}s traced")
+
+    # Stages by total time; a span's self time excludes its children
+    child_time = defaultdict(float)
+    for spans in spans_by_trace.values():
+        for span in spans:
+            if span['parent']:
+                child_time[(span['trace'], span['parent'])] += span['duration_ms']
+
+    stages = defaultdict(list)
+    self_time = defaultdict(float)
+    for root in roots:
+        for span in spans_by_trace[root['trace']]:
+            if span['parent'] is None:
+                continue
+            stages[span['name']].append(span['duration_ms'])
+            self_time[span['name']] += max(
+                0.0, span['duration_ms'] - child_time[(span['trace'], span['span'])])
+
+    print(f"\n  {'stage':<26}{'count':>7}{'total s':>10}{'self s':>9}"
+          f"{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    ranked = sorted(stages.items(), key=lambda item: sum(item[1]), reverse=True)
+    for name, durations in ranked[:top]:
+        print(f"  {name:<26}{len(durations):>7}{sum(durations) / 1000:>10.2f}"
+              f"{self_time[name] / 1000:>9.2f}{sum(durations) / len(durations):>10.1f}"
+              f"{percentile(durations, 0.95):>10.1f}{max(durations):>10.1f}")
+
+    print(f"\n  {'symbol':<18}{'seconds':>9}  {'outcome':<10} slowest stage")
+    for root in sorted(roots, key=lambda r: r['duration_ms'], reverse=True)[:top]:
+        children = [s for s in spans_by_trace[root['trace']] if s['parent'] == root['span']]
+        slowest = max(children, key=lambda s: s['duration_ms'], default=None)
+        detail = ""
+        if slowest:
+            timeframe = slowest['attrs'].get('timeframe')
+            detail = f"{slowest['name']}{f' {timeframe}' if timeframe else ''} " \
+                     f"({slowest['duration_ms'] / 1000:.2f}s)"
+        print(f"  {root['attrs'].get('symbol', '?'):<18}{root['duration_ms'] / 1000:>9.2f}  "
+              f"{str(root['attrs'].get('outcome', '')):<10} {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize scan traces per cycle")
+    parser.add_argument("--dir", default=TRACE_DIR)
+    parser.add_argument("--cycle", type=int, help="Only this cycle")
+    parser.add_argument("--cycles", type=int, default=1, help="Number of latest cycles")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    spans_by_trace = load_traces(args.dir)
+    by_cycle = defaultdict(list)
+    for spans in spans_by_trace.values():
+        for span in spans:
+            if span['parent'] is None and span['name'] == 'scan_symbol':
+                by_cycle[span['attrs'].get('cycle')].append(span)
+
+    if not by_cycle:
+        print(f"No scan traces found in {args.dir}")
+        return
+
+    cycles = [args.cycle] if args.cycle is not None else \
+        sorted(c for c in by_cycle if c is not None)[-args.cycles:]
+    for cycle in cycles:
+        if cycle not in by_cycle:
+            print(f"\nCycle {cycle}: no traces")
+            continue
+        summarize_cycle(cycle, by_cycle[cycle], spans_by_trace, args.top)
+
+
+if __name__ == "__main__":
+    main()
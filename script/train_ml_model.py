@@ -15,6 +15,7 @@ from core.candle_patterns import (
     is_hammer, is_shooting_star, is_three_white_soldiers,
     is_three_black_crows
 )
+from data.weight_limiter import limit_exchange
 
 # Configure logging
 logging.basicConfig(
@@ -36,9 +37,8 @@ def fetch_training_data(symbols=['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'DOGE/USDT'
                         timeframe='1h', limit=500):
     """Fetch historical data for training"""
     try:
-        exchange = ccxt.binance({
-            'enableRateLimit': True
-        })
+        exchange = ccxt.binance()
+        limit_exchange(exchange)
 
         datasets = []
 
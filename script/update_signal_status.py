@@ -1,10 +1,18 @@
 import os
 import sys
+import asyncio
 import pandas as pd
-import ccxt
 import logging
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.exchange_pool import get_exchange, close_exchanges
+from data.request_coalescer import fetch_ticker
+from utils.executors import run_io
+from utils.confidence import get_confidence_manager
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,24 +24,30 @@ logger = logging.getLogger()
 
 
 class SignalStatusUpdater:
-    def __init__(self):
-        self.exchange = ccxt.binance({
-            'enableRateLimit': True
-        })
+    def __init__(self, exchange=None):
+        # Pooled async client, fetched lazily when none is passed in
+        self.exchange = exchange
         self.performance_file = "logs/signal_performance.csv"
 
-    def update_signal_statuses(self):
+    async def update_signal_statuses(self):
         """Update all pending signals with current market prices"""
         logger.info("Starting signal status update...")
 
+        if self.exchange is None:
+            self.exchange = await get_exchange()
+
         if not os.path.exists(self.performance_file):
             logger.error(
                 f"Performance file not found: {self.performance_file}")
             return False
 
         try:
+            # Success rates of this process, kept in step with status updates;
+            # created once the performance file exists, since it loads it
+            confidence_manager = get_confidence_manager()
+
             # Load performance data
-            perf_df = pd.read_csv(self.performance_file)
+            perf_df = await run_io(pd.read_csv, self.performance_file)
 
             # Get pending signals
             pending_signals = perf_df[perf_df['status'] == 'pending']
@@ -57,7 +71,7 @@ class SignalStatusUpdater:
 
                 try:
                     # Get current price
-                    ticker = self.exchange.fetch_ticker(symbol)
+                    ticker = await fetch_ticker(self.exchange, symbol)
                     current_price = ticker['last']
                     logger.info(
                         f"Checking {symbol} {direction}: Entry={entry}, Current={current_price}")
@@ -136,6 +150,8 @@ class SignalStatusUpdater:
                         perf_df.at[idx, 'exit_price'] = exit_price
                         perf_df.at[idx, 'profit_loss'] = round(profit_loss, 2)
                         perf_df.at[idx, 'success'] = success
+                        confidence_manager.record_status_update(
+                            signal, success, previous=signal['success'])
                         perf_df.at[idx, 'hit_time'] = hit_time
                         perf_df.at[idx, 'duration_minutes'] = duration_minutes
 
@@ -148,7 +164,7 @@ class SignalStatusUpdater:
 
             # Save updated performance data
             if updates > 0:
-                perf_df.to_csv(self.performance_file, index=False)
+                await run_io(perf_df.to_csv, self.performance_file, index=False)
                 logger.info(f"Updated {updates} signals in performance file")
 
             return True
@@ -158,6 +174,13 @@ class SignalStatusUpdater:
             return False
 
 
-if __name__ == "__main__":
+async def main():
     updater = SignalStatusUpdater()
-    updater.update_signal_statuses()
+    try:
+        await updater.update_signal_statuses()
+    finally:
+        await close_exchanges()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
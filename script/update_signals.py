@@ -2,14 +2,15 @@ from utils.logger import log
 import os
 import sys
 import pandas as pd
-import ccxt
 import asyncio
 from datetime import datetime
-import time
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from data.exchange_pool import get_exchange, close_exchanges
+from data.request_coalescer import fetch_ticker
+
 
 async def update_pending_signals():
     """Update status of pending signals based on current prices"""
@@ -21,16 +22,9 @@ async def update_pending_signals():
         log("Performance file not found", level='ERROR')
         return
 
-    # Initialize exchange - using non-async version to avoid errors
+    # Initialize exchange from the shared pool
     try:
-        # Create a regular (non-async) ccxt instance
-        exchange = ccxt.binance({
-            'enableRateLimit': True,
-            'options': {
-                'defaultType': 'spot'
-            }
-        })
-        exchange.load_markets()
+        exchange = await get_exchange(options={'defaultType': 'spot'})
         log("Connected to exchange", level='INFO')
     except Exception as e:
         log(f"Failed to connect to exchange: {e}", level='ERROR')
@@ -94,7 +88,7 @@ async def update_pending_signals():
 
             # Get current price
             try:
-                ticker = exchange.fetch_ticker(symbol)
+                ticker = await fetch_ticker(exchange, symbol)
                 current_price = ticker['last']
 
                 # Check if TP or SL was hit
@@ -166,9 +160,6 @@ async def update_pending_signals():
                     log(f"Updated {symbol} signal to {status}, profit/loss: {profit_loss:.2f}%")
                     processed_count += 1
 
-                # Rate limit compliance
-                time.sleep(0.2)
-
             except Exception as e:
                 log(f"Error processing {symbol}: {e}", level='ERROR')
 
@@ -235,6 +226,13 @@ async def update_signals_log(perf_df):
         except Exception as e:
             log(f"Error updating {log_file}: {e}", level='ERROR')
 
+
+async def main():
+    try:
+        await update_pending_signals()
+    finally:
+        await close_exchanges()
+
 # Run the async function
 if __name__ == "__main__":
-    asyncio.run(update_pending_signals())
+    asyncio.run(main())
@@ -1,9 +1,9 @@
 import os
 import asyncio
 import httpx
-import json
 import logging
 from dotenv import load_dotenv
+from utils.config import get_config
 
 # Load environment variables
 load_dotenv('.env')
@@ -17,20 +17,6 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 TELEGRAM_ENABLED = os.getenv("TELEGRAM_ENABLED", "true").lower() == "true"
 
-# Load confidence threshold from config
-try:
-    config_path = os.path.join('config', 'confidence_config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            CONFIDENCE_CONFIG = json.load(f)
-        MINIMUM_TELEGRAM_CONFIDENCE = CONFIDENCE_CONFIG.get(
-            'telegram_minimum', 95.0)
-    else:
-        MINIMUM_TELEGRAM_CONFIDENCE = 95.0
-except Exception as e:
-    logger.error(f"Error loading confidence config: {str(e)}")
-    MINIMUM_TELEGRAM_CONFIDENCE = 95.0
-
 
 async def send_telegram_signal(symbol, signal):
     """Send signal to Telegram chat"""
@@ -45,9 +31,10 @@ async def send_telegram_signal(symbol, signal):
     try:
         # Check if signal meets minimum confidence threshold
         confidence = signal.get('confidence', 0)
-        if confidence < MINIMUM_TELEGRAM_CONFIDENCE:
+        minimum_confidence = get_config().telegram_minimum
+        if confidence < minimum_confidence:
             logger.info(
-                f"[{symbol}] Signal has {confidence:.2f}% confidence, below threshold of {MINIMUM_TELEGRAM_CONFIDENCE:.2f}%")
+                f"[{symbol}] Signal has {confidence:.2f}% confidence, below threshold of {minimum_confidence:.2f}%")
             return False
 
         # Ensure required fields exist
@@ -2,9 +2,28 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import os
+import time
 from datetime import datetime
-import json
 from utils.logger import logger
+from utils.config import config_service, get_config
+
+MIN_HISTORY = 3  # Resolved signals needed before history adjusts confidence
+MAX_PERFORMANCE_RECORDS = 1000
+PERFORMANCE_REFRESH_SECONDS = 30  # How often to look for changes by other processes
+
+
+def _outcome(value) -> Optional[int]:
+    """1 for a successful signal, 0 for a failed one, None while it is unresolved"""
+    if isinstance(value, str):
+        value = value.strip().upper()
+        if value in ('YES', 'TRUE', '1', '1.0'):
+            return 1
+        if value in ('NO', 'FALSE', '0', '0.0'):
+            return 0
+        return None
+    if value is None or pd.isna(value):
+        return None
+    return 1 if value else 0
 
 
 class ConfidenceManager:
@@ -44,13 +63,24 @@ class ConfidenceManager:
             '1d': 1.2
         }
 
-        # Performance tracking
+        # Performance tracking: (symbol, direction, timeframe) -> [resolved, successes],
+        # loaded once and then kept up to date in memory
         self.performance_file = "logs/signal_performance.csv"
+        self.performance_stats: Dict[Tuple[str, str, str], List[int]] = {}
+        self._performance_rows = 0
+        self._performance_signature = None
+        self._performance_checked = 0.0
         self._ensure_performance_file()
+        self._load_performance_stats()
 
-        # Configuration paths
-        self.config_path = "config/confidence_config.json"
+        # Overrides come from the shared config service and follow its reloads
+        self._default_weights = {
+            'indicator_weights': dict(self.indicator_weights),
+            'market_adjustments': dict(self.market_adjustments),
+            'timeframe_weights': dict(self.timeframe_weights)
+        }
         self._load_config()
+        config_service.subscribe(self._load_config)
 
         logger.info("Confidence Manager initialized")
 
@@ -64,21 +94,77 @@ class ConfidenceManager:
             ])
             df.to_csv(self.performance_file, index=False)
 
-    def _load_config(self):
-        """Load configuration if available"""
+    def _file_signature(self):
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-
-                if 'indicator_weights' in config:
-                    self.indicator_weights.update(config['indicator_weights'])
-                if 'market_adjustments' in config:
-                    self.market_adjustments.update(
-                        config['market_adjustments'])
-                if 'timeframe_weights' in config:
-                    self.timeframe_weights.update(config['timeframe_weights'])
+            stat = os.stat(self.performance_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
 
+    def _load_performance_stats(self, df: pd.DataFrame = None):
+        """Rebuild the success aggregates from the performance file (or a frame of it)"""
+        try:
+            signature = self._file_signature()
+            if df is None:
+                df = pd.read_csv(self.performance_file) if signature else pd.DataFrame()
+
+            stats = {}
+            if not df.empty and 'success' in df.columns:
+                outcomes = df['success'].map(_outcome)
+                resolved = df[outcomes.notna()].assign(success=outcomes.dropna().astype(int))
+                grouped = resolved.groupby(['symbol', 'direction', 'timeframe'])['success']
+                for key, (count, successes) in grouped.agg(['count', 'sum']).iterrows():
+                    stats[key] = [int(count), int(successes)]
+
+            self.performance_stats = stats
+            self._performance_rows = len(df)
+            self._performance_signature = signature
+            self._performance_checked = time.monotonic()
+            logger.debug(f"Loaded performance history for {len(stats)} symbol/direction/timeframe keys")
+        except Exception as e:
+            logger.error(f"Error loading performance history: {str(e)}")
+
+    def _refresh_performance_stats(self):
+        """Reload the aggregates if another process rewrote the file (checked now and then)"""
+        now = time.monotonic()
+        if now - self._performance_checked < PERFORMANCE_REFRESH_SECONDS:
+            return
+        self._performance_checked = now
+        if self._file_signature() != self._performance_signature:
+            self._load_performance_stats()
+
+    def _add_outcome(self, key: Tuple[str, str, str], outcome: Optional[int], sign: int = 1):
+        if outcome is None:
+            return
+        counts = self.performance_stats.setdefault(key, [0, 0])
+        counts[0] += sign
+        counts[1] += sign * outcome
+        if counts[0] <= 0:
+            del self.performance_stats[key]
+
+    def get_success_rate(self, symbol: str, direction: str, timeframe: str) -> Tuple[int, Optional[float]]:
+        """
+        Historical success of signals like this one
+
+        Returns:
+            tuple: (number of resolved signals, success rate or None if there are none)
+        """
+        self._refresh_performance_stats()
+        counts = self.performance_stats.get((symbol, direction, timeframe))
+        if not counts:
+            return 0, None
+        return counts[0], counts[1] / counts[0]
+
+    def _load_config(self, snapshot=None):
+        """Apply weight overrides from the config snapshot (on start and on every reload)"""
+        try:
+            config = (snapshot or get_config()).raw
+            for name in ('indicator_weights', 'market_adjustments', 'timeframe_weights'):
+                weights = dict(self._default_weights[name])
+                weights.update(config.get(name, {}))
+                setattr(self, name, weights)
+
+            if any(name in config for name in self._default_weights):
                 logger.info("Loaded custom confidence configuration")
         except Exception as e:
             logger.warning(f"Could not load confidence config: {str(e)}")
@@ -214,19 +300,9 @@ class ConfidenceManager:
     def apply_historical_adjustment(self, confidence: float, symbol: str, direction: str, timeframe: str) -> float:
         """Adjust confidence based on historical performance"""
         try:
-            if not os.path.exists(self.performance_file):
-                return confidence
-
-            df = pd.read_csv(self.performance_file)
-
-            # Filter relevant historical data
-            filtered = df[(df['symbol'] == symbol) &
-                          (df['direction'] == direction) &
-                          (df['timeframe'] == timeframe)]
-
-            if len(filtered) >= 3:  # Need minimum data points
-                success_rate = filtered['success'].mean()
+            resolved, success_rate = self.get_success_rate(symbol, direction, timeframe)
 
+            if resolved >= MIN_HISTORY:  # Need minimum data points
                 if success_rate > 0.7:  # Good historical performance
                     adjustment = 1.15  # Boost confidence
                     logger.debug(
@@ -265,22 +341,39 @@ class ConfidenceManager:
                 index=False
             )
 
+            self._add_outcome(
+                (signal['symbol'], signal['direction'], signal['timeframe']), new_record['success'])
+            self._performance_rows += 1
+            self._performance_signature = self._file_signature()
+
             logger.info(
                 f"Recorded signal result for {signal['symbol']}: success={success}")
 
-            # Periodically clean up old records (keep last 1000)
-            if os.path.exists(self.performance_file):
+            # Clean up old records (keep the last MAX_PERFORMANCE_RECORDS)
+            if self._performance_rows > MAX_PERFORMANCE_RECORDS:
                 try:
-                    df = pd.read_csv(self.performance_file)
-                    if len(df) > 1000:
-                        df = df.tail(1000)
-                        df.to_csv(self.performance_file, index=False)
-                except:
-                    pass
+                    df = pd.read_csv(self.performance_file).tail(MAX_PERFORMANCE_RECORDS)
+                    df.to_csv(self.performance_file, index=False)
+                    self._load_performance_stats(df)
+                except Exception as e:
+                    logger.warning(f"Could not trim performance file: {str(e)}")
 
         except Exception as e:
             logger.error(f"Error recording signal result: {str(e)}")
 
+    def record_status_update(self, signal: Dict, success, previous=None) -> None:
+        """
+        Apply a status change of a tracked signal to the aggregates
+
+        Args:
+            signal: Signal with symbol, direction and timeframe
+            success: New outcome ('YES'/'NO', bool or blank while pending)
+            previous: Outcome the signal had before the update, if any
+        """
+        key = (signal['symbol'], signal['direction'], signal['timeframe'])
+        self._add_outcome(key, _outcome(previous), sign=-1)
+        self._add_outcome(key, _outcome(success))
+
     def get_dynamic_threshold(self, symbol: str, timeframe: str) -> float:
         """Get dynamic confidence threshold based on market conditions and timeframe"""
         base_threshold = 70.0
@@ -295,3 +388,15 @@ class ConfidenceManager:
         # This would require additional volatility classification logic
 
         return base_threshold
+
+
+# Confidence manager, created on first use (it loads the performance file)
+_confidence_manager = None
+
+
+def get_confidence_manager() -> ConfidenceManager:
+    """Get this process's confidence manager, creating it on first use"""
+    global _confidence_manager
+    if _confidence_manager is None:
+        _confidence_manager = ConfidenceManager()
+    return _confidence_manager
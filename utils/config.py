@@ -1,9 +1,18 @@
 import os
+import json
+import time
+import logging
+import threading
+from types import MappingProxyType
+from typing import Callable, List, Mapping, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from config.env
 load_dotenv('config.env')
 
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
 
 def get_telegram_config():
     """Get Telegram bot configuration from environment variables"""
@@ -15,3 +24,192 @@ def get_telegram_config():
             "TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID must be set in config.env")
 
     return bot_token, chat_id
+
+
+CONFIG_PATH = os.getenv('CONFIDENCE_CONFIG_PATH', os.path.join('config', 'confidence_config.json'))
+WATCH_INTERVAL = float(os.getenv('CONFIG_WATCH_INTERVAL', 5))
+VALID_TIMEFRAMES = ('1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w')
+
+
+class ConfigSnapshot(NamedTuple):
+    """One immutable, validated version of the configuration"""
+    telegram_minimum: float = 95.0
+    base_minimum: float = 60.0
+    timeframe_agreement: int = 2
+    confidence_levels: Mapping = MappingProxyType({})
+    # Scanner settings, from the file's "scanner" section
+    symbol_limit: int = 150
+    min_volume: float = 3000000
+    confidence_threshold: float = 70.0
+    cooldown_period: int = 21600
+    timeframes: Tuple[str, ...] = ("15m", "1h", "4h", "1d")
+    raw: Mapping = MappingProxyType({})  # The whole file, read-only
+    version: int = 0
+    mtime: Optional[float] = None
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _number(data: dict, key: str, default, low, high, cast=float):
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{key} must be a number, got {value!r}")
+    if not low <= value <= high:
+        raise ValueError(f"{key} must be between {low} and {high}, got {value}")
+    return cast(value)
+
+
+def parse_config(data: dict, version: int = 0, mtime: float = None) -> ConfigSnapshot:
+    """
+    Validate a parsed config file and build a snapshot from it
+
+    Raises:
+        ValueError: If a setting has the wrong type or is out of range
+    """
+    if not isinstance(data, dict):
+        raise ValueError("config must be a JSON object")
+    defaults = ConfigSnapshot()
+    scanner = data.get('scanner', {})
+    if not isinstance(scanner, dict):
+        raise ValueError("scanner must be an object")
+
+    levels = data.get('confidence_levels', {})
+    if not isinstance(levels, dict):
+        raise ValueError("confidence_levels must be an object")
+    for name in levels:
+        _number(levels, name, 0, 0, 100)
+
+    timeframes = scanner.get('timeframes', list(defaults.timeframes))
+    if not isinstance(timeframes, list) or not timeframes or \
+            any(tf not in VALID_TIMEFRAMES for tf in timeframes):
+        raise ValueError(f"scanner.timeframes must be a non-empty list of {VALID_TIMEFRAMES}")
+
+    return ConfigSnapshot(
+        telegram_minimum=_number(data, 'telegram_minimum', defaults.telegram_minimum, 0, 100),
+        base_minimum=_number(data, 'base_minimum', defaults.base_minimum, 0, 100),
+        timeframe_agreement=_number(data, 'timeframe_agreement', defaults.timeframe_agreement,
+                                    1, len(timeframes), int),
+        confidence_levels=_freeze(levels),
+        symbol_limit=_number(scanner, 'symbol_limit', defaults.symbol_limit, 1, 5000, int),
+        min_volume=_number(scanner, 'min_volume', defaults.min_volume, 0, 1e12),
+        confidence_threshold=_number(scanner, 'confidence_threshold',
+                                     defaults.confidence_threshold, 0, 100),
+        cooldown_period=_number(scanner, 'cooldown_period', defaults.cooldown_period,
+                                0, 30 * 86400, int),
+        timeframes=tuple(timeframes),
+        raw=_freeze(data),
+        version=version,
+        mtime=mtime
+    )
+
+
+class ConfigService:
+    """
+    Loads config/confidence_config.json once and reloads it when its mtime
+    changes. A daemon thread polls the file; readers get the current
+    snapshot without touching the disk. A file that fails to parse or
+    validate is logged and the previous snapshot stays in force.
+    """
+
+    def __init__(self, path=CONFIG_PATH, interval=WATCH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[ConfigSnapshot], None]] = []
+        self._thread = None
+        self.reloads = 0
+        self.errors = 0
+
+    def get(self) -> ConfigSnapshot:
+        """The current snapshot; the first call loads the file and starts watching"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._start()
+        return snapshot
+
+    def _start(self) -> ConfigSnapshot:
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = ConfigSnapshot()
+                self.reload()
+                if self.interval > 0:
+                    self._thread = threading.Thread(
+                        target=self._watch, name='config-watcher', daemon=True)
+                    self._thread.start()
+        return self._snapshot
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the file if it changed since the last load
+
+        Returns:
+            bool: True if a new snapshot was published
+        """
+        mtime = self._mtime()
+        current = self._snapshot or ConfigSnapshot()
+        if mtime is None or (mtime == current.mtime and not force):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            snapshot = parse_config(data, current.version + 1, mtime)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Invalid config in {self.path}, keeping version {current.version}: {str(e)}")
+            # Remember the mtime so a broken file is not re-read every poll
+            self._snapshot = current._replace(mtime=mtime)
+            return False
+
+        self._snapshot = snapshot
+        self.reloads += 1
+        if current.version:
+            logger.info(f"Reloaded config from {self.path} (version {snapshot.version})")
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Error in config subscriber: {str(e)}")
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Error watching config: {str(e)}")
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]):
+        """Call callback with every newly published snapshot"""
+        self._subscribers.append(callback)
+
+    def stats(self) -> dict:
+        snapshot = self.get()
+        return {
+            'path': self.path,
+            'version': snapshot.version,
+            'reloads': self.reloads,
+            'errors': self.errors
+        }
+
+
+# Create a global instance; each process watches the file on its own
+config_service = ConfigService()
+
+
+def get_config() -> ConfigSnapshot:
+    """Wrapper for the service's get method"""
+    return config_service.get()
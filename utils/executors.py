@@ -0,0 +1,161 @@
+import os
+import time
+import asyncio
+import logging
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+# Worker counts, overridable from the environment
+CPU_WORKERS = int(os.getenv('CPU_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+IO_WORKERS = int(os.getenv('IO_WORKERS', 8))
+
+_process_pool = None
+_thread_pool = None
+_pool_lock = threading.Lock()  # Guards creating and replacing the process pool
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for CPU-bound work, creating it on first use"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = _start_process_pool()
+        return _process_pool
+
+
+def _start_process_pool() -> ProcessPoolExecutor:
+    from utils.logger import attach_to_queue, get_log_queue, process_label
+
+    # Pool processes log through this process's shared log queue, if any
+    log_queue = get_log_queue()
+    logging_args = {}
+    if log_queue is not None:
+        logging_args = {'initializer': attach_to_queue,
+                        'initargs': (log_queue, f"{process_label() or 'scanner'}-pool")}
+    # Spawn rather than fork: the parent runs an event loop and threads
+    pool = ProcessPoolExecutor(
+        max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+        **logging_args)
+    logger.info(f"Started process pool with {CPU_WORKERS} workers")
+    return pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool for blocking I/O, creating it on first use"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=IO_WORKERS, thread_name_prefix='io')
+    return _thread_pool
+
+
+async def run_cpu(func, *args, **kwargs):
+    """
+    Run a CPU-bound function in the process pool
+
+    The function and its arguments must be picklable (module-level functions,
+    DataFrames, dicts). Falls back to a thread if the pool has broken.
+    """
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        logger.error("Process pool broke, restarting it and running this call in a thread")
+        with _pool_lock:
+            # Another caller may already have replaced the pool that ran this call
+            replaced = _process_pool is pool
+            if replaced:
+                _process_pool = None
+        if replaced:
+            # Stop its management thread and reap surviving children
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(get_thread_pool(), call)
+
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking I/O function (file access, sync clients) in the thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_thread_pool(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Stop both pools, waiting for running work to finish"""
+    global _process_pool, _thread_pool
+    with _pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=True, cancel_futures=True)
+        _thread_pool = None
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a short sleep.
+    Any lag above a few milliseconds is time the loop spent blocked, during
+    which no API request or other task could run.
+    """
+
+    def __init__(self, interval=0.5, warn_threshold=1.0):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.stalls = 0  # Samples above warn_threshold
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.samples += 1
+            self.total_lag += lag
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.warn_threshold:
+                self.stalls += 1
+                logger.warning(f"Event loop blocked for {lag:.2f}s")
+
+    def reset(self):
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.stalls = 0
+
+    def stats(self) -> Dict:
+        return {
+            'samples': self.samples,
+            'avg_lag_ms': round(self.total_lag / self.samples * 1000, 2) if self.samples else 0.0,
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'stalls': self.stalls
+        }
+
+
+# Create a global instance for the API process
+loop_monitor = LoopLagMonitor()
@@ -1,14 +1,18 @@
 # utils/helpers.py
-import ccxt.async_support as ccxt
+import time
 import asyncio
 
 
 async def get_symbol_precision(symbol: str) -> int:
+    # Imported here: the candle cache imports this module and must stay light
+    from data.market_cache import market_cache
+    from data.exchange_pool import get_exchange
+
     try:
-        exchange = ccxt.binance()
-        await exchange.load_markets()
-        market = exchange.markets[symbol]
-        return market['precision']['price']
+        # Markets are loaded once per process, after that this is a dict lookup
+        if not market_cache.markets_loaded:
+            await market_cache.load_markets(await get_exchange())
+        return market_cache.get_precision(symbol)
     except Exception:
         return 3
 
@@ -20,3 +24,23 @@ def round_price(value: float, precision: int = 3) -> float:
 async def format_price(value: float, symbol: str) -> str:
     precision = await get_symbol_precision(symbol)
     return f"{value:.{precision}f}"
+
+
+TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000}
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """Convert a ccxt timeframe string like '15m' or '4h' to seconds"""
+    amount, unit = int(timeframe[:-1]), timeframe[-1]
+    if unit not in TIMEFRAME_UNITS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return amount * TIMEFRAME_UNITS[unit]
+
+
+def next_candle_close(timeframe: str, now: float = None) -> float:
+    """Get the UNIX time at which the current candle of a timeframe closes"""
+    now = time.time() if now is None else now
+    period = timeframe_to_seconds(timeframe)
+    # Weekly candles open on Monday, the UNIX epoch fell on a Thursday
+    offset = 4 * 86400 if timeframe.endswith('w') else 0
+    return ((now - offset) // period + 1) * period + offset
@@ -0,0 +1,28 @@
+import logging
+import httpx
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+# Shared timeouts: fail fast on connect, allow slow news APIs a bit longer to answer
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide async HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+    return _client
+
+
+async def close_http_client():
+    """Close the shared HTTP client if it was ever created"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("HTTPX client closed successfully")
+    _client = None
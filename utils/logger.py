@@ -1,15 +1,26 @@
 # utils/logger.py
 import os
+import copy
+import json
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
-import pandas as pd
-import pytz
 import shutil
-from utils.performance_tracker import PerformanceTracker
 
-# Initialize the performance tracker
-performance_tracker = PerformanceTracker()
+# Performance tracker, created on first logged signal (it loads CSV files)
+_performance_tracker = None
+
+
+def get_performance_tracker():
+    """Get the shared performance tracker, creating it on first use"""
+    global _performance_tracker
+    if _performance_tracker is None:
+        from utils.performance_tracker import PerformanceTracker
+        _performance_tracker = PerformanceTracker()
+    return _performance_tracker
 
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -19,21 +30,204 @@ log_formatter = logging.Formatter(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
-log_file = os.path.join(LOG_DIR, "bot.log")
-file_handler = RotatingFileHandler(
-    log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.INFO)
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'process_label'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed with extra={...} are kept"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': getattr(record, 'process_label', record.processName),
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _ProcessLabel(logging.Filter):
+    def __init__(self, label):
+        super().__init__()
+        self.label = label
+
+    def filter(self, record):
+        record.process_label = self.label
+        return True
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a queue inside this process: the message is merged
+    from its arguments right away, since they may change before the writer
+    thread gets to the record; the rest is formatted by the writer
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _SharedQueueHandler(_LocalQueueHandler):
+    """
+    Queue handler for a multiprocessing queue: the traceback is formatted
+    here as well, since it does not pickle
+    """
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if record.exc_info:
+            record.exc_text = log_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+_queue = None  # Queue the writer thread drains
+_shared = False  # Whether _queue is a multiprocessing queue other processes can join
+_label = None  # This process's label in records
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _install(handler, configure_root):
+    for target in ([logger, logging.getLogger()] if configure_root else [logger]):
+        for old in list(target.handlers):
+            target.removeHandler(old)
+        target.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if configure_root:
+        logging.getLogger().setLevel(logging.INFO)
+
+
+def setup_logging(process_name: str = None, log_file: str = "bot.log", shared: bool = False,
+                  configure_root: bool = True):
+    """
+    Log through a queue to one writer thread
 
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(log_formatter)
-console_handler.setLevel(logging.INFO)
+    Callers only enqueue the record; the writer thread formats it and writes
+    JSON lines to logs/<log_file> (rotated at 5MB) and text to the console.
+    Safe to call again, e.g. to switch to a shared queue.
+
+    Args:
+        process_name (str): Label of this process in every record
+        log_file (str): File name under logs/, or None to log to the console only
+        shared (bool): Use a multiprocessing queue that child processes can
+            write to with attach_to_queue(); see get_log_queue()
+        configure_root (bool): Also route the root logger (libraries, uvicorn)
+
+    Returns:
+        The queue records are written from
+    """
+    global _listener, _queue, _shared, _label
+    _stop_listener()
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(log_formatter)
+    console_handler.setLevel(logging.INFO)
+    handlers = [console_handler]
+
+    if log_file:
+        # Opened on the first record, so processes that attach elsewhere never open it
+        file_handler = RotatingFileHandler(
+            os.path.join(LOG_DIR, log_file), maxBytes=5 * 1024 * 1024, backupCount=3, delay=True)
+        file_handler.setFormatter(JsonFormatter())
+        file_handler.setLevel(logging.INFO)
+        handlers.insert(0, file_handler)
+
+    if shared:
+        _queue = multiprocessing.get_context('spawn').Queue()
+        handler = _SharedQueueHandler(_queue)
+    else:
+        _queue = queue.SimpleQueue()
+        handler = _LocalQueueHandler(_queue)
+    _shared = shared
+    _label = process_name
+    if process_name:
+        handler.addFilter(_ProcessLabel(process_name))
+    _install(handler, configure_root)
+
+    _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _queue
+
+
+def attach_to_queue(log_queue, process_name: str = None):
+    """
+    Send this process's records to another process's writer, e.g. a scanner
+    worker to its supervisor. Meant to run right after the process starts.
+    """
+    global _queue, _shared, _label
+    _stop_listener()
+    _queue = log_queue
+    _shared = True
+    _label = process_name
+    handler = _SharedQueueHandler(log_queue)
+    if process_name:
+        handler.addFilter(_ProcessLabel(process_name))
+    _install(handler, configure_root=True)
+
+
+class _DeferredSetup(logging.Handler):
+    """
+    Stands in for the queue handler until the first record, so importing
+    this module does not start the writer thread. Scripts log to the console
+    only: logs/bot.log belongs to the running bot, and a second process
+    writing and rotating it would interleave with the bot's records.
+    """
+
+    def emit(self, record):
+        if self in logger.handlers:
+            setup_logging(log_file=None, configure_root=False)
+        for handler in logger.handlers:
+            if handler is not self:
+                handler.handle(record)
+
+
+def get_log_queue():
+    """The multiprocessing queue child processes can attach to, or None"""
+    return _queue if _shared else None
+
+
+def process_label():
+    return _label
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    _stop_listener()
+
+
+atexit.register(stop_logging)
 
 logger = logging.getLogger("crypto-signal-bot")
-logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-logger.propagate = False
+if not logger.handlers:
+    # Scripts get queued console logging without setup, started by their
+    # first record; the API and scanner call setup_logging themselves to
+    # label their processes and write their log files
+    logger.addHandler(_DeferredSetup())
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 
 def log(message, level='INFO'):
@@ -46,6 +240,8 @@ def log(message, level='INFO'):
 
 
 def log_signal_to_csv(signal):
+    import pandas as pd
+
     try:
         # Ensure logs directory exists
         os.makedirs("logs", exist_ok=True)
@@ -100,7 +296,7 @@ def log_signal_to_csv(signal):
                 # Convert Unix timestamp to string
                 timestamp = datetime.fromtimestamp(
                     timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            performance_tracker.update_signal_status(
+            get_performance_tracker().update_signal_status(
                 signal["symbol"], timestamp, "pending")
     except Exception as e:
         log(
@@ -108,6 +304,9 @@ def log_signal_to_csv(signal):
 
 
 def archive_old_logs(csv_path):
+    import pandas as pd
+    import pytz
+
     try:
         if not os.path.exists(csv_path):
             return
@@ -0,0 +1,246 @@
+import time
+import bisect
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow requests
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class _Timer:
+    """Context manager observing the elapsed time into a histogram child"""
+
+    __slots__ = ('child', 'started')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+        return False
+
+
+class _Value:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self.lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = float(value)
+
+
+class _Buckets:
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Get the child for one combination of label values"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], object]]:
+        return [(tuple(str(v) for v in values), child)
+                for values, child in list(self._children.items())]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests or cache hits"""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        """Increment an unlabelled counter; use labels(...).inc() otherwise"""
+        self.labels().inc(amount)
+
+    def snapshot(self):
+        return [[list(values), child.value] for values, child in self.samples()]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. queue length or last cycle size"""
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def snapshot(self):
+        return [[list(values), child.value] for values, child in self.samples()]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets, e.g. latencies"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self, *labels):
+        """Time a block: `with histogram.time('label'): ...`"""
+        return _Timer(self.labels(*labels))
+
+    def snapshot(self):
+        return [[list(values), {'buckets': list(child.counts), 'sum': child.sum,
+                                'count': child.count}]
+                for values, child in self.samples()]
+
+
+def _register(cls, name, help, labelnames, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    """Get or create a process-wide counter"""
+    return _register(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+    """Get or create a process-wide gauge"""
+    return _register(Gauge, name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Iterable[str] = (),
+              buckets=DEFAULT_BUCKETS) -> Histogram:
+    """Get or create a process-wide histogram"""
+    return _register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+# Storage writes across modules, labelled by what was written
+STORAGE_WRITE_SECONDS = histogram(
+    'storage_write_seconds', 'Time spent writing CSV files and databases', ['target'])
+
+
+def snapshot() -> Dict:
+    """JSON-serializable copy of every metric in this process"""
+    return {
+        name: {
+            'type': metric.kind,
+            'help': metric.help,
+            'labels': list(metric.labelnames),
+            'buckets': list(metric.buckets) if metric.kind == 'histogram' else None,
+            'samples': metric.snapshot()
+        }
+        for name, metric in list(_registry.items())
+    }
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_bound(bound) -> str:
+    return "+Inf" if bound == float('inf') else repr(float(bound))
+
+
+def render(snapshots: Dict[str, Dict]) -> str:
+    """
+    Render snapshots of several processes in the Prometheus text format
+
+    Args:
+        snapshots (dict): process name -> snapshot(); each sample gets a
+            'process' label so per-process series stay distinct
+
+    Returns:
+        str: Exposition text for a /metrics endpoint
+    """
+    # Merge metric metadata across processes, keeping one HELP/TYPE per name
+    names = {}
+    for process, snap in snapshots.items():
+        for name, metric in snap.items():
+            names.setdefault(name, (metric, []))[1].append((process, metric))
+
+    lines = []
+    for name in sorted(names):
+        meta, per_process = names[name]
+        lines.append(f"# HELP {name} {meta['help']}")
+        lines.append(f"# TYPE {name} {meta['type']}")
+        for process, metric in per_process:
+            labelnames = ['process'] + metric['labels']
+            for values, value in metric['samples']:
+                labelvalues = [process] + values
+                if metric['type'] != 'histogram':
+                    lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {value}")
+                    continue
+                cumulative = 0
+                bounds = list(metric['buckets']) + [float('inf')]
+                for bound, count in zip(bounds, value['buckets']):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket"
+                        f"{_format_labels(labelnames + ['le'], labelvalues + [_format_bound(bound)])} "
+                        f"{cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {value['sum']}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {value['count']}")
+    return "\n".join(lines) + "\n"
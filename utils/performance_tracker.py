@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime
 import logging
 from utils.logger import log
+from utils.metrics import STORAGE_WRITE_SECONDS
+from utils.confidence import get_confidence_manager
 
 
 class PerformanceTracker:
@@ -11,6 +13,8 @@ class PerformanceTracker:
         self.signals_log = "logs/signals_log.csv"
         self.signals_log_new = "logs/signals_log_new.csv"
         self.ensure_files_exist()
+        # Success rates of this process, kept in step with status updates
+        self.confidence_manager = get_confidence_manager()
 
     def ensure_files_exist(self):
         """Make sure all necessary log files exist"""
@@ -77,7 +81,8 @@ class PerformanceTracker:
                 df = pd.DataFrame([perf_record])
 
             # Save updated dataframe
-            df.to_csv(self.performance_file, index=False)
+            with STORAGE_WRITE_SECONDS.time('performance_csv'):
+                df.to_csv(self.performance_file, index=False)
             log(f"[{perf_record['symbol']}] Added to performance tracking")
             return True
 
@@ -112,6 +117,10 @@ class PerformanceTracker:
                     df.loc[mask, 'profit_loss'] = profit_loss
 
                 if success is not None:
+                    # Keep in-memory success rates in step with the file
+                    for _, row in df.loc[mask].iterrows():
+                        self.confidence_manager.record_status_update(
+                            row, success, previous=row['success'])
                     df.loc[mask, 'success'] = success
 
                 # Update hit time and duration if status is not pending
@@ -131,7 +140,8 @@ class PerformanceTracker:
                             level='WARNING')
 
                 # Save updated dataframe
-                df.to_csv(self.performance_file, index=False)
+                with STORAGE_WRITE_SECONDS.time('performance_csv'):
+                    df.to_csv(self.performance_file, index=False)
                 log(f"[{symbol}] Updated status to {status}")
                 return True
             else:
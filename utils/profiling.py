@@ -0,0 +1,194 @@
+import time
+import pstats
+import cProfile
+import logging
+import tracemalloc
+from typing import Dict, List, Optional
+
+from utils.executors import run_cpu
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 30
+TRACE_FRAMES = 10  # Frames kept per allocation; more frames cost more memory
+
+_active_session = None
+
+
+class _StatsHolder:
+    """Lets pstats.Stats load a raw stats dict returned from another process"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def _top_sites(snapshot, limit=TOP_ALLOCATIONS) -> List[Dict]:
+    # Leave out module imports and the profilers' own bookkeeping
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+    sites = []
+    for stat in snapshot.statistics('lineno')[:limit]:
+        frame = stat.traceback[0]
+        sites.append({
+            'site': f"{frame.filename}:{frame.lineno}",
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count
+        })
+    return sites
+
+
+def profiled(func, *args, memory: bool = False, **kwargs):
+    """
+    Run func under cProfile (and tracemalloc if memory is set)
+
+    Meant to be sent to the process pool in place of func, so the analysis
+    is profiled where it actually runs.
+
+    Returns:
+        tuple: (func's result, raw cProfile stats, allocation summary or None)
+    """
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start(TRACE_FRAMES)
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        allocations = None
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            allocations = {'peak_kb': round(peak / 1024, 1), 'sites': _top_sites(snapshot)}
+    profiler.create_stats()
+    return result, profiler.stats, allocations
+
+
+class ProfileSession:
+    """
+    One on-demand profiling run inside a scanner worker.
+    The worker's own event loop is profiled with cProfile while the session
+    is active, and every analysis sent to the process pool is profiled there
+    and merged in. Sessions end after a number of scan cycles or seconds.
+    """
+
+    def __init__(self, request_id: int, mode: str = 'seconds', amount: float = 60,
+                 memory: bool = False):
+        self.request_id = request_id
+        self.mode = mode        # 'cycles' or 'seconds'
+        self.amount = amount
+        self.memory = memory
+        self.started = None
+        self.profiler = cProfile.Profile()
+        self.stats = pstats.Stats()
+        self.sites = {}  # allocation site -> {'size_kb', 'count'}
+        self.peak_kb = 0.0
+        self.analyses = 0
+        self.cycles_done = 0
+        self.current_cycle = None
+
+    def start(self):
+        global _active_session
+        self.started = time.time()
+        if self.memory:
+            tracemalloc.start(TRACE_FRAMES)
+        self.profiler.enable()
+        _active_session = self
+        logger.info(
+            f"Profiling started (request {self.request_id}: {self.amount:g} {self.mode}, "
+            f"memory={'on' if self.memory else 'off'})")
+
+    def observe_cycle(self, cycle: Optional[int]):
+        """Track which scan cycle the worker is on; a change ends the previous one"""
+        if self.current_cycle is not None and cycle != self.current_cycle:
+            self.cycles_done += 1
+        self.current_cycle = cycle
+
+    def expired(self) -> bool:
+        if self.mode == 'cycles':
+            return self.cycles_done >= self.amount
+        return time.time() - self.started >= self.amount
+
+    async def run_cpu(self, func, *args, **kwargs):
+        """run_cpu for the analysis path, profiled inside the pool process"""
+        result, stats, allocations = await run_cpu(
+            profiled, func, *args, memory=self.memory, **kwargs)
+        self.stats.add(_StatsHolder(stats))
+        if allocations:
+            self.peak_kb = max(self.peak_kb, allocations['peak_kb'])
+            for site in allocations['sites']:
+                merged = self.sites.setdefault(site['site'], {'size_kb': 0.0, 'count': 0})
+                merged['size_kb'] += site['size_kb']
+                merged['count'] += site['count']
+        self.analyses += 1
+        return result
+
+    def stop(self) -> Dict:
+        """End the session and summarize it"""
+        global _active_session
+        self.profiler.disable()
+        self.profiler.create_stats()
+        self.stats.add(_StatsHolder(self.profiler.stats))
+        if _active_session is self:
+            _active_session = None
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.peak_kb = max(self.peak_kb, round(peak / 1024, 1))
+            for site in _top_sites(snapshot):
+                merged = self.sites.setdefault(site['site'], {'size_kb': 0.0, 'count': 0})
+                merged['size_kb'] += site['size_kb']
+                merged['count'] += site['count']
+
+        result = {
+            'seconds': round(time.time() - self.started, 1),
+            'cycles': self.cycles_done,
+            'analyses': self.analyses,
+            'by_cumulative': top_functions(self.stats, 'cumulative'),
+            'by_self': top_functions(self.stats, 'tottime')
+        }
+        if self.memory:
+            sites = sorted(self.sites.items(), key=lambda item: item[1]['size_kb'], reverse=True)
+            result['memory'] = {
+                'peak_kb': self.peak_kb,
+                'top_sites': [{'site': site, 'size_kb': round(v['size_kb'], 1), 'count': v['count']}
+                              for site, v in sites[:TOP_ALLOCATIONS]]
+            }
+        logger.info(
+            f"Profiling finished (request {self.request_id}): {self.analyses} analyses "
+            f"in {result['seconds']}s")
+        return result
+
+
+def top_functions(stats: pstats.Stats, sort: str = 'cumulative',
+                  limit=TOP_FUNCTIONS) -> List[Dict]:
+    """The most expensive functions of a Stats object as plain dicts"""
+    rows = []
+    for (filename, lineno, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f"{filename}:{lineno}({name})",
+            'calls': nc,
+            'self_seconds': round(tt, 4),
+            'cumulative_seconds': round(ct, 4)
+        })
+    key = 'cumulative_seconds' if sort == 'cumulative' else 'self_seconds'
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:limit]
+
+
+def active_session() -> Optional[ProfileSession]:
+    """The session profiling this process, if any"""
+    return _active_session
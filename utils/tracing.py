@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Get logger
+logger = logging.getLogger("crypto-signal-bot")
+
+# Share of root traces that are recorded; unsampled traces cost one random() call
+SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 0.1))
+TRACE_DIR = os.getenv('TRACE_DIR', os.path.join("logs", "traces"))
+MAX_FILE_BYTES = 50 * 1024 * 1024  # Rotated to <file>.1 beyond this
+
+_current = contextvars.ContextVar('trace_span', default=None)
+_process_name = f"pid-{os.getpid()}"
+_write_lock = threading.Lock()
+
+
+class Span:
+    """One timed stage of a trace; attributes can be added while it runs"""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attrs', 'start',
+                 'started', 'duration', 'error')
+
+    def __init__(self, trace, name: str, parent_id: Optional[str], attrs: Dict):
+        self.trace = trace
+        self.span_id = f"{len(trace.spans) + 1:x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.error = None
+        trace.spans.append(self)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def finish(self, duration: float = None):
+        self.duration = time.perf_counter() - self.started if duration is None else duration
+
+    def to_dict(self) -> Dict:
+        record = {
+            'trace': self.trace.trace_id,
+            'span': self.span_id,
+            'parent': self.parent_id,
+            'name': self.name,
+            'process': _process_name,
+            'start': round(self.start, 3),
+            'duration_ms': round((self.duration or 0.0) * 1000, 3),
+            'attrs': self.attrs
+        }
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+class _Trace:
+    __slots__ = ('trace_id', 'spans')
+
+    def __init__(self):
+        self.trace_id = f"{random.getrandbits(64):016x}"
+        self.spans = []
+
+
+class _NoopSpan:
+    """Stands in for spans of unsampled traces"""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def configure(process_name: str = None, sample_rate: float = None):
+    """Name this process's trace file and optionally change the sampling rate"""
+    global _process_name, SAMPLE_RATE
+    if process_name:
+        _process_name = process_name
+    if sample_rate is not None:
+        SAMPLE_RATE = sample_rate
+
+
+def current_span():
+    """The innermost running span, or None outside a sampled trace"""
+    span = _current.get()
+    return span if isinstance(span, Span) else None
+
+
+@contextmanager
+def trace(name: str, sample_rate: float = None, **attrs):
+    """
+    Start a root span, sampled at sample_rate (default TRACE_SAMPLE_RATE)
+
+    All spans opened inside it, including in awaited coroutines, become its
+    children. The whole trace is appended to the process's JSONL file when
+    the root span ends.
+    """
+    rate = SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0 or random.random() >= rate:
+        token = _current.set(_NOOP)
+        try:
+            yield _NOOP
+        finally:
+            _current.reset(token)
+        return
+
+    root = Span(_Trace(), name, None, attrs)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        root.finish()
+        _current.reset(token)
+        _write(root.trace)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a stage as a child of the current span; a no-op outside sampled traces"""
+    parent = _current.get()
+    if not isinstance(parent, Span):
+        yield _NOOP
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attrs)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        child.finish()
+        _current.reset(token)
+
+
+def record(name: str, duration: float, **attrs):
+    """
+    Add an already finished stage under the current span, e.g. work timed in
+    another process and reported back
+    """
+    parent = _current.get()
+    if not isinstance(parent, Span):
+        return
+    child = Span(parent.trace, name, parent.span_id, attrs)
+    child.start -= duration
+    child.finish(duration)
+
+
+def _write(trace: _Trace):
+    lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in trace.spans)
+    path = os.path.join(TRACE_DIR, f"{_process_name}.jsonl")
+    try:
+        with _write_lock:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) > MAX_FILE_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, 'a') as f:
+                f.write(lines)
+    except Exception as e:
+        logger.error(f"Error writing trace: {str(e)}")